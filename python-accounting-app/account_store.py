@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+Account Store Module - Compact keyed balance storage
+Many-account counterpart of the COBOL STORAGE-BALANCE working-storage item
+"""
+
+import sys
+from array import array
+from bisect import bisect_left
+
+from money import INITIAL_BALANCE_CENTS
+
+# Account used by the single-account programs (the original STORAGE-BALANCE)
+DEFAULT_ACCOUNT_ID = 0
+
+# Account ids are stored as unsigned 32-bit integers
+MAX_ACCOUNT_ID = 0xFFFFFFFF
+
+
+def _append_run(target, run):
+    """Append a slice of an array or memoryview to an array with one copy"""
+    target.frombytes(memoryview(run).cast("B"))
+
+
+def _typecode(values):
+    """Element type of an array or memoryview"""
+    return values.typecode if isinstance(values, array) else values.format
+
+
+def _nbytes(values):
+    """Bytes allocated for an array, or mapped by a memoryview"""
+    if isinstance(values, memoryview):
+        return values.nbytes
+    return sys.getsizeof(values)
+
+
+def check_account_id(account_id):
+    """Validate an account id and return it as an int"""
+    if not isinstance(account_id, int) or isinstance(account_id, bool):
+        raise TypeError(f"Account id must be an integer, got {account_id!r}")
+    if not 0 <= account_id <= MAX_ACCOUNT_ID:
+        raise ValueError(f"Account id out of range (0-{MAX_ACCOUNT_ID}): {account_id}")
+    return account_id
+
+
+class AccountStore:
+    """
+    Account balances in int cents, keyed by account id
+
+    Balances live in an array('q') parallel to a sorted array('I') of
+    account ids, so an account costs 12 bytes plus array over-allocation.
+    Newly opened accounts go to a small pending dict first and are merged
+    into the sorted arrays in bulk.
+
+    Writers must be serialized by the caller (DataProgram does this);
+    readers need no lock because merges swap both arrays at once.
+    """
+
+    def __init__(self, default_cents=INITIAL_BALANCE_CENTS, merge_threshold=4096):
+        """
+        Initialize an empty store
+
+        Args:
+            default_cents (int): Balance of an account that was never written
+            merge_threshold (int): Minimum pending accounts before a merge
+        """
+        self.default_cents = default_cents
+        self.merge_threshold = merge_threshold
+        self._arrays = (array("I"), array("q"))  # sorted ids, balances
+        self._pending = {}
+
+    def __len__(self):
+        return len(self._arrays[0]) + len(self._pending)
+
+    def __contains__(self, account_id):
+        return account_id in self._pending or self._slot(account_id) >= 0
+
+    def _slot(self, account_id, ids=None):
+        """Position of an account in the sorted ids array, or -1"""
+        if ids is None:
+            ids = self._arrays[0]
+        slot = bisect_left(ids, account_id)
+        if slot < len(ids) and ids[slot] == account_id:
+            return slot
+        return -1
+
+    def get_cents(self, account_id):
+        """
+        Read an account balance
+
+        Args:
+            account_id (int): Account to read
+
+        Returns:
+            int: Balance in cents (default_cents if the account was never written)
+        """
+        pending = self._pending
+        if account_id in pending:
+            return pending[account_id]
+        ids, balances = self._arrays
+        slot = self._slot(account_id, ids)
+        if slot >= 0:
+            return balances[slot]
+        return self.default_cents
+
+    def set_cents(self, account_id, cents):
+        """
+        Write an account balance, opening the account if needed
+
+        Args:
+            account_id (int): Account to write
+            cents (int): New balance in cents
+        """
+        ids, balances = self._arrays
+        slot = self._slot(account_id, ids)
+        if slot >= 0:
+            balances[slot] = cents
+            return
+
+        pending = self._pending
+        if account_id not in pending:
+            check_account_id(account_id)
+        pending[account_id] = cents
+        if len(pending) >= max(self.merge_threshold, len(ids) >> 4):
+            self._merge()
+
+    def set_many(self, account_ids, balances):
+        """
+        Write many account balances, merging new accounts at most once
+
+        Args:
+            account_ids (iterable): Accounts to write
+            balances (iterable): New balances in cents, parallel to account_ids
+        """
+        ids, stored = self._arrays
+        pending = self._pending
+        slot_of = self._slot
+        for account_id, cents in zip(account_ids, balances):
+            slot = slot_of(account_id, ids)
+            if slot >= 0:
+                stored[slot] = cents
+                continue
+            if account_id not in pending:
+                check_account_id(account_id)
+            pending[account_id] = cents
+        if len(pending) >= max(self.merge_threshold, len(ids) >> 4):
+            self._merge()
+
+    def _merge(self):
+        """Merge pending accounts into the sorted arrays"""
+        if not self._pending:
+            return
+
+        old_ids, old_balances = self._arrays
+        ids = array("I")
+        balances = array("q")
+
+        # Copy the untouched runs between insertion points in bulk
+        previous = 0
+        for account_id in sorted(self._pending):
+            position = bisect_left(old_ids, account_id, previous)
+            if position != previous:
+                _append_run(ids, old_ids[previous:position])
+                _append_run(balances, old_balances[previous:position])
+            ids.append(account_id)
+            balances.append(self._pending[account_id])
+            previous = position
+        _append_run(ids, old_ids[previous:])
+        _append_run(balances, old_balances[previous:])
+
+        # Publish the new arrays before dropping the pending accounts, so a
+        # concurrent reader finds every account in one place or the other
+        self._arrays = (ids, balances)
+        self._pending = {}
+
+    def load(self, ids, balances):
+        """
+        Replace the store contents in bulk
+
+        Arrays of the right type are adopted without copying, and so are
+        writable memoryviews of format 'I'/'q' (e.g. over a copy-on-write
+        mapping of a snapshot file); the next merge turns them into arrays.
+
+        Args:
+            ids (array): Sorted account ids, array('I')
+            balances (array): Balances in cents, array('q'), parallel to ids
+        """
+        if len(ids) != len(balances):
+            raise ValueError("ids and balances must have the same length")
+        if not (isinstance(ids, (array, memoryview)) and _typecode(ids) == "I"):
+            ids = array("I", ids)
+        if not (isinstance(balances, (array, memoryview)) and _typecode(balances) == "q"):
+            balances = array("q", balances)
+        self._arrays = (ids, balances)
+        self._pending = {}
+
+    def items(self):
+        """Iterate (account_id, cents) pairs in account id order"""
+        self._merge()
+        return zip(*self._arrays)
+
+    def arrays(self):
+        """Return the live (ids, balances) arrays after merging pending accounts"""
+        self._merge()
+        return self._arrays
+
+    def copy_arrays(self):
+        """Return a private copy of the (ids, balances) arrays"""
+        ids, balances = self.arrays()
+        ids_copy, balances_copy = array("I"), array("q")
+        _append_run(ids_copy, ids)
+        _append_run(balances_copy, balances)
+        return ids_copy, balances_copy
+
+    def memory_usage(self):
+        """Bytes allocated for the balance storage, including over-allocation"""
+        ids, balances = self.arrays()
+        return _nbytes(ids) + _nbytes(balances)
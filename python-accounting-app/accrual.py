@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Accrual Module - End-of-day interest and maintenance fees for every account
+One vectorized pass over the stored balance array; needs NumPy
+"""
+
+from decimal import Decimal
+
+import numpy as np
+
+from money import format_cents, parse_amount, to_decimal
+
+# Ledger entry kinds in the entries arrays
+INTEREST = 0
+FEE = 1
+
+# Products must stay clear of int64 overflow
+_INT64_HEADROOM = 1 << 62
+
+# Entries formatted per write_entries() chunk
+WRITE_CHUNK = 65536
+
+
+def _rate_fraction(rate):
+    """
+    Interest rate as an exact fraction
+
+    Returns:
+        tuple: (numerator, denominator) ints
+
+    Raises:
+        ValueError: If the rate is negative or not a finite number
+    """
+    try:
+        rate = Decimal(str(rate))
+        numerator, denominator = rate.as_integer_ratio()
+    except (ArithmeticError, ValueError):
+        raise ValueError(f"Invalid interest rate: {rate}")
+    if numerator < 0:
+        raise ValueError("Interest rate cannot be negative; charge a fee instead")
+    return numerator, denominator
+
+
+def interest_cents(balances, numerator, denominator):
+    """
+    balance * rate in cents, rounded ROUND_HALF_UP like _format_currency
+
+    Exact integer arithmetic: the balance is split as whole * denominator +
+    remainder, so no intermediate product grows past denominator * numerator.
+
+    Args:
+        balances (ndarray): Balances in cents, int64
+        numerator (int): Rate numerator
+        denominator (int): Rate denominator
+
+    Returns:
+        ndarray: Interest in cents, int64 (negative for negative balances)
+    """
+    magnitude = np.abs(balances)
+    largest = int(magnitude.max()) if magnitude.size else 0
+    if 2 * denominator * (numerator + 1) >= _INT64_HEADROOM or (largest // denominator + 1) * numerator >= _INT64_HEADROOM:
+        raise ValueError("Interest rate has too many digits for these balances")
+    whole, remainder = np.divmod(magnitude, denominator)
+    # Half a cent or more rounds away from zero
+    interest = whole * numerator + (2 * remainder * numerator + denominator) // (2 * denominator)
+    return np.where(balances < 0, -interest, interest)
+
+
+def accrue(data_program, rate=0, fee=0, ledger=None, journal=True):
+    """
+    Apply interest, then a maintenance fee, to every stored account
+
+    Interest is balance * rate rounded ROUND_HALF_UP to the cent. The fee
+    is a debit with the usual rule: it is only taken when the balance
+    (after interest) covers it in full, otherwise it is rejected and the
+    balance is left as it is. Accounts never written (still at the COBOL
+    initial balance) are not in the store and are not touched.
+
+    Args:
+        data_program (DataProgram): Accounts to update
+        rate (str|Decimal): Interest rate per run, e.g. '0.0001' (0 = none)
+        fee (str|Decimal): Fee per account, at most 999999.99 (0 = none)
+        ledger (Ledger): Also record the entries in this ledger
+        journal (bool): Log changed balances to the write-ahead log (see
+            DataProgram.update_balances)
+
+    Returns:
+        dict: 'summary' - counts and Decimal totals,
+              'entries' - parallel arrays 'account_ids', 'kinds' (INTEREST
+              or FEE), 'amounts' (signed cents) and 'balances' (after the
+              entry), in account order with interest before fee
+
+    Raises:
+        ValueError: If the rate or fee is invalid (AmountError for the fee)
+    """
+    numerator, denominator = _rate_fraction(rate)
+    fee_cents = parse_amount(fee)
+    result = {}
+
+    def update(ids, stored):
+        account_ids = np.frombuffer(ids, dtype=np.uint32)
+        balances = np.frombuffer(stored, dtype=np.int64)
+
+        opening_total = int(balances.sum())
+        if numerator:
+            interest = interest_cents(balances, numerator, denominator)
+        else:
+            interest = np.zeros(len(balances), dtype=np.int64)
+        after_interest = balances + interest
+
+        # Same test as _handle_debit_operation: IF FINAL-BALANCE >= AMOUNT
+        if fee_cents:
+            charged = after_interest >= fee_cents
+            closing = np.where(charged, after_interest - fee_cents, after_interest)
+        else:
+            charged = np.zeros(len(balances), dtype=bool)
+            closing = after_interest
+
+        changed = np.flatnonzero(closing != balances)
+        balances[changed] = closing[changed]
+
+        interest_at = np.flatnonzero(interest)
+        fee_at = np.flatnonzero(charged)
+        positions = np.concatenate((interest_at, fee_at))
+        kinds = np.concatenate((np.full(len(interest_at), INTEREST, np.int8), np.full(len(fee_at), FEE, np.int8)))
+        order = np.argsort(positions * 2 + kinds)
+        result["entries"] = {
+            "account_ids": account_ids[positions][order],
+            "kinds": kinds[order],
+            "amounts": np.concatenate((interest[interest_at], np.full(len(fee_at), -fee_cents, np.int64)))[order],
+            "balances": np.concatenate((after_interest[interest_at], closing[fee_at]))[order],
+        }
+        total_interest = int(interest.sum())
+        result["summary"] = {
+            "accounts": len(balances),
+            "interest_entries": len(interest_at),
+            "total_interest": to_decimal(total_interest),
+            "fees_charged": len(fee_at),
+            "fees_rejected": len(balances) - len(fee_at) if fee_cents else 0,
+            "total_fees": to_decimal(len(fee_at) * fee_cents),
+            "opening_total": to_decimal(opening_total),
+            "closing_total": to_decimal(opening_total + total_interest - len(fee_at) * fee_cents),
+        }
+        return changed
+
+    data_program.update_balances(update, journal)
+
+    if ledger is not None:
+        record_entries(result["entries"], ledger)
+    return result
+
+
+def record_entries(entries, ledger):
+    """Add accrual entries to a ledger, all with the same timestamp"""
+    timestamp = ledger.clock()
+    for account_id, amount, balance in zip(
+        entries["account_ids"].tolist(), entries["amounts"].tolist(), entries["balances"].tolist()
+    ):
+        ledger.record(account_id, amount, balance, timestamp)
+
+
+def write_entries(entries, stream):
+    """
+    Write accrual entries as CSV (account,kind,amount,balance)
+
+    Args:
+        entries (dict): 'entries' from accrue()
+        stream (file): Text stream receiving the rows
+
+    Returns:
+        int: Number of entries written
+    """
+    names = ("INTEREST", "FEE")
+    stream.write("account,kind,amount,balance\n")
+    columns = (entries["account_ids"], entries["kinds"], entries["amounts"], entries["balances"])
+    written = 0
+    for start in range(0, len(entries["kinds"]), WRITE_CHUNK):
+        rows = zip(*(column[start:start + WRITE_CHUNK].tolist() for column in columns))
+        stream.write("".join(
+            f"{account_id},{names[kind]},{format_cents(amount)},{format_cents(balance)}\n"
+            for account_id, kind, amount, balance in rows
+        ))
+        written += min(WRITE_CHUNK, len(entries["kinds"]) - start)
+    return written
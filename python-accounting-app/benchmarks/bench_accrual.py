@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Accrual benchmark - end-of-day interest and fees over a large store
+Usage: python benchmarks/bench_accrual.py [--accounts N] [--rate R] [--fee AMOUNT] [--scalar-accounts N]
+
+The per-account alternative (Decimal balance * rate through
+_format_currency, then the debit rule) is timed on --scalar-accounts
+accounts and scaled to the full store.
+"""
+
+import argparse
+import os
+import sys
+import time
+from array import array
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from data import DataProgram
+from money import to_cents, to_decimal
+from operations import Operations
+
+
+def scalar_accrual(balances, rate, fee):
+    """Interest and fee one account at a time with Decimal, return seconds"""
+    operations = Operations()
+    format_currency = operations._format_currency
+    rate, fee = Decimal(rate), Decimal(fee)
+    start = time.perf_counter()
+    for cents in balances:
+        balance = to_decimal(cents)
+        balance = format_currency(balance + format_currency(balance * rate))
+        if balance >= fee:
+            balance = format_currency(balance - fee)
+        to_cents(balance)
+    return time.perf_counter() - start
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the accrual job")
+    parser.add_argument("--accounts", type=int, default=10_000_000)
+    parser.add_argument("--rate", default="0.0001")
+    parser.add_argument("--fee", default="1.50")
+    parser.add_argument("--scalar-accounts", type=int, default=200_000)
+    args = parser.parse_args(argv)
+    if np is None:
+        print("NumPy is not installed - pip install numpy")
+        return 1
+
+    from accrual import accrue
+
+    rng = np.random.default_rng(1)
+    balances = rng.integers(0, 10 ** 8, args.accounts, dtype=np.int64)
+    data_program = DataProgram()
+    data_program.store.load(array("I", np.arange(args.accounts, dtype=np.uint32).tobytes()), array("q", balances.tobytes()))
+
+    start = time.perf_counter()
+    result = accrue(data_program, args.rate, args.fee)
+    vector_time = time.perf_counter() - start
+
+    sample = min(args.scalar_accounts, args.accounts)
+    scalar_time = scalar_accrual(balances[:sample].tolist(), args.rate, args.fee) * args.accounts / sample
+
+    summary = result["summary"]
+    print(f"{args.accounts} accounts, rate {args.rate}, fee {args.fee}")
+    print(f"vectorized:  {vector_time:.2f} s  ({len(result['entries']['kinds'])} entries)")
+    print(f"per account: {scalar_time:.2f} s (estimated from {sample} accounts)  {scalar_time / vector_time:.0f}x")
+    print(f"interest {summary['total_interest']}, fees {summary['total_fees']} ({summary['fees_rejected']} rejected)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
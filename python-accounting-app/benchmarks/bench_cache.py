@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Cache benchmark - hot-account cache over SQLite under Zipf-skewed traffic
+Usage: python benchmarks/bench_cache.py [--accounts N] [--operations N] [--zipf S] [--writes FRACTION] [--budgets MIB,...]
+
+Account k (in a random order) is used with probability proportional to
+1 / k**S, like the account traffic the cache is tuned for. Every
+operation goes through DataProgram.read_cents / write_cents; the run is
+repeated without a cache and with each policy and memory budget, each
+cache first warmed by an untimed pass of other draws, reporting hit
+ratio and throughput.
+"""
+
+import argparse
+import itertools
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from cache_store import CachedAccountStore
+from data import DataProgram
+from sqlite_store import SqliteAccountStore
+
+
+def zipf_accounts(accounts, count, exponent, rng):
+    """count account ids drawn with Zipf-distributed popularity"""
+    cumulative = list(itertools.accumulate(1 / rank ** exponent for rank in range(1, accounts + 1)))
+    # Hot accounts are scattered over the id range, not the lowest ids
+    ids = list(range(accounts))
+    rng.shuffle(ids)
+    return [ids[rank] for rank in rng.choices(range(accounts), cum_weights=cumulative, k=count)]
+
+
+def run_load(data_program, account_ids, writes):
+    """Read (or, for a writes fraction, credit) each account, return ops/s"""
+    read_cents, write_cents = data_program.read_cents, data_program.write_cents
+    every = round(1 / writes) if writes else 0
+    start = time.perf_counter()
+    for index, account_id in enumerate(account_ids):
+        cents = read_cents(account_id)
+        if every and index % every == 0:
+            write_cents(cents + 1, account_id)
+    data_program.store.flush()
+    return len(account_ids) / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the hot-account cache")
+    parser.add_argument("--accounts", type=int, default=1_000_000)
+    parser.add_argument("--operations", type=int, default=300_000)
+    parser.add_argument("--zipf", type=float, default=1.0, help="Zipf exponent (default: 1.0)")
+    parser.add_argument("--writes", type=float, default=0.1, help="Fraction of operations that also write")
+    parser.add_argument("--budgets", default="1,4,16,64", help="Cache sizes in MiB")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    # Two independent draws: the first warms each cache, the second is timed
+    account_ids = zipf_accounts(args.accounts, 2 * args.operations, args.zipf, rng)
+    warm_ids, account_ids = account_ids[:args.operations], account_ids[args.operations:]
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = SqliteAccountStore(os.path.join(directory, "accounts.db"))
+        store.set_many(array("I", range(args.accounts)), array("q", [100000] * args.accounts))
+
+        print(f"{args.accounts} accounts in SQLite, {args.operations} operations, "
+              f"Zipf {args.zipf}, {args.writes:.0%} writes")
+        print(f"{'cache':<16} {'hit ratio':>9} {'ops/s':>10} {'writebacks':>11}")
+        baseline = run_load(DataProgram(store), account_ids, args.writes)
+        print(f"{'none':<16} {'-':>9} {baseline:>10,.0f} {'-':>11}")
+
+        for budget in (float(size) for size in args.budgets.split(",")):
+            for policy in ("clock", "lru"):
+                cache = CachedAccountStore(store, int(budget * (1 << 20)), policy)
+                data_program = DataProgram(cache)
+                # Warm the cache with earlier traffic, then count afresh
+                run_load(data_program, warm_ids, args.writes)
+                cache.hits = cache.misses = cache.writebacks = 0
+                rate = run_load(data_program, account_ids, args.writes)
+                label = f"{policy} {budget:g} MiB"
+                print(f"{label:<16} {cache.hit_ratio:>9.1%} {rate:>10,.0f} {cache.writebacks:>11}"
+                      f"  ({rate / baseline:.1f}x, {cache.capacity} accounts)")
+        store.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
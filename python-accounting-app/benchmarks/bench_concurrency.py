@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Concurrency benchmark - thread-safe Operations throughput from 1 to 32 threads
+Usage: python benchmarks/bench_concurrency.py [--transactions N] [--accounts N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from operations import Operations
+
+THREAD_COUNTS = [1, 2, 4, 8, 16, 32]
+
+# (label, lock stripes)
+MODES = [
+    ("1 stripe (global lock)", 1),
+    ("64 stripes", 64),
+]
+
+
+def make_workload(transactions, accounts, seed):
+    """Pre-generate (operation, amount, account_id) tuples outside the timed loop"""
+    rng = random.Random(seed)
+    return [
+        (rng.choice(("CREDIT", "DEBIT ")), f"{rng.randrange(0, 50000) / 100:.2f}", rng.randrange(accounts))
+        for _ in range(transactions)
+    ]
+
+
+def measure(lock_stripes, threads, transactions, accounts):
+    """Run transactions split across threads, return transactions per second"""
+    operations = Operations(DataProgram(), lock_stripes=lock_stripes)
+    per_thread = transactions // threads
+    workloads = [make_workload(per_thread, accounts, seed) for seed in range(threads)]
+    barrier = threading.Barrier(threads + 1)
+
+    def worker(workload):
+        apply_transaction = operations.apply_transaction
+        barrier.wait()
+        for operation, amount, account_id in workload:
+            apply_transaction(operation, amount, account_id)
+
+    workers = [threading.Thread(target=worker, args=(workload,)) for workload in workloads]
+    for worker_thread in workers:
+        worker_thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for worker_thread in workers:
+        worker_thread.join()
+    elapsed = time.perf_counter() - start
+    return per_thread * threads / elapsed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Thread-safe Operations benchmark")
+    parser.add_argument("--transactions", type=int, default=200000)
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--threads", type=int, nargs="+", default=THREAD_COUNTS)
+    args = parser.parse_args(argv)
+
+    print(f"{args.transactions} transactions over {args.accounts} accounts")
+    print(f"{'mode':<24}" + "".join(f"{n:>10}" for n in args.threads))
+    for label, lock_stripes in MODES:
+        rates = [measure(lock_stripes, n, args.transactions, args.accounts) for n in args.threads]
+        print(f"{label:<24}" + "".join(f"{rate:>10,.0f}" for rate in rates))
+    print("(transactions/s by thread count)")
+
+
+if __name__ == "__main__":
+    main()
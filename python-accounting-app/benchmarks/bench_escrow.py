@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Contention benchmark - many workers crediting one merchant account
+Usage: python benchmarks/bench_escrow.py [--workers N,...] [--credits N] [--debit-every N] [--store SPEC]
+
+Every worker thread credits the same hot account (with an occasional
+debit, which forces a merge). Runs with plain account lock stripes and
+with the account in escrow mode (Operations.enable_hot_accounts),
+checking that both change the balance by exactly the same amount.
+"""
+
+import argparse
+import os
+import sys
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from operations import Operations
+from storage import open_data_program
+
+MERCHANT_ACCOUNT_ID = 1
+
+
+def run_contention(operations, workers, credits, debit_every):
+    """Credit the merchant from every worker; return (transactions/s, balance change)"""
+    opening = operations.data_program.read_cents(MERCHANT_ACCOUNT_ID)
+    apply_transaction = operations.apply_transaction
+    start_line = threading.Barrier(workers + 1)
+
+    def worker():
+        start_line.wait()
+        for index in range(1, credits + 1):
+            if debit_every and index % debit_every == 0:
+                apply_transaction("DEBIT", "1.00", MERCHANT_ACCOUNT_ID)
+            else:
+                apply_transaction("CREDIT", "1.25", MERCHANT_ACCOUNT_ID)
+
+    threads = [threading.Thread(target=worker) for _ in range(workers)]
+    for thread in threads:
+        thread.start()
+    start_line.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    operations.merge_hot_accounts()
+    elapsed = time.perf_counter() - start
+    change = operations.data_program.read_cents(MERCHANT_ACCOUNT_ID) - opening
+    return workers * credits / elapsed, change
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark hot-account credit aggregation")
+    parser.add_argument("--workers", default="1,2,4,8", help="Worker thread counts")
+    parser.add_argument("--credits", type=int, default=50_000, help="Transactions per worker")
+    parser.add_argument("--debit-every", type=int, default=100, help="Every Nth transaction is a debit (0 = none)")
+    parser.add_argument("--max-pending", type=int, help="Credits a worker buffers before merging")
+    parser.add_argument("--stripes", type=int, default=64, help="Account lock stripes")
+    parser.add_argument("--store", metavar="SPEC", default="memory", help="Balance store (see main.py --store)")
+    args = parser.parse_args(argv)
+
+    print(f"{args.credits} transactions per worker on one account, debit every {args.debit_every}, store {args.store}")
+    print(f"{'workers':>7} {'locked/s':>10} {'escrow/s':>10} {'speedup':>8}")
+    for workers in (int(count) for count in args.workers.split(",")):
+        rates = []
+        changes = []
+        for hot in (False, True):
+            data_program = open_data_program(args.store)
+            try:
+                operations = Operations(data_program, lock_stripes=args.stripes)
+                if hot:
+                    operations.enable_hot_accounts([MERCHANT_ACCOUNT_ID], args.max_pending)
+                rate, change = run_contention(operations, workers, args.credits, args.debit_every)
+            finally:
+                data_program.close()
+            rates.append(rate)
+            changes.append(change)
+        if changes[0] != changes[1]:
+            print(f"Balance mismatch with {workers} workers: {changes}", file=sys.stderr)
+            return 1
+        print(f"{workers:>7} {rates[0]:>10,.0f} {rates[1]:>10,.0f} {rates[1] / rates[0]:>7.2f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Idempotency benchmark - cost of keyed credits, retries and cache eviction
+Usage: python benchmarks/bench_idempotency.py [--operations N] [--max-keys N]
+
+Times apply_transaction credits without a key, with a new key each
+(lookup miss plus store, evicting once the cache is full) and retried
+with a known key (lookup hit, DataProgram untouched). Then times stores
+into full caches of growing size - the eviction cost should not grow
+with the cache - and reports the memory a full cache holds.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from idempotency import IdempotencyCache
+from operations import Operations
+
+
+def time_credits(operations, keys):
+    """Credit once per key (None = no key), return ns per call"""
+    apply_transaction = operations.apply_transaction
+    start = time.perf_counter_ns()
+    for key in keys:
+        apply_transaction("CREDIT", "1.00", 7, key)
+    return (time.perf_counter_ns() - start) / len(keys)
+
+
+def time_full_puts(max_keys, count):
+    """Store count new keys into an already full cache, return ns per put"""
+    cache = IdempotencyCache(max_keys=max_keys)
+    result = ("CREDIT", 100, "ACCEPTED", 100100)
+    for number in range(max_keys):
+        cache.put(f"fill-{number}", None, result)
+    put = cache.put
+    keys = [f"key-{number}" for number in range(count)]
+    start = time.perf_counter_ns()
+    for key in keys:
+        put(key, None, result)
+    elapsed = time.perf_counter_ns() - start
+    assert len(cache) == max_keys and cache.evictions == count
+    return elapsed / count
+
+
+def full_cache_bytes(max_keys):
+    """Memory held by a cache filled with max_keys keyed credit outcomes"""
+    tracemalloc.start()
+    cache = IdempotencyCache(max_keys=max_keys)
+    for number in range(max_keys * 2):
+        key = f"{number:032x}"
+        cache.put(key, ("CREDIT", 100, 7), ("CREDIT", 100, "ACCEPTED", 100000 + number))
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return size
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark idempotency keys")
+    parser.add_argument("--operations", type=int, default=200_000)
+    parser.add_argument("--max-keys", type=int, default=100_000)
+    args = parser.parse_args(argv)
+    count = args.operations
+
+    plain = time_credits(Operations(DataProgram()), [None] * count)
+
+    operations = Operations(DataProgram())
+    operations.enable_idempotency(IdempotencyCache(max_keys=args.max_keys))
+    unique_keys = [f"{number:032x}" for number in range(count)]
+    unique = time_credits(operations, unique_keys)
+    # The most recent keys are still cached - every one of these is a hit
+    retried = time_credits(operations, unique_keys[-min(count, args.max_keys):] * 2)
+
+    print(f"apply_transaction CREDIT, {count} calls, cache of {args.max_keys} keys")
+    print(f"no key:         {plain:7.0f} ns/call")
+    print(f"new key:        {unique:7.0f} ns/call  (+{unique - plain:.0f} ns, evictions {operations.idempotency.evictions})")
+    print(f"retried key:    {retried:7.0f} ns/call  ({retried / plain:.2f}x of no key, DataProgram untouched)")
+
+    print("\nstore into a full cache (miss + insert + evict oldest)")
+    for max_keys in (1_000, 100_000, 1_000_000):
+        print(f"{max_keys:>9} keys: {time_full_puts(max_keys, count):7.0f} ns/put")
+
+    size = full_cache_bytes(args.max_keys)
+    print(f"\nfull cache of {args.max_keys} keys after {2 * args.max_keys} stores: "
+          f"{size / 2 ** 20:.1f} MiB ({size / args.max_keys:.0f} bytes/key)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
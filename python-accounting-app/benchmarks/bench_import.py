@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Import-time benchmark - cold-start cost of the one-shot subcommands
+Usage: python benchmarks/bench_import.py [--runs N] [--budget-ms MS]
+
+Every command runs in a fresh interpreter. Import cost comes from
+`-X importtime` (everything the interpreter itself does not import for
+`python -c pass`), wall time from timing the whole process. Exits
+non-zero when a command's import time goes over the budget.
+
+The subcommands import in about 8-12 ms; roughly 6 ms of that is decimal,
+which operations needs at import for the Decimal balances of the menu
+interface. The default budget of 15 ms leaves room for a noisy host.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# (label, arguments after the interpreter)
+COMMANDS = [
+    ("interpreter only", ["-c", "pass"]),
+    ("main.py balance", ["main.py", "balance"]),
+    ("main.py credit 10.00", ["main.py", "credit", "10.00"]),
+    ("main.py debit 10.00", ["main.py", "debit", "10.00"]),
+    ("import main (menu)", ["-c", "import main"]),
+]
+
+
+def run(arguments, env, importtime=False):
+    """Run one fresh interpreter, return (wall seconds, stderr)"""
+    command = [sys.executable] + (["-X", "importtime"] if importtime else []) + arguments
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=APP_DIR, env=env, capture_output=True, text=True)
+    elapsed = time.perf_counter() - start
+    if result.returncode not in (0, 1):
+        raise RuntimeError(f"{' '.join(arguments)} failed:\n{result.stderr}")
+    return elapsed, result.stderr
+
+
+def parse_importtime(stderr):
+    """Map top-level module -> cumulative import microseconds"""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not name.startswith(" ") or name[1] != " ":
+            # Only top-level imports; nested ones are in their parent's total
+            modules[name.strip()] = int(cumulative)
+    return modules
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark one-shot cold start")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per command")
+    parser.add_argument("--budget-ms", type=float, default=15.0, help="Import time budget for the subcommands (ms)")
+    args = parser.parse_args(argv)
+
+    with tempfile.TemporaryDirectory() as cache:
+        # Bytecode caching on (in a private directory), as in a normal install
+        env = dict(os.environ, PYTHONPYCACHEPREFIX=cache)
+        env.pop("PYTHONDONTWRITEBYTECODE", None)
+
+        baseline_modules = None
+        over_budget = []
+        print(f"{'command':<24}{'wall p50':>10}{'wall min':>10}{'imports':>10}  slowest imports")
+        for label, arguments in COMMANDS:
+            run(arguments, env)  # warm the bytecode cache
+            walls = [run(arguments, env)[0] for _ in range(args.runs)]
+
+            modules = parse_importtime(run(arguments, env, importtime=True)[1])
+            if baseline_modules is None:
+                baseline_modules = set(modules)
+            own = {name: us for name, us in modules.items() if name not in baseline_modules}
+            import_ms = sum(own.values()) / 1000
+            slowest = ", ".join(f"{name} {us / 1000:.1f}" for name, us in sorted(own.items(), key=lambda item: -item[1])[:3])
+
+            print(
+                f"{label:<24}{statistics.median(walls) * 1000:>8.1f}ms{min(walls) * 1000:>8.1f}ms"
+                f"{import_ms:>8.1f}ms  {slowest}"
+            )
+            if label.startswith("main.py") and import_ms > args.budget_ms:
+                over_budget.append(label)
+
+    if over_budget:
+        print(f"\nOver the {args.budget_ms:g} ms import budget: {', '.join(over_budget)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
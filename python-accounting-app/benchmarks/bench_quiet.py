@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Scripted-session benchmark - piped stdin with the full menu vs quiet mode
+Usage: python benchmarks/bench_quiet.py [--choices N] [--seed N]
+"""
+
+import argparse
+import os
+import random
+import subprocess
+import sys
+import time
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Lines that carry a result - everything else is menu and prompts
+RESULT_PREFIXES = ("Current", "Amount", "Insufficient", "Invalid", "Exiting", "Unknown", "Error")
+
+
+def make_script(choices, seed):
+    """Random menu session ending with Exit"""
+    rng = random.Random(seed)
+    lines = []
+    for _ in range(choices):
+        choice = rng.choice("1233")
+        lines.append(choice)
+        if choice != "1":
+            lines.append(f"{rng.randrange(0, 200000) / 100:.2f}")
+    lines.append("4")
+    return "\n".join(lines) + "\n"
+
+
+def run_session(script, quiet):
+    """Pipe a script through main.py, return (seconds, result lines)"""
+    command = [sys.executable, "main.py", "--quiet" if quiet else "--no-quiet"]
+    start = time.perf_counter()
+    result = subprocess.run(command, cwd=APP_DIR, input=script, capture_output=True, text=True, check=True)
+    elapsed = time.perf_counter() - start
+    results = []
+    for line in result.stdout.splitlines():
+        # Prompts share a line with the result that follows them
+        for prompt in ("Enter your choice (1-4): ", "Enter credit amount: ", "Enter debit amount: "):
+            line = line.replace(prompt, "")
+        if line.startswith(RESULT_PREFIXES):
+            results.append(line)
+    return elapsed, results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark quiet mode on a piped session")
+    parser.add_argument("--choices", type=int, default=30000)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    script = make_script(args.choices, args.seed)
+    menu_time, menu_results = run_session(script, quiet=False)
+    quiet_time, quiet_results = run_session(script, quiet=True)
+
+    print(f"{args.choices} menu choices piped through main.py")
+    print(f"full menu: {menu_time:.3f} s")
+    print(f"quiet:     {quiet_time:.3f} s  ({menu_time / quiet_time:.1f}x)")
+    if menu_results != quiet_results:
+        print("Results differ between the two modes!")
+        return 1
+    print(f"identical results ({len(quiet_results)} lines, last balance line: "
+          f"{next(line for line in reversed(quiet_results) if 'balance' in line)})")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,47 @@
+#!/usr/bin/env python3
+"""
+Session replay benchmark - recorded menu sessions replayed per second
+Usage: python benchmarks/bench_replay.py [--sessions N] [--length N] [--processes N] [--seed N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from replay import model_session, random_session, replay_sessions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark headless session replay")
+    parser.add_argument("--sessions", type=int, default=20000)
+    parser.add_argument("--length", type=int, default=40, help="Approximate input lines per session")
+    parser.add_argument("--processes", type=int, default=os.cpu_count(), help="Worker processes (default: one per CPU)")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    sessions = [random_session(rng, args.length) for _ in range(args.sessions)]
+    lines = sum(len(session) for session in sessions)
+
+    print(f"{args.sessions} sessions, {lines} input lines, {os.cpu_count()} CPUs")
+    results = None
+    for processes in sorted({1, args.processes}):
+        start = time.perf_counter()
+        results = replay_sessions(sessions, processes=processes)
+        elapsed = time.perf_counter() - start
+        print(f"{processes:>3} process(es): {args.sessions / elapsed:>10.0f} sessions/s  {lines / elapsed:>10.0f} lines/s")
+
+    mismatches = sum(result != model_session(session) for session, result in zip(sessions, results))
+    if mismatches:
+        print(f"{mismatches} sessions differ from the menu model!")
+        return 1
+    print("all sessions match the menu model")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
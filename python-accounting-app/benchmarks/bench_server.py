@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Server benchmark - async load client for the TCP front end
+Usage: python benchmarks/bench_server.py [--connections N] [--pipeline N] [--requests N]
+       [--host HOST --port PORT]  (load an already running server instead)
+"""
+
+import argparse
+import asyncio
+import multiprocessing
+import os
+import random
+import socket
+import sys
+import time
+from collections import deque
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import server
+
+
+def make_requests(count, accounts, seed):
+    """Pre-encode a mix of request lines outside the timed loop"""
+    rng = random.Random(seed)
+    requests = []
+    for _ in range(count):
+        account_id = rng.randrange(accounts)
+        kind = rng.random()
+        if kind < 0.2:
+            requests.append(f"TOTAL {account_id}\n".encode("ascii"))
+        elif kind < 0.6:
+            requests.append(f"CREDIT {rng.randrange(0, 50000) / 100:.2f} {account_id}\n".encode("ascii"))
+        else:
+            requests.append(f"DEBIT {rng.randrange(0, 50000) / 100:.2f} {account_id}\n".encode("ascii"))
+    return requests
+
+
+async def run_connection(host, port, requests, pipeline, latencies):
+    """
+    Drive one connection with up to pipeline requests in flight
+
+    Responses arrive in request order, so each one is matched with the
+    oldest outstanding send time.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    sent_at = deque()
+    position = 0
+
+    def send(count):
+        nonlocal position
+        chunk = requests[position:position + count]
+        if chunk:
+            writer.write(b"".join(chunk))
+            sent_at.extend([time.perf_counter()] * len(chunk))
+            position += len(chunk)
+
+    send(pipeline)
+    received = 0
+    while received < len(requests):
+        data = await reader.read(65536)
+        if not data:
+            raise ConnectionError("Server closed the connection")
+        count = data.count(b"\n")
+        now = time.perf_counter()
+        for _ in range(count):
+            latencies.append(now - sent_at.popleft())
+        received += count
+        send(count)
+
+    writer.close()
+    await writer.wait_closed()
+
+
+async def run_load(host, port, connections, pipeline, requests_per_connection, accounts):
+    """Run all connections concurrently, return (elapsed seconds, latencies)"""
+    workloads = [make_requests(requests_per_connection, accounts, seed) for seed in range(connections)]
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*[run_connection(host, port, workload, pipeline, latencies) for workload in workloads])
+    return time.perf_counter() - start, latencies
+
+
+def percentile(sorted_values, fraction):
+    """Value at the given fraction of a sorted list"""
+    return sorted_values[min(len(sorted_values) - 1, int(fraction * len(sorted_values)))]
+
+
+def free_port():
+    """Ask the OS for an unused loopback port"""
+    with socket.socket() as sock:
+        sock.bind((server.DEFAULT_HOST, 0))
+        return sock.getsockname()[1]
+
+
+def wait_for_server(host, port, timeout=10.0):
+    """Block until the server accepts connections"""
+    deadline = time.monotonic() + timeout
+    while True:
+        try:
+            socket.create_connection((host, port), timeout=1).close()
+            return
+        except OSError:
+            if time.monotonic() > deadline:
+                raise
+            time.sleep(0.05)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Load the TOTAL/CREDIT/DEBIT TCP server")
+    parser.add_argument("--connections", type=int, default=16)
+    parser.add_argument("--pipeline", type=int, default=64, help="Requests in flight per connection")
+    parser.add_argument("--requests", type=int, default=20000, help="Requests per connection")
+    parser.add_argument("--accounts", type=int, default=1000)
+    parser.add_argument("--host", help="Existing server (default: start one in a child process)")
+    parser.add_argument("--port", type=int, default=server.DEFAULT_PORT)
+    args = parser.parse_args(argv)
+
+    process = None
+    host, port = args.host, args.port
+    if host is None:
+        # Server in its own process, so client and server do not share a core
+        host, port = server.DEFAULT_HOST, free_port()
+        process = multiprocessing.Process(target=server.run_server, args=(host, port), daemon=True)
+        process.start()
+    try:
+        wait_for_server(host, port)
+        elapsed, latencies = asyncio.run(
+            run_load(host, port, args.connections, args.pipeline, args.requests, args.accounts)
+        )
+    finally:
+        if process is not None:
+            process.terminate()
+            process.join()
+
+    latencies.sort()
+    total = len(latencies)
+    print(f"{args.connections} connections x {args.requests} requests, pipeline {args.pipeline}")
+    print(f"throughput: {total / elapsed:,.0f} req/s")
+    for label, fraction in (("p50", 0.50), ("p99", 0.99), ("p999", 0.999)):
+        print(f"{label:<5} latency: {percentile(latencies, fraction) * 1000:.3f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Sharding benchmark - throughput of the process-sharded ledger by shard count
+Usage: python benchmarks/bench_sharding.py [--transactions N] [--batch N] [--shards 1 2 4 8]
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from operations import Operations
+from sharding import ShardedLedger
+
+
+def make_transactions(count, accounts, seed=1):
+    """Uniformly distributed credits and debits"""
+    rng = random.Random(seed)
+    return [
+        (rng.choice(("CREDIT", "DEBIT ")), f"{rng.randrange(0, 50000) / 100:.2f}", rng.randrange(accounts))
+        for _ in range(count)
+    ]
+
+
+def measure_single(transactions):
+    """Baseline - one process, no routing"""
+    apply_transaction = Operations(DataProgram()).apply_transaction
+    start = time.perf_counter()
+    for transaction in transactions:
+        apply_transaction(*transaction)
+    return len(transactions) / (time.perf_counter() - start)
+
+
+def measure_sharded(transactions, shards, batch):
+    """Push the transactions through the router in batches"""
+    with ShardedLedger(shards=shards) as ledger:
+        start = time.perf_counter()
+        for offset in range(0, len(transactions), batch):
+            ledger.apply_batch(transactions[offset:offset + batch])
+        return len(transactions) / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    cpus = os.cpu_count() or 1
+    default_shards = sorted({1, 2, 4, 8, cpus})
+    parser = argparse.ArgumentParser(description="Benchmark the sharded ledger")
+    parser.add_argument("--transactions", type=int, default=400000)
+    parser.add_argument("--accounts", type=int, default=100000)
+    parser.add_argument("--batch", type=int, default=10000, help="Transactions per router batch")
+    parser.add_argument("--shards", type=int, nargs="+", default=default_shards)
+    args = parser.parse_args(argv)
+
+    transactions = make_transactions(args.transactions, args.accounts)
+    single = measure_single(transactions)
+    print(f"{args.transactions} transactions, batch {args.batch}, {cpus} CPUs")
+    print(f"{'shards':>8}{'tx/s':>14}{'speedup':>10}")
+    print(f"{'single':>8}{single:>14,.0f}{1:>10.2f}")
+    for shards in args.shards:
+        rate = measure_sharded(transactions, shards, args.batch)
+        print(f"{shards:>8}{rate:>14,.0f}{rate / single:>10.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,63 @@
+#!/usr/bin/env python3
+"""
+Startup benchmark - snapshot load plus log-tail replay
+Usage: python benchmarks/bench_startup.py [--accounts N] [--tail N]
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from snapshot import recover_store, write_snapshot
+from wal import WriteAheadLog
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark snapshot + log replay startup")
+    parser.add_argument("--accounts", type=int, default=10_000_000, help="Accounts in the snapshot")
+    parser.add_argument("--history", type=int, default=1_000_000, help="Log records before the snapshot")
+    parser.add_argument("--tail", type=int, default=10_000, help="Log records after the snapshot")
+    parser.add_argument("--repeat", type=int, default=5, help="Timed startups")
+    args = parser.parse_args(argv)
+
+    rng = random.Random(1)
+    with tempfile.TemporaryDirectory() as directory:
+        snapshot_path = os.path.join(directory, "balances.snap")
+        wal_path = os.path.join(directory, "balances.wal")
+
+        print(f"Preparing {args.accounts:,} accounts, {args.history:,} + {args.tail:,} log records...")
+        with WriteAheadLog(wal_path, sync_every=0) as wal:
+            for i in range(args.history):
+                wal.append(rng.randrange(args.accounts), i)
+            offset = wal.tell()
+            for i in range(args.tail):
+                wal.append(rng.randrange(args.accounts), i)
+
+        ids = array("I", range(args.accounts))
+        balances = array("q", [100000]) * args.accounts
+        write_snapshot(snapshot_path, ids, balances, offset)
+        del ids, balances
+
+        timings = []
+        for _ in range(args.repeat):
+            start = time.perf_counter()
+            store = recover_store(snapshot_path, wal_path)
+            timings.append(time.perf_counter() - start)
+            assert len(store) == args.accounts
+            del store
+
+        timings.sort()
+        print(f"Startup: best {timings[0] * 1000:.1f} ms, median {timings[len(timings) // 2] * 1000:.1f} ms")
+
+        start = time.perf_counter()
+        store = recover_store(os.path.join(directory, "missing.snap"), wal_path)
+        print(f"Full log replay without snapshot: {(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
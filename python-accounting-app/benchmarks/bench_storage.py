@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Storage benchmark - random reads, writes and a mixed load per balance store
+Usage: python benchmarks/bench_storage.py [--accounts N] [--operations N] [--json-operations N] [--backends LIST]
+
+Every backend starts with --accounts stored balances and goes through
+DataProgram.read_cents / write_cents, the paths _handle_read_operation and
+_handle_write_operation take. sqlite-1 is the SQLite store committing
+every write on its own, to show what batching saves. The json store
+rewrites the whole file on each write, so it runs --json-operations only.
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from array import array
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from account_store import AccountStore
+from data import DataProgram
+from json_store import JsonAccountStore
+from mmap_store import MappedAccountStore
+from sqlite_store import SqliteAccountStore
+
+BACKENDS = ("memory", "mmap", "sqlite", "sqlite-1", "json")
+
+
+def open_backend(name, directory, accounts):
+    """Store of the given backend holding accounts balances"""
+    ids = array("I", range(accounts))
+    balances = array("q", [100000] * accounts)
+    if name == "memory":
+        store = AccountStore()
+        store.load(ids, balances)
+    elif name == "mmap":
+        store = MappedAccountStore(os.path.join(directory, "accounts.dat"), capacity=accounts)
+        for account_id in ids:
+            store.set_cents(account_id, 100000)
+    elif name.startswith("sqlite"):
+        store = SqliteAccountStore(os.path.join(directory, f"{name}.db"), batch_size=1 if name == "sqlite-1" else 256)
+        store.set_many(ids, balances)
+    else:
+        store = JsonAccountStore(os.path.join(directory, "account_data.json"))
+        store.set_many(ids, balances)
+    return DataProgram(store)
+
+
+def run_load(data_program, account_ids, write_every):
+    """
+    Apply one operation per account id, return operations per second
+
+    Args:
+        write_every (int): Every write_every-th operation is a write, the
+            rest are reads (1 = writes only, 0 = reads only)
+    """
+    read_cents, write_cents = data_program.read_cents, data_program.write_cents
+    start = time.perf_counter()
+    for index, account_id in enumerate(account_ids):
+        if write_every and index % write_every == 0:
+            write_cents(index, account_id)
+        else:
+            read_cents(account_id)
+    flush = getattr(data_program.store, "flush", None)
+    if flush is not None:
+        flush()
+    return len(account_ids) / (time.perf_counter() - start)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the balance stores")
+    parser.add_argument("--accounts", type=int, default=1_000_000)
+    parser.add_argument("--operations", type=int, default=200_000)
+    parser.add_argument("--json-operations", type=int, default=5)
+    parser.add_argument("--backends", default=",".join(BACKENDS), help="Comma-separated subset of " + ", ".join(BACKENDS))
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+
+    rng = random.Random(args.seed)
+    account_ids = [rng.randrange(args.accounts) for _ in range(args.operations)]
+    loads = (("reads", 0), ("writes", 1), ("mixed 80/20", 5))
+
+    print(f"{args.accounts} accounts, random account per operation (ops/s)")
+    print(f"{'backend':<10} {'setup':>8}" + "".join(f" {name:>12}" for name, _ in loads))
+    for name in args.backends.split(","):
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            data_program = open_backend(name, directory, args.accounts)
+            setup = time.perf_counter() - start
+            count = args.json_operations if name == "json" else args.operations
+            # sqlite-1 runs a transaction per write - keep it short
+            if name == "sqlite-1":
+                count = min(count, 20_000)
+            rates = [run_load(data_program, account_ids[:count], write_every) for _, write_every in loads]
+            data_program.close()
+        print(f"{name:<10} {setup:>7.2f}s" + "".join(f" {rate:>12,.1f}" for rate in rates))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
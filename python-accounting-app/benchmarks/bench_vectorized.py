@@ -0,0 +1,100 @@
+#!/usr/bin/env python3
+"""
+Vectorized batch benchmark - NumPy engine vs scalar apply_transaction
+Usage: python benchmarks/bench_vectorized.py [--rows N] [--accounts N] [--scalar-rows N] [--seed N]
+
+The scalar path is timed on the first --scalar-rows transactions and
+scaled to the full batch; both paths are checked to agree on that prefix.
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+from money import format_cents
+from operations import Operations
+
+# (label, debit share, debit cents range, credit cents range) - the
+# overdrawn mix makes about a third of the accounts hit a rejection
+MIXES = [
+    ("mostly accepted", 0.4, (1, 50000), (1, 100000)),
+    ("frequent rejections", 0.6, (1, 200000), (1, 100000)),
+]
+
+
+def make_batch(rng, rows, accounts, debit_share, debit_range, credit_range):
+    """Random account ids and signed amounts"""
+    account_ids = rng.integers(0, accounts, rows, dtype=np.int64)
+    debits = rng.random(rows) < debit_share
+    cents = np.where(
+        debits,
+        -rng.integers(*debit_range, rows, dtype=np.int64),
+        rng.integers(*credit_range, rows, dtype=np.int64),
+    )
+    return account_ids, cents
+
+
+def run_scalar(account_ids, cents):
+    """Apply transactions one by one, return (seconds, statuses, balances)"""
+    operations = Operations()
+    transactions = [
+        ("CREDIT" if amount >= 0 else "DEBIT", format_cents(abs(amount)), account_id)
+        for account_id, amount in zip(account_ids.tolist(), cents.tolist())
+    ]
+    apply_transaction = operations.apply_transaction
+    start = time.perf_counter()
+    results = [apply_transaction(operation, amount, account_id) for operation, amount, account_id in transactions]
+    elapsed = time.perf_counter() - start
+    return elapsed, [result[2] for result in results], [result[3] for result in results]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the NumPy batch engine")
+    parser.add_argument("--rows", type=int, default=10_000_000)
+    parser.add_argument("--accounts", type=int, default=100_000)
+    parser.add_argument("--scalar-rows", type=int, default=200_000, help="Rows timed on the scalar path")
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args(argv)
+    if np is None:
+        print("NumPy is not installed - pip install numpy")
+        return 1
+
+    from vectorized import STATUSES
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{args.rows} transactions over {args.accounts} accounts")
+    print(f"{'mix':<22}{'rejected':>10}{'vectorized':>12}{'scalar':>12}{'speedup':>10}")
+    for label, debit_share, debit_range, credit_range in MIXES:
+        account_ids, cents = make_batch(rng, args.rows, args.accounts, debit_share, debit_range, credit_range)
+
+        operations = Operations()
+        start = time.perf_counter()
+        result = operations.apply_arrays(account_ids, cents)
+        vector_time = time.perf_counter() - start
+
+        sample = min(args.scalar_rows, args.rows)
+        scalar_sample, statuses, balances = run_scalar(account_ids[:sample], cents[:sample])
+        prefix = Operations().apply_arrays(account_ids[:sample], cents[:sample])
+        if [STATUSES[code] for code in prefix["status"].tolist()] != statuses or prefix["balances"].tolist() != balances:
+            print(f"{label}: vectorized and scalar results differ!")
+            return 1
+        scalar_time = scalar_sample * args.rows / sample
+
+        rejected = float(np.mean(result["status"] == 1))
+        print(
+            f"{label:<22}{rejected:>9.1%}{vector_time:>11.2f}s{scalar_time:>11.2f}s"
+            f"{scalar_time / vector_time:>9.0f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+WAL benchmark - write throughput for each durability mode
+Usage: python benchmarks/bench_wal.py [--records N] [--threads 1 8]
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import threading
+import time
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from wal import WriteAheadLog
+
+# (label, sync_every, sync_interval_ms) - from most to least durable
+MODES = [
+    ("fsync every write", 1, None),
+    ("group commit 64", 64, None),
+    ("group commit 1024", 1024, None),
+    ("interval 5 ms", 0, 5),
+    ("interval 50 ms", 0, 50),
+    ("OS page cache only", 0, None),
+]
+
+
+def measure(sync_every, sync_interval_ms, records, threads):
+    """Write records through DataProgram from several threads"""
+    with tempfile.TemporaryDirectory() as directory:
+        wal = WriteAheadLog(os.path.join(directory, "bench.wal"), sync_every, sync_interval_ms)
+        data_program = DataProgram(wal=wal)
+
+        def writer(base):
+            write_cents = data_program.write_cents
+            for i in range(records):
+                write_cents(i, base + i % 1000)
+
+        workers = [threading.Thread(target=writer, args=(n * 1000,)) for n in range(threads)]
+        start = time.perf_counter()
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+        wal.sync()
+        elapsed = time.perf_counter() - start
+        data_program.close()
+        return records * threads / elapsed, wal.sync_count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark WAL durability modes")
+    parser.add_argument("--records", type=int, default=20000, help="Writes per thread")
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 8], help="Writer thread counts")
+    args = parser.parse_args(argv)
+
+    print(f"{'mode':<22}{'threads':>8}{'writes/s':>14}{'fsyncs':>9}")
+    for label, sync_every, sync_interval_ms in MODES:
+        for threads in args.threads:
+            # fsync per write is slow - keep its run short
+            records = min(args.records, 2000) if sync_every == 1 else args.records
+            rate, fsyncs = measure(sync_every, sync_interval_ms, records, threads)
+            print(f"{label:<22}{threads:>8}{rate:>14,.0f}{fsyncs:>9}")
+
+
+if __name__ == "__main__":
+    main()
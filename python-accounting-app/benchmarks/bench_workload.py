@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Load driver - seeded synthetic traffic through Operations, for capacity planning
+Usage: python benchmarks/bench_workload.py [--transactions N] [--accounts N] [--zipf S]
+           [--mix CREDIT,DEBIT,TOTAL] [--near-limit FRACTION] [--mode closed|open]
+           [--rate PER_SECOND] [--workers N] [--store SPEC] [--seed N]
+
+Closed loop measures the most the system sustains; open loop offers a fixed
+arrival rate and shows the latency at that load. Rerunning with the same
+arguments replays exactly the same transaction stream.
+"""
+
+import argparse
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from operations import Operations
+from storage import open_data_program
+from workload import generate, drive, report
+
+
+def parse_mix(text):
+    """'45,45,10' -> CREDIT/DEBIT/TOTAL weights"""
+    weights = [float(part) for part in text.split(",")]
+    if len(weights) != 3 or min(weights) < 0 or not sum(weights):
+        raise argparse.ArgumentTypeError("mix needs three non-negative weights: CREDIT,DEBIT,TOTAL")
+    return dict(zip(("CREDIT", "DEBIT", "TOTAL"), weights))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Drive synthetic load through Operations")
+    parser.add_argument("--transactions", type=int, default=500_000)
+    parser.add_argument("--accounts", type=int, default=1_000_000)
+    parser.add_argument("--zipf", type=float, default=1.0, help="Zipf exponent of account popularity (default: 1.0)")
+    parser.add_argument("--mix", type=parse_mix, default="45,45,10", help="CREDIT,DEBIT,TOTAL weights (default: 45,45,10)")
+    parser.add_argument("--near-limit", type=float, default=0.01, help="Fraction of amounts near 999999.99")
+    parser.add_argument("--mode", choices=["closed", "open"], default="closed")
+    parser.add_argument("--rate", type=float, help="Open loop arrival rate per second")
+    parser.add_argument("--workers", type=int, default=1, help="Concurrent callers (threads)")
+    parser.add_argument("--stripes", type=int, default=64, help="Account lock stripes when --workers > 1")
+    parser.add_argument("--store", metavar="SPEC", default="memory", help="Balance store (see main.py --store)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    if args.mode == "open" and not args.rate:
+        parser.error("--mode open needs --rate")
+
+    # Generated up front, so producing the stream is not timed as load
+    transactions = list(generate(
+        args.transactions, args.seed, args.accounts, args.zipf, args.mix, args.near_limit
+    ))
+    data_program = open_data_program(args.store)
+    operations = Operations(data_program, lock_stripes=args.stripes if args.workers > 1 else None)
+    try:
+        result = drive(operations, transactions, args.mode, args.rate, args.workers)
+    finally:
+        data_program.close()
+
+    print(f"{args.transactions} transactions over {args.accounts} accounts, Zipf {args.zipf}, seed {args.seed}")
+    for line in report(result):
+        print(line)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,369 @@
+#!/usr/bin/env python3
+"""
+Benchmark suite - micro and end-to-end timings with a regression gate
+Usage: python benchmarks/suite.py [--save-baseline] [--baseline FILE] [--require-baseline] [--rounds N] [-k NAME]
+
+Each benchmark is timed over several rounds; a round's sample is the mean
+time per call. Results are compared with a JSON baseline, and the run
+fails when a benchmark is both slower by more than --min-slowdown and
+significantly slower by Welch's t-test. With --require-baseline a
+missing baseline fails the run instead of only printing a notice.
+"""
+
+import argparse
+import builtins
+import contextlib
+import io
+import json
+import math
+import os
+import platform
+import statistics
+import sys
+import time
+from decimal import Decimal
+from unittest.mock import patch
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from ledger import Ledger
+from main import MainProgram
+from operations import Operations
+from tracing import Tracer
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "baseline.json")
+
+# Regression gate: t statistic above this (one-sided p < ~0.005 for the
+# usual 15+15 rounds) and a slowdown above --min-slowdown
+T_CRITICAL = 3.0
+
+BENCHMARKS = {}
+
+
+def benchmark(name):
+    """Register a benchmark - the function sets up state and returns run(n)"""
+
+    def register(setup):
+        BENCHMARKS[name] = setup
+        return setup
+
+    return register
+
+
+class _NullWriter(io.TextIOBase):
+    """stdout replacement that discards the console output being timed"""
+
+    def write(self, text):
+        return len(text)
+
+
+@contextlib.contextmanager
+def console(answers):
+    """Answer every input() prompt from a cycle of answers and drop the output"""
+    replies = iter(answers)
+
+    def fake_input(prompt=""):
+        return next(replies)
+
+    with patch.object(builtins, "input", fake_input), contextlib.redirect_stdout(_NullWriter()):
+        yield
+
+
+def _repeat(answer):
+    """Endless supply of the same reply"""
+    while True:
+        yield answer
+
+
+@benchmark("operations.total")
+def bench_operations_total():
+    operations = Operations(DataProgram())
+
+    def run(n):
+        with console(_repeat("")):
+            for _ in range(n):
+                operations.execute_operation("TOTAL ")
+
+    return run
+
+
+@benchmark("operations.credit")
+def bench_operations_credit():
+    operations = Operations(DataProgram())
+
+    def run(n):
+        with console(_repeat("12.34")):
+            for _ in range(n):
+                operations.execute_operation("CREDIT")
+
+    return run
+
+
+@benchmark("operations.credit.stats")
+def bench_operations_credit_stats():
+    # Same as operations.credit with statistics enabled - the difference is
+    # the instrumentation overhead
+    operations = Operations(DataProgram())
+    operations.enable_stats()
+
+    def run(n):
+        with console(_repeat("12.34")):
+            for _ in range(n):
+                operations.execute_operation("CREDIT")
+
+    return run
+
+
+@benchmark("operations.credit.ledger")
+def bench_operations_credit_ledger():
+    # Same as operations.credit, recording every credit in a ledger
+    operations = Operations(DataProgram())
+    operations.enable_ledger()
+
+    def run(n):
+        with console(_repeat("12.34")):
+            for _ in range(n):
+                operations.execute_operation("CREDIT")
+
+    return run
+
+
+def _ledger_history(entries):
+    """Ledger with one account holding `entries` transactions, 1 ms apart"""
+    ledger = Ledger()
+    balance = 0
+    for number in range(entries):
+        balance += 1234
+        ledger.record(0, 1234, balance, timestamp=number * 1_000_000)
+    return ledger
+
+
+@benchmark("ledger.range")
+def bench_ledger_range():
+    # 100 entries out of a million - should not depend on history length
+    ledger = _ledger_history(1_000_000)
+
+    def run(n):
+        entries = ledger.entries
+        for number in range(n):
+            start = (number * 7919 % 999_900) * 1_000_000
+            entries(0, start, start + 100_000_000)
+
+    return run
+
+
+@benchmark("ledger.as_of")
+def bench_ledger_as_of():
+    ledger = _ledger_history(1_000_000)
+
+    def run(n):
+        balance_as_of = ledger.balance_as_of
+        for number in range(n):
+            balance_as_of(0, number * 7919 % 1_000_000 * 1_000_000 + 500_000)
+
+    return run
+
+
+@benchmark("operations.debit")
+def bench_operations_debit():
+    operations = Operations(DataProgram())
+    # Alternate debits that succeed with ones rejected for insufficient funds
+    operations.data_program.write_cents(10 ** 12)
+
+    def run(n):
+        with console(_repeat("12.34")):
+            for _ in range(n):
+                operations.execute_operation("DEBIT ")
+
+    return run
+
+
+@benchmark("data.read")
+def bench_data_read():
+    data_program = DataProgram()
+    balance = Decimal("1000.00")
+
+    def run(n):
+        execute_operation = data_program.execute_operation
+        for _ in range(n):
+            execute_operation("read", balance)
+
+    return run
+
+
+@benchmark("data.write")
+def bench_data_write():
+    data_program = DataProgram()
+    balance = Decimal("1234.56")
+
+    def run(n):
+        execute_operation = data_program.execute_operation
+        for _ in range(n):
+            execute_operation("write", balance)
+
+    return run
+
+
+@benchmark("operations.format_currency")
+def bench_format_currency():
+    operations = Operations(DataProgram())
+    value = Decimal("1234.5678")
+
+    def run(n):
+        format_currency = operations._format_currency
+        for _ in range(n):
+            format_currency(value)
+
+    return run
+
+
+@benchmark("main.session")
+def bench_main_session():
+    # One session: balance, credit, debit, rejected debit, invalid choice, exit
+    answers = ["1", "2", "100.00", "3", "50.00", "3", "99999.00", "9", "4"]
+
+    def run(n):
+        with console(answers * n):
+            for _ in range(n):
+                main_program = MainProgram()
+                main_program.run()
+
+    return run
+
+
+@benchmark("main.session.trace_off")
+def bench_main_session_trace_off():
+    # Same as main.session with a tracer that samples nothing - should match it
+    answers = ["1", "2", "100.00", "3", "50.00", "3", "99999.00", "9", "4"]
+    tracer = Tracer(os.devnull, sample_rate=0.0)
+
+    def run(n):
+        with console(answers * n):
+            for _ in range(n):
+                main_program = MainProgram(tracer=tracer)
+                main_program.run()
+
+    return run
+
+
+def calibrate(run, target_seconds):
+    """Pick a call count that makes one round last about target_seconds"""
+    n = 1
+    while True:
+        start = time.perf_counter()
+        run(n)
+        elapsed = time.perf_counter() - start
+        if elapsed >= target_seconds / 10 or n >= 1 << 24:
+            return max(1, int(n * target_seconds / max(elapsed, 1e-9)))
+        n *= 10
+
+
+def measure(setup, rounds, target_seconds, repeat=3):
+    """
+    Time one benchmark, returning the per-call seconds of each round
+
+    A round keeps the best of `repeat` runs, which filters out most of the
+    interference (scheduling, other processes) that only ever adds time.
+    """
+    run = setup()
+    n = calibrate(run, target_seconds / repeat)
+    samples = []
+    for _ in range(rounds):
+        best = math.inf
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run(n)
+            best = min(best, time.perf_counter() - start)
+        samples.append(best / n)
+    return samples
+
+
+def welch_t(baseline, current):
+    """Welch's t statistic for current being slower than baseline"""
+    variance = statistics.variance(baseline) / len(baseline) + statistics.variance(current) / len(current)
+    if variance == 0:
+        return math.inf if statistics.mean(current) > statistics.mean(baseline) else 0.0
+    return (statistics.mean(current) - statistics.mean(baseline)) / math.sqrt(variance)
+
+
+def compare(baseline, results, min_slowdown):
+    """
+    Compare results with a baseline
+
+    Returns:
+        list: Names of benchmarks with a significant regression
+    """
+    regressions = []
+    print(f"{'benchmark':<28}{'baseline':>12}{'current':>12}{'change':>9}{'t':>8}")
+    for name, samples in results.items():
+        current = statistics.mean(samples)
+        if name not in baseline:
+            print(f"{name:<28}{'-':>12}{current * 1e6:>10.2f}us{'new':>9}")
+            continue
+
+        base_samples = baseline[name]["samples"]
+        base = statistics.mean(base_samples)
+        change = current / base - 1
+        t = welch_t(base_samples, samples)
+        regressed = change > min_slowdown and t > T_CRITICAL
+        flag = "  REGRESSION" if regressed else ""
+        print(f"{name:<28}{base * 1e6:>10.2f}us{current * 1e6:>10.2f}us{change:>+9.1%}{t:>8.1f}{flag}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the benchmark suite")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="Baseline JSON file")
+    parser.add_argument("--save-baseline", action="store_true", help="Record this run as the new baseline")
+    parser.add_argument("--require-baseline", action="store_true", help="Fail when there is no baseline to compare with")
+    parser.add_argument("--rounds", type=int, default=15, help="Timed rounds per benchmark")
+    parser.add_argument("--round-time", type=float, default=0.05, help="Target seconds per round")
+    parser.add_argument("--min-slowdown", type=float, default=0.10, help="Smallest slowdown reported as a regression")
+    parser.add_argument("-k", dest="select", help="Only run benchmarks whose name contains this")
+    args = parser.parse_args(argv)
+
+    # Fail before timing anything - a gate without a baseline never runs
+    if args.require_baseline and not args.save_baseline and not os.path.exists(args.baseline):
+        print(f"No baseline at {args.baseline} - run with --save-baseline to create one", file=sys.stderr)
+        return 2
+
+    results = {}
+    for name, setup in BENCHMARKS.items():
+        if args.select and args.select not in name:
+            continue
+        results[name] = measure(setup, args.rounds, args.round_time)
+
+    if args.save_baseline:
+        document = {
+            "python": platform.python_version(),
+            "machine": platform.machine(),
+            "benchmarks": {
+                name: {"mean": statistics.mean(samples), "samples": samples}
+                for name, samples in results.items()
+            },
+        }
+        with open(args.baseline, "w", encoding="utf-8") as f:
+            json.dump(document, f, indent=2)
+        for name, samples in results.items():
+            print(f"{name:<28}{statistics.mean(samples) * 1e6:>10.2f}us")
+        print(f"Baseline saved to {args.baseline}")
+        return 0
+
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            baseline = json.load(f)["benchmarks"]
+    else:
+        print(f"No baseline at {args.baseline} - run with --save-baseline to create one")
+
+    regressions = compare(baseline, results, args.min_slowdown)
+    if regressions:
+        print(f"\nSignificant regressions: {', '.join(regressions)}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,265 @@
+#!/usr/bin/env python3
+"""
+Cache Store Module - Bounded hot-account cache in front of a disk-backed store
+Keeps the most used balances in memory so TOTAL and READ rarely reach storage
+"""
+
+from _thread import allocate_lock
+from array import array
+from collections import OrderedDict
+
+from account_store import MAX_ACCOUNT_ID, check_account_id
+
+# Default memory budget - under the Zipf-skewed traffic of
+# benchmarks/bench_cache.py over a million accounts, 16 MiB (about 120k
+# accounts with CLOCK) is within 1% of the hit ratio of an unbounded cache
+DEFAULT_MAX_BYTES = 16 << 20
+
+# Memory per cached account, by policy: the id -> slot map entry with its
+# two int objects, plus the slot's id, balance, reference and dirty bytes.
+# An OrderedDict entry also carries its recency links
+ENTRY_BYTES = {"clock": 136, "lru": 192}
+
+
+class CachedAccountStore:
+    """
+    Read-through, write-back cache of account balances over another store
+
+    Balances live in fixed slots - parallel arrays of ids and cents, with a
+    reference bit and a dirty bit per slot - sized from a memory budget. A
+    read that misses fetches the balance from the store; a write only
+    updates the slot and marks it dirty. When every slot is in use, a
+    victim is chosen by the eviction policy and written back to the store
+    first if dirty; flush() writes back every dirty slot.
+
+    Policies:
+        'clock' (default) - second chance: a hit only sets the slot's
+            reference bit and the clock hand skips referenced slots once.
+            Hits cost no reordering, which suits skewed traffic where most
+            operations hit a small set of hot accounts.
+        'lru' - exact least recently used order, kept in an OrderedDict;
+            every hit moves the account to the recent end.
+
+    Safe to share between threads.
+    """
+
+    def __init__(self, store, max_bytes=DEFAULT_MAX_BYTES, policy="clock"):
+        """
+        Put a cache in front of a store
+
+        Args:
+            store: Backing store (AccountStore interface)
+            max_bytes (int): Memory budget for the cached balances
+            policy (str): 'clock' or 'lru'
+
+        Raises:
+            ValueError: If the policy is unknown or the budget holds no account
+        """
+        if policy not in ENTRY_BYTES:
+            raise ValueError(f"Unknown cache policy '{policy}' (expected clock or lru)")
+        capacity = max_bytes // ENTRY_BYTES[policy]
+        if capacity < 1:
+            raise ValueError(f"Cache budget of {max_bytes} bytes holds no account")
+
+        self.store = store
+        self.policy = policy
+        self.capacity = capacity
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.writebacks = 0
+
+        # Slot arrays - allocated up front, so the budget is spent at once
+        self._ids = array("I", bytes(4 * capacity))
+        self._cents = array("q", bytes(8 * capacity))
+        self._referenced = bytearray(capacity)
+        self._dirty = bytearray(capacity)
+        self._slots = OrderedDict() if policy == "lru" else {}
+        self._hand = 0
+        self._lock = allocate_lock()
+
+        # The LRU variants shadow the CLOCK ones on this instance only
+        if policy == "lru":
+            self._touch = self._lru_touch
+            self._victim = self._lru_victim
+
+    def __len__(self):
+        self.flush()
+        return len(self.store)
+
+    def __contains__(self, account_id):
+        slot = self._slots.get(account_id)
+        if slot is not None and self._dirty[slot]:
+            return True
+        return account_id in self.store
+
+    def _touch(self, account_id, slot):
+        """CLOCK hit - give the account's slot a second chance"""
+        self._referenced[slot] = 1
+
+    def _lru_touch(self, account_id, slot):
+        """LRU hit - move the account to the recently used end"""
+        self._slots.move_to_end(account_id)
+
+    def _victim(self):
+        """CLOCK - advance the hand past referenced slots, clearing their bits"""
+        referenced = self._referenced
+        hand = self._hand
+        while referenced[hand]:
+            referenced[hand] = 0
+            hand += 1
+            if hand == self.capacity:
+                hand = 0
+        self._hand = hand + 1 if hand + 1 < self.capacity else 0
+        return hand
+
+    def _lru_victim(self):
+        """LRU - the slot of the least recently used account"""
+        return self._slots[next(iter(self._slots))]
+
+    def _insert(self, account_id, cents, dirty):
+        """Cache an account in a free slot, evicting one if none is free"""
+        slots = self._slots
+        if len(slots) < self.capacity:
+            slot = len(slots)
+        else:
+            slot = self._victim()
+            evicted = self._ids[slot]
+            if self._dirty[slot]:
+                # Write-back: the store only sees the balance on eviction
+                self.store.set_cents(evicted, self._cents[slot])
+                self.writebacks += 1
+            del slots[evicted]
+            self.evictions += 1
+        slots[account_id] = slot
+        self._ids[slot] = account_id
+        self._cents[slot] = cents
+        # A new account starts without its second chance: one touched only
+        # once goes before the hot accounts, which keeps scans of cold
+        # accounts from flushing them out
+        self._referenced[slot] = 0
+        self._dirty[slot] = dirty
+
+    def get_cents(self, account_id):
+        """
+        Read an account balance, from the cache or else the store
+
+        Args:
+            account_id (int): Account to read
+
+        Returns:
+            int: Balance in cents (invalid ids are passed through to the store)
+        """
+        with self._lock:
+            slot = self._slots.get(account_id)
+            if slot is not None:
+                self.hits += 1
+                self._touch(account_id, slot)
+                return self._cents[slot]
+            self.misses += 1
+            cents = self.store.get_cents(account_id)
+            if 0 <= account_id <= MAX_ACCOUNT_ID:
+                self._insert(account_id, cents, 0)
+            return cents
+
+    def set_cents(self, account_id, cents):
+        """
+        Write an account balance to the cache; the store gets it on
+        eviction or flush()
+
+        Args:
+            account_id (int): Account to write
+            cents (int): New balance in cents
+        """
+        with self._lock:
+            slot = self._slots.get(account_id)
+            if slot is not None:
+                self._touch(account_id, slot)
+                self._cents[slot] = cents
+                self._dirty[slot] = 1
+            else:
+                self._insert(check_account_id(account_id), cents, 1)
+
+    def set_many(self, account_ids, balances):
+        """Write many balances straight to the store, updating cached copies"""
+        for account_id in account_ids:
+            check_account_id(account_id)
+        with self._lock:
+            slots, cents, dirty = self._slots, self._cents, self._dirty
+            for account_id, balance in zip(account_ids, balances):
+                slot = slots.get(account_id)
+                if slot is not None:
+                    cents[slot] = balance
+                    dirty[slot] = 0
+            set_many = getattr(self.store, "set_many", None)
+            if set_many is not None:
+                set_many(account_ids, balances)
+            else:
+                for account_id, balance in zip(account_ids, balances):
+                    self.store.set_cents(account_id, balance)
+
+    def flush(self):
+        """Write every dirty balance back to the store, then flush the store"""
+        with self._lock:
+            dirty = self._dirty
+            positions = [slot for slot in range(len(self._slots)) if dirty[slot]]
+            if positions:
+                ids = [self._ids[slot] for slot in positions]
+                balances = [self._cents[slot] for slot in positions]
+                set_many = getattr(self.store, "set_many", None)
+                if set_many is not None:
+                    set_many(ids, balances)
+                else:
+                    for account_id, cents in zip(ids, balances):
+                        self.store.set_cents(account_id, cents)
+                self.writebacks += len(positions)
+                self._dirty = bytearray(self.capacity)
+            flush_store = getattr(self.store, "flush", None)
+            if flush_store is not None:
+                flush_store()
+
+    def items(self):
+        """Iterate (account_id, cents) pairs of the store, after a flush"""
+        self.flush()
+        return self.store.items()
+
+    def copy_arrays(self):
+        """Return (ids, balances) arrays of the store, after a flush"""
+        self.flush()
+        return self.store.copy_arrays()
+
+    @property
+    def hit_ratio(self):
+        """Fraction of reads served from the cache"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def stats(self):
+        """
+        Cache counters
+
+        Returns:
+            dict: hits, misses, hit_ratio, evictions, writebacks, cached
+                accounts, dirty accounts and capacity
+        """
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": self.hit_ratio,
+            "evictions": self.evictions,
+            "writebacks": self.writebacks,
+            "cached": len(self._slots),
+            "dirty": self._dirty.count(1),
+            "capacity": self.capacity,
+        }
+
+    def memory_usage(self):
+        """Approximate bytes held by the cache when full"""
+        return self.capacity * ENTRY_BYTES[self.policy]
+
+    def close(self):
+        """Write back dirty balances and close the store"""
+        self.flush()
+        close_store = getattr(self.store, "close", None)
+        if close_store is not None:
+            close_store()
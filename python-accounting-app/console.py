@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Console Module - Block-buffered output for scripted (piped) sessions
+Replaces one write per DISPLAY with one write per block of results
+"""
+
+import sys
+
+# Flush after this many lines unless told otherwise
+DEFAULT_FLUSH_LINES = 1000
+
+# Flush once this many characters are pending, whatever the line count
+BUFFER_SIZE = 64 * 1024
+
+
+class BufferedOutput:
+    """
+    Text writer that collects output and writes it in blocks
+
+    Used as the file= of print(): output is held in memory and written to
+    the underlying stream every flush_lines lines, when BUFFER_SIZE
+    characters are pending, and when the writer is flushed or closed.
+    """
+
+    def __init__(self, stream=None, flush_lines=DEFAULT_FLUSH_LINES):
+        """
+        Initialize the writer
+
+        Args:
+            stream (file): Text stream receiving the blocks (default: sys.stdout)
+            flush_lines (int): Lines per block (0 = only by size and at close)
+        """
+        self.stream = stream if stream is not None else sys.stdout
+        self.flush_lines = flush_lines
+        self._parts = []
+        self._lines = 0
+        self._size = 0
+
+    def write(self, text):
+        self._parts.append(text)
+        self._size += len(text)
+        if "\n" in text:
+            self._lines += text.count("\n")
+            if self.flush_lines and self._lines >= self.flush_lines:
+                self.flush()
+                return len(text)
+        if self._size >= BUFFER_SIZE:
+            self.flush()
+        return len(text)
+
+    def flush(self):
+        """Write pending output to the stream"""
+        if self._parts:
+            self.stream.write("".join(self._parts))
+            self._parts = []
+            self._lines = 0
+            self._size = 0
+        self.stream.flush()
+
+    def close(self):
+        """Flush; the underlying stream is left open"""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
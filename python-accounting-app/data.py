@@ -4,28 +4,50 @@ Data Program Module - Data Persistence Layer
 Converted from COBOL DataProgram (data.cob)
 """
 
-from decimal import Decimal, ROUND_HALF_UP
-import json
-import os
-from typing import Union
+from decimal import Decimal
+from _thread import allocate_lock
+from account_store import AccountStore, DEFAULT_ACCOUNT_ID
+from money import to_cents, to_decimal
 
 
 class DataProgram:
     """Data program class handling data persistence operations"""
 
-    def __init__(self):
-        """Initialize the data program - equivalent to WORKING-STORAGE SECTION"""
-        # STORAGE-BALANCE PIC 9(6)V99 VALUE 1000.00
-        self.storage_balance = Decimal("1000.00")
+    def __init__(self, store=None, wal=None):
+        """
+        Initialize the data program - equivalent to WORKING-STORAGE SECTION
+
+        Args:
+            store (AccountStore): Keyed balance storage (default: new in-memory store)
+            wal (WriteAheadLog): Log receiving every write before it is applied
+        """
+        # STORAGE-BALANCE PIC 9(6)V99 VALUE 1000.00 - account DEFAULT_ACCOUNT_ID
+        # of the store, held as int cents like every other account
+        self.store = store if store is not None else AccountStore()
+        self.wal = wal
         self.operation_type = ""
 
+        # Stream for messages (None = sys.stdout) - set to the console output
+        # so they stay in order with buffered results
+        self.output = None
+
+        # Serializes store updates and keeps the log in the same order
+        self._write_lock = allocate_lock()  # threading.Lock without importing threading
+
         # Enhanced persistence - store data in JSON file for session persistence
+        # (re-enabling file persistence needs json and os imported here)
         # self.data_file = '/workspaces/modernize-legacy-cobol-app/account_data.json'
         # self._load_data()
 
-    def _format_currency(self, value):
-        """Format decimal value to 2 decimal places like COBOL PIC 9(6)V99"""
-        return value.quantize(Decimal("0.01"), rounding=ROUND_HALF_UP)
+    @property
+    def storage_balance(self):
+        """STORAGE-BALANCE as a Decimal with 2 decimal places"""
+        return to_decimal(self.store.get_cents(DEFAULT_ACCOUNT_ID))
+
+    @storage_balance.setter
+    def storage_balance(self, value):
+        """Store a Decimal balance, rounded like COBOL PIC 9(6)V99"""
+        self.store.set_cents(DEFAULT_ACCOUNT_ID, to_cents(value))
 
     # def _load_data(self):
     #     """Load data from persistent storage (enhanced from COBOL)"""
@@ -53,69 +75,75 @@ class DataProgram:
     #     except Exception as e:
     #         print(f"Warning: Could not save data file: {e}")
 
-    def _handle_read_operation(self, balance):
+    def _handle_read_operation(self, balance, account_id=DEFAULT_ACCOUNT_ID):
         """
         Handle read operation - equivalent to IF OPERATION-TYPE = 'READ'
 
         Args:
             balance (Decimal): Balance parameter from calling program
+            account_id (int): Account to read
 
         Returns:
             Decimal: Current storage balance
         """
         # MOVE STORAGE-BALANCE TO BALANCE
-        return self.storage_balance
+        return to_decimal(self.store.get_cents(account_id))
 
-    def _handle_write_operation(self, balance):
+    def _handle_write_operation(self, balance, account_id=DEFAULT_ACCOUNT_ID):
         """
         Handle write operation - equivalent to ELSE IF OPERATION-TYPE = 'WRITE'
 
         Args:
             balance (Decimal): New balance to store
+            account_id (int): Account to write
 
         Returns:
             Decimal: Updated balance (same as input)
         """
         # MOVE BALANCE TO STORAGE-BALANCE
-        self.storage_balance = self._format_currency(balance)
-
-        # # Enhanced: Persist to file
-        # self._save_data()
+        cents = self.write_cents(to_cents(balance), account_id)
 
-        return self.storage_balance
+        return to_decimal(cents)
 
-    def execute_operation(self, passed_operation, balance):
+    def execute_operation(self, passed_operation, balance, account_id=None):
         """
         Main operation executor - equivalent to PROCEDURE DIVISION USING PASSED-OPERATION BALANCE
 
         Args:
             passed_operation (str): Operation type ('read' or 'write')
             balance (Decimal): Balance parameter
+            account_id (int): Account to operate on (default: the single
+                STORAGE-BALANCE account)
 
         Returns:
             Decimal: Result balance based on operation
         """
         # MOVE PASSED-OPERATION TO OPERATION-TYPE
-        self.operation_type = passed_operation.lower().strip()
+        # (dispatch on a local copy - concurrent callers share this instance)
+        operation_type = passed_operation.lower().strip()
+        self.operation_type = operation_type
 
         try:
             # Convert balance to Decimal if it's not already
             if not isinstance(balance, Decimal):
                 balance = Decimal(str(balance))
 
+            if account_id is None:
+                account_id = DEFAULT_ACCOUNT_ID
+
             # Handle operations - equivalent to IF/ELSE IF structure
-            if self.operation_type == "read":
-                return self._handle_read_operation(balance)
+            if operation_type == "read":
+                return self._handle_read_operation(balance, account_id)
 
-            elif self.operation_type == "write":
-                return self._handle_write_operation(balance)
+            elif operation_type == "write":
+                return self._handle_write_operation(balance, account_id)
 
             else:
-                print(f"Unknown operation: {self.operation_type}")
+                print(f"Unknown operation: {operation_type}", file=self.output)
                 return balance
 
         except Exception as e:
-            print(f"Error in DataProgram operation '{self.operation_type}': {e}")
+            print(f"Error in DataProgram operation '{operation_type}': {e}", file=self.output)
             return balance
 
         # GOBACK - return to calling program (implicit in Python)
@@ -123,3 +151,107 @@ class DataProgram:
     def get_current_balance(self):
         """Utility method to get current balance without operation overhead"""
         return self.storage_balance
+
+    def read_cents(self, account_id=DEFAULT_ACCOUNT_ID):
+        """Fast path read - account balance as int cents, no Decimal involved"""
+        return self.store.get_cents(account_id)
+
+    def write_cents(self, cents, account_id=DEFAULT_ACCOUNT_ID):
+        """Fast path write - store an int cents balance, no Decimal involved"""
+        wal = self.wal
+        with self._write_lock:
+            # Enhanced: journal the write before applying it
+            if wal is not None:
+                wal.append(account_id, cents, sync=False)
+            self.store.set_cents(account_id, cents)
+
+        # Group commit outside the lock so writers can share one fsync
+        if wal is not None:
+            wal.sync_if_due()
+        return cents
+
+    def write_many_cents(self, account_ids, balances):
+        """
+        Bulk write - store int cents balances for many accounts at once
+
+        Args:
+            account_ids (list): Accounts to write
+            balances (list): New balances in cents, parallel to account_ids
+        """
+        wal = self.wal
+        with self._write_lock:
+            if wal is not None:
+                for account_id, cents in zip(account_ids, balances):
+                    wal.append(account_id, cents, sync=False)
+            set_many = getattr(self.store, "set_many", None)
+            if set_many is not None:
+                set_many(account_ids, balances)
+            else:
+                for account_id, cents in zip(account_ids, balances):
+                    self.store.set_cents(account_id, cents)
+
+        if wal is not None:
+            wal.sync_if_due()
+
+    def update_balances(self, update, journal=True):
+        """
+        Rewrite stored balances in one pass over the balance array
+
+        Args:
+            update (callable): Called under the write lock with (ids,
+                balances) - the array('I') / array('q') of every stored
+                account - changes balances in place and returns the
+                positions it changed
+            journal (bool): Log the changed balances to the write-ahead log;
+                pass False only when a snapshot is written right after
+
+        Returns:
+            Whatever update returned
+        """
+        wal = self.wal
+        with self._write_lock:
+            live = getattr(self.store, "arrays", None)
+            ids, balances = live() if live is not None else self.store.copy_arrays()
+            changed = update(ids, balances)
+            if live is None or (wal is not None and journal):
+                positions = changed.tolist() if hasattr(changed, "tolist") else changed
+                for position in positions:
+                    if live is None:
+                        self.store.set_cents(ids[position], balances[position])
+                    if wal is not None and journal:
+                        wal.append(ids[position], balances[position], sync=False)
+
+        if wal is not None and journal:
+            wal.sync_if_due()
+        return changed
+
+    def checkpoint_state(self):
+        """
+        Capture a consistent copy of every balance for a snapshot
+
+        Returns:
+            tuple: (ids, balances, wal_offset) - the copy reflects exactly the
+                log records before wal_offset, all of them synced to disk
+        """
+        wal = self.wal
+        if wal is not None:
+            # Most of the backlog outside the write lock, so writers keep
+            # going during the slow part
+            wal.sync()
+        with self._write_lock:
+            wal_offset = None
+            if wal is not None:
+                # A snapshot must never cover records a crash can still take
+                # away, or the next records would land before its offset
+                wal.sync()
+                wal_offset = wal.tell()
+            ids, balances = self.store.copy_arrays()
+        return ids, balances, wal_offset
+
+    def close(self):
+        """Sync and close the write-ahead log and the store, if they need it"""
+        if self.wal is not None:
+            self.wal.close()
+        close_store = getattr(self.store, "close", None)
+        if close_store is not None:
+            close_store()
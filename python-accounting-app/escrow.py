@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Escrow Module - Per-worker credit buffers for high-contention hot accounts
+Credits commute, so credits to a designated hot account are collected
+without the account lock and folded into its balance when it is read
+"""
+
+import threading
+from collections import deque
+
+# Buffered credits per worker and account before the worker merges them
+DEFAULT_MAX_PENDING = 1024
+
+
+class CreditEscrow:
+    """
+    Pending credits of hot accounts, one buffer per worker thread and account
+
+    A worker appends to its own buffer, so concurrent credits never wait
+    for each other or for the account lock. drain() takes every pending
+    credit of an account out of all buffers; deque append and popleft are
+    atomic, so each credit is drained exactly once even while workers keep
+    adding. Buffers of finished threads stay registered (and are drained
+    like the others); workers are expected to be a long-lived pool.
+    """
+
+    def __init__(self, account_ids, max_pending=DEFAULT_MAX_PENDING):
+        """
+        Create empty buffers
+
+        Args:
+            account_ids (iterable): Hot accounts
+            max_pending (int): Credits a worker buffers per account before
+                add() asks it to merge, at least 1
+
+        Raises:
+            ValueError: If max_pending is below 1
+        """
+        if max_pending < 1:
+            raise ValueError(f"max_pending must be at least 1, got {max_pending}")
+        self.accounts = frozenset(account_ids)
+        self.max_pending = max_pending
+        self._buffers = {account_id: [] for account_id in self.accounts}
+        self._local = threading.local()
+        self._register_lock = threading.Lock()
+
+    def _own_buffer(self, account_id):
+        """This thread's buffer for an account, created on first use"""
+        buffer = deque()
+        with self._register_lock:
+            self._buffers[account_id].append(buffer)
+        self._local.buffers[account_id] = buffer
+        return buffer
+
+    def add(self, account_id, cents, timestamp=0):
+        """
+        Buffer a validated credit
+
+        Args:
+            account_id (int): Hot account
+            cents (int): Credit amount in cents
+            timestamp (int): When the credit was accepted, ns since the
+                epoch, for the ledger (0 = not recorded)
+
+        Returns:
+            bool: True when this worker's buffer is full and should be merged
+        """
+        try:
+            buffers = self._local.buffers
+        except AttributeError:
+            buffers = self._local.buffers = {}
+        buffer = buffers.get(account_id)
+        if buffer is None:
+            buffer = self._own_buffer(account_id)
+        buffer.append((timestamp, cents))
+        return len(buffer) >= self.max_pending
+
+    def drain(self, account_id):
+        """
+        Take every pending credit of an account
+
+        Returns:
+            list: (timestamp, cents) pairs, each worker's in the order added
+        """
+        amounts = []
+        for buffer in self._buffers[account_id]:
+            popleft = buffer.popleft
+            # Bounded by the current length - credits added meanwhile wait
+            # for the next drain
+            for _ in range(len(buffer)):
+                amounts.append(popleft())
+        return amounts
+
+    def pending(self, account_id=None):
+        """Number of credits waiting to be merged (for one account, or all)"""
+        accounts = self.accounts if account_id is None else (account_id,)
+        return sum(len(buffer) for account in accounts for buffer in self._buffers[account])
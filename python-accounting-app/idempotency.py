@@ -0,0 +1,131 @@
+#!/usr/bin/env python3
+"""
+Idempotency Module - Remember recent request outcomes by client key
+A retried credit or debit returns its original result instead of being
+applied a second time
+"""
+
+from _thread import allocate_lock
+from collections import OrderedDict
+from time import monotonic
+
+# Keys remembered at most, and for how long (seconds)
+DEFAULT_MAX_KEYS = 100_000
+DEFAULT_TTL = 300.0
+
+
+class IdempotencyCache:
+    """
+    Bounded map of idempotency key -> (request, result)
+
+    Entries leave in least recently used order once max_keys is reached,
+    and expire ttl seconds after they were stored, whichever comes first,
+    so memory stays bounded however fast new keys arrive. Lookups and
+    stores are O(1); eviction pops from the old end of an OrderedDict.
+    Safe to share between threads.
+    """
+
+    def __init__(self, max_keys=DEFAULT_MAX_KEYS, ttl=DEFAULT_TTL, clock=monotonic):
+        """
+        Create an empty cache
+
+        Args:
+            max_keys (int): Most keys kept at once
+            ttl (float): Seconds a key is remembered after it is stored
+                (None = until evicted by size)
+            clock (callable): Time source in seconds
+        """
+        if max_keys < 1:
+            raise ValueError("max_keys must be at least 1")
+        self.max_keys = max_keys
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._entries = OrderedDict()
+        self._lock = allocate_lock()
+        # No stored key can have expired before this time
+        self._sweep_at = 0.0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return self.get(key, count=False) is not None
+
+    def get(self, key, count=True):
+        """
+        Look up a key
+
+        Args:
+            key (str): Idempotency key
+            count (bool): Count the lookup as a hit or miss
+
+        Returns:
+            tuple: (request, result) stored for the key, or None if it is
+                unknown or has expired
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                expires, request, result = entry
+                if expires is None or expires > self.clock():
+                    self._entries.move_to_end(key)
+                    if count:
+                        self.hits += 1
+                    return request, result
+                del self._entries[key]
+                self.expirations += 1
+            if count:
+                self.misses += 1
+            return None
+
+    def put(self, key, request, result):
+        """
+        Remember the outcome of a request
+
+        Args:
+            key (str): Idempotency key
+            request (tuple): What was asked, to detect a key reused for
+                another request
+            result (tuple): What was returned
+        """
+        with self._lock:
+            entries = self._entries
+            if key in entries:
+                entries.move_to_end(key)
+            if self.ttl is None:
+                entries[key] = (None, request, result)
+            else:
+                now = self.clock()
+                entries[key] = (now + self.ttl, request, result)
+                # Drop expired keys from the old end once the oldest may have
+                # expired - each key is dropped once, so this is O(1) on average
+                if now >= self._sweep_at:
+                    self._sweep(now)
+
+            if len(entries) > self.max_keys:
+                entries.popitem(last=False)
+                self.evictions += 1
+
+    def _sweep(self, now):
+        """Drop expired keys from the least recently used end"""
+        entries = self._entries
+        while entries:
+            oldest = next(iter(entries))
+            expires = entries[oldest][0]
+            if expires > now:
+                # Keys used since they were stored can expire earlier than
+                # this; get() still checks every key it returns
+                self._sweep_at = expires
+                return
+            del entries[oldest]
+            self.expirations += 1
+
+    def clear(self):
+        """Forget every key"""
+        with self._lock:
+            self._entries.clear()
+            self._sweep_at = 0.0
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Ingest Module - Streaming transaction-file processing
+Batch counterpart of the interactive MainProgram menu loop
+"""
+
+import csv
+import json
+import os
+import sys
+import time
+from itertools import tee
+
+from operations import Operations, STATUS_ACCEPTED
+
+
+class IngestError(ValueError):
+    """Raised when a transaction record cannot be parsed"""
+
+
+def detect_format(path):
+    """Guess the file format ('csv' or 'jsonl') from the file extension"""
+    extension = os.path.splitext(path)[1].lower()
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    return "csv"
+
+
+def _parse_csv_line(line):
+    """Parse one 'operation,amount' CSV line"""
+    if '"' in line:
+        fields = next(csv.reader([line]))
+    else:
+        fields = line.split(",")
+    if len(fields) < 2:
+        if len(fields) == 1 and fields[0].strip().upper() == "TOTAL":
+            return "TOTAL", None
+        raise IngestError("expected 'operation,amount'")
+    return fields[0], fields[1]
+
+
+def _parse_jsonl_line(line):
+    """Parse one {"operation": ..., "amount": ...} JSON line"""
+    try:
+        record = json.loads(line)
+    except ValueError as e:
+        raise IngestError(f"invalid JSON: {e}")
+    if not isinstance(record, dict) or "operation" not in record:
+        raise IngestError("missing 'operation' field")
+    operation = record["operation"]
+    if not isinstance(operation, str):
+        raise IngestError("'operation' must be a string")
+    return operation, record.get("amount")
+
+
+def read_records(lines, file_format="csv", rejects=None):
+    """
+    Parse transaction lines lazily
+
+    Malformed lines are passed to rejects(line_number, reason, line) and
+    skipped, so one bad record never stops the run.
+
+    Args:
+        lines (iterable): Raw text lines
+        file_format (str): 'csv' or 'jsonl'
+        rejects (callable): Callback for malformed lines
+
+    Yields:
+        tuple: (line_number, line, operation, amount)
+    """
+    parse_line = _parse_jsonl_line if file_format == "jsonl" else _parse_csv_line
+
+    for line_number, line in enumerate(lines, 1):
+        line = line.rstrip("\r\n")
+        if not line.strip():
+            continue
+
+        try:
+            operation, amount = parse_line(line)
+        except (IngestError, csv.Error) as e:
+            if rejects is not None:
+                rejects(line_number, f"MALFORMED: {e}", line)
+            continue
+
+        # Optional CSV header row
+        if line_number == 1 and file_format == "csv" and operation.strip().lower() == "operation":
+            continue
+
+        yield line_number, line, operation, amount
+
+
+class IngestProgram:
+    """Streams a transaction file through Operations and DataProgram"""
+
+    def __init__(self, operations=None, reject_path=None, output=None):
+        """
+        Initialize the ingestion program
+
+        Args:
+            operations (Operations): Operations instance to apply transactions to
+            reject_path (str): File receiving rejected lines (optional)
+            output (file): Stream for the throughput report (default stdout)
+        """
+        self.operations = operations if operations is not None else Operations()
+        self.reject_path = reject_path
+        self.output = output
+
+    def run(self, path, file_format=None):
+        """
+        Process a transaction file with constant memory
+
+        Args:
+            path (str): CSV or JSONL transaction file
+            file_format (str): 'csv' or 'jsonl' (guessed from extension if None)
+
+        Returns:
+            dict: Summary with per-status counts, elapsed time and throughput
+        """
+        file_format = file_format or detect_format(path)
+        summary = {"lines": 0, "accepted": 0, "rejected": 0, "invalid": 0, "malformed": 0}
+
+        reject_file = open(self.reject_path, "w", encoding="utf-8") if self.reject_path else None
+
+        def rejects(line_number, reason, line):
+            if reject_file is not None:
+                reject_file.write(f"{line_number}\t{reason}\t{line}\n")
+
+        def malformed(line_number, reason, line):
+            summary["malformed"] += 1
+            rejects(line_number, reason, line)
+
+        start = time.perf_counter()
+        try:
+            with open(path, "r", encoding="utf-8", newline="") as f:
+                records, context = tee(read_records(f, file_format, malformed))
+                results = self.operations.iter_batch((op, amount) for _, _, op, amount in records)
+
+                # iter_batch yields exactly one result per transaction, so the
+                # two tee branches advance in lockstep and buffer a single record
+                for (line_number, line, _, _), (operation, _, status, balance) in zip(context, results):
+                    summary[status.lower()] += 1
+                    if status != STATUS_ACCEPTED:
+                        rejects(line_number, f"{status}: {operation}", line)
+
+                # zip stops on the exhausted record branch, so close the batch
+                # explicitly to write the final balance back to DataProgram
+                results.close()
+        finally:
+            if reject_file is not None:
+                reject_file.close()
+
+        elapsed = time.perf_counter() - start
+        summary["lines"] = summary["accepted"] + summary["rejected"] + summary["invalid"] + summary["malformed"]
+        summary["elapsed"] = elapsed
+        summary["throughput"] = summary["lines"] / elapsed if elapsed > 0 else 0.0
+        summary["final_balance"] = self.operations.final_balance
+        return summary
+
+    def report(self, summary):
+        """Display the ingestion summary"""
+        out = self.output or sys.stdout
+        print(f"Lines processed: {summary['lines']}", file=out)
+        print(
+            f"Accepted: {summary['accepted']}  Rejected: {summary['rejected']}  "
+            f"Invalid: {summary['invalid']}  Malformed: {summary['malformed']}",
+            file=out,
+        )
+        print(f"Final balance: {summary['final_balance']}", file=out)
+        print(
+            f"Elapsed: {summary['elapsed']:.3f}s  Throughput: {summary['throughput']:,.0f} lines/s",
+            file=out,
+        )
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+JSON Account Store Module - Balances in the original account_data.json file
+The session persistence once sketched in DataProgram (_load_data/_save_data)
+"""
+
+import json
+import os
+from array import array
+from datetime import datetime
+from decimal import Decimal
+
+from account_store import DEFAULT_ACCOUNT_ID, check_account_id
+from money import INITIAL_BALANCE_CENTS, format_cents, to_cents
+
+
+class JsonAccountStore:
+    """
+    Account balances in a JSON document, rewritten on save
+
+    The file keeps the old layout - 'balance' is STORAGE-BALANCE (account
+    DEFAULT_ACCOUNT_ID) and 'last_updated' the save time - so existing
+    account_data.json files load unchanged. Other accounts go under
+    'accounts', keyed by id. Every save rewrites the whole file, so this
+    store suits a few accounts, not millions. Like AccountStore, writers
+    must be serialized by the caller.
+    """
+
+    def __init__(self, path, save_every=1, default_cents=INITIAL_BALANCE_CENTS):
+        """
+        Open (or create) an account data file
+
+        Args:
+            path (str): JSON file
+            save_every (int): Rewrite the file after this many writes (1 =
+                every write, like the original _save_data)
+            default_cents (int): Balance of an account that was never written
+
+        Raises:
+            ValueError: If the file is not an account data document
+        """
+        self.path = path
+        self.save_every = max(1, save_every)
+        self.default_cents = default_cents
+        self._balances = {}
+        self._unsaved = 0
+
+        if os.path.exists(path):
+            with open(path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if not isinstance(data, dict):
+                raise ValueError(f"Not an account data file: {path}")
+            if "balance" in data:
+                self._balances[DEFAULT_ACCOUNT_ID] = to_cents(Decimal(str(data["balance"])))
+            for account_id, balance in data.get("accounts", {}).items():
+                self._balances[int(account_id)] = to_cents(Decimal(str(balance)))
+
+    def __len__(self):
+        return len(self._balances)
+
+    def __contains__(self, account_id):
+        return account_id in self._balances
+
+    def get_cents(self, account_id):
+        """Read an account balance in cents (default_cents if never written)"""
+        return self._balances.get(account_id, self.default_cents)
+
+    def set_cents(self, account_id, cents):
+        """Write an account balance, saving the file every save_every writes"""
+        balances = self._balances
+        if account_id not in balances:
+            check_account_id(account_id)
+        balances[account_id] = cents
+        self._unsaved += 1
+        if self._unsaved >= self.save_every:
+            self.flush()
+
+    def set_many(self, account_ids, balances):
+        """Write many account balances with one save"""
+        for account_id in account_ids:
+            check_account_id(account_id)
+        self._balances.update(zip(account_ids, balances))
+        self._unsaved += 1
+        self.flush()
+
+    def flush(self):
+        """Rewrite the file if anything changed since the last save"""
+        if not self._unsaved:
+            return
+        data = {}
+        if DEFAULT_ACCOUNT_ID in self._balances:
+            data["balance"] = format_cents(self._balances[DEFAULT_ACCOUNT_ID])
+        data["last_updated"] = str(datetime.now())
+        data["accounts"] = {
+            str(account_id): format_cents(cents)
+            for account_id, cents in sorted(self._balances.items())
+            if account_id != DEFAULT_ACCOUNT_ID
+        }
+        # Write a new file and rename it over the old one, so a crash
+        # mid-save leaves the previous version intact
+        temporary_path = self.path + ".tmp"
+        with open(temporary_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        os.replace(temporary_path, self.path)
+        self._unsaved = 0
+
+    def items(self):
+        """Iterate (account_id, cents) pairs in account id order"""
+        return iter(sorted(self._balances.items()))
+
+    def copy_arrays(self):
+        """Return (ids, balances) arrays of every account, for snapshots"""
+        ids, balances = array("I"), array("q")
+        for account_id, cents in self.items():
+            ids.append(account_id)
+            balances.append(cents)
+        return ids, balances
+
+    def close(self):
+        """Save pending writes to the file"""
+        self.flush()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,432 @@
+#!/usr/bin/env python3
+"""
+Ledger Module - Per-account transaction history
+Every accepted credit and debit is appended to its account's history,
+kept as three parallel int64 columns so range queries and as-of lookups
+are binary searches instead of scans
+"""
+
+import os
+import struct
+from array import array
+from bisect import bisect_left, bisect_right
+from time import time_ns
+
+# History file header - magic and format version
+HISTORY_MAGIC = b"ACCTHST1"
+HISTORY_HEADER_SIZE = len(HISTORY_MAGIC)
+
+# History file record: timestamp ns, signed cents, balance after in cents
+HISTORY_RECORD = struct.Struct("<qqq")
+
+# Entries read from a history file at a time
+READ_CHUNK = 4096
+
+
+class AccountHistory:
+    """
+    Transaction history of one account, in timestamp order
+
+    Columns are parallel arrays: entry i is (timestamps[i], amounts[i],
+    balances[i]) - when it was applied (ns since the epoch), the signed
+    amount in cents (credits positive, debits negative) and the balance
+    after it in cents. Timestamps never decrease, which is what makes
+    every query a bisect.
+    """
+
+    __slots__ = ("timestamps", "amounts", "balances")
+
+    def __init__(self):
+        self.timestamps = array("q")
+        self.amounts = array("q")
+        self.balances = array("q")
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def append(self, timestamp, cents, balance):
+        """
+        Record one transaction
+
+        Args:
+            timestamp (int): When it was applied, ns since the epoch; clamped
+                to the previous entry's timestamp if the clock went back
+            cents (int): Signed amount in cents
+            balance (int): Balance after the transaction in cents
+
+        Returns:
+            int: Timestamp actually recorded
+        """
+        timestamps = self.timestamps
+        if timestamps and timestamp < timestamps[-1]:
+            timestamp = timestamps[-1]
+        timestamps.append(timestamp)
+        self.amounts.append(cents)
+        self.balances.append(balance)
+        return timestamp
+
+    def span(self, start=None, end=None):
+        """
+        Index range of the entries with start <= timestamp < end
+
+        Args:
+            start (int): First timestamp included (None = from the beginning)
+            end (int): First timestamp excluded (None = to the end)
+
+        Returns:
+            tuple: (first, stop) indexes, for entry() or entries()
+        """
+        first = 0 if start is None else bisect_left(self.timestamps, start)
+        stop = len(self.timestamps) if end is None else bisect_left(self.timestamps, end, first)
+        return first, max(first, stop)
+
+    def entry(self, index):
+        """Entry at an index, as (timestamp, cents, balance)"""
+        return self.timestamps[index], self.amounts[index], self.balances[index]
+
+    def rows(self, first, stop, chunk=READ_CHUNK):
+        """
+        Stream entries first..stop-1, building at most chunk tuples at a time
+
+        Yields:
+            list: (timestamp, cents, balance) tuples, one list per chunk
+        """
+        for low in range(first, min(stop, len(self.timestamps)), chunk):
+            high = min(low + chunk, stop)
+            yield list(zip(self.timestamps[low:high], self.amounts[low:high], self.balances[low:high]))
+
+    def entries(self, start=None, end=None):
+        """
+        Entries with start <= timestamp < end - O(log n + k)
+
+        Returns:
+            list: (timestamp, cents, balance) tuples in timestamp order
+        """
+        first, stop = self.span(start, end)
+        return list(zip(self.timestamps[first:stop], self.amounts[first:stop], self.balances[first:stop]))
+
+    def balance_as_of(self, timestamp):
+        """
+        Balance at a point in time - O(log n)
+
+        Transactions recorded at exactly timestamp are included.
+
+        Args:
+            timestamp (int): Point in time, ns since the epoch
+
+        Returns:
+            int: Balance in cents, or None if the history is empty
+        """
+        if not self.timestamps:
+            return None
+        index = bisect_right(self.timestamps, timestamp) - 1
+        if index < 0:
+            # Before the first transaction - the balance it started from
+            return self.balances[0] - self.amounts[0]
+        return self.balances[index]
+
+    def memory_usage(self):
+        """Bytes held by the three columns"""
+        return sum(column.itemsize * len(column) for column in (self.timestamps, self.amounts, self.balances))
+
+
+class HistoryFile:
+    """
+    Transaction history of one account in an append-only file
+
+    On-disk counterpart of AccountHistory with the same queries: records
+    are fixed-size and in timestamp order, so a range or as-of query is a
+    binary search over file offsets, and reads stream in chunks - memory
+    does not grow with the length of the history.
+    """
+
+    def __init__(self, path):
+        """
+        Open a history file (created on the first append)
+
+        Args:
+            path (str): History file
+        """
+        self.path = path
+        self._file = None
+        self._last_timestamp = None
+
+    def __len__(self):
+        self.flush()
+        try:
+            size = os.path.getsize(self.path)
+        except FileNotFoundError:
+            return 0
+        return max(0, size - HISTORY_HEADER_SIZE) // HISTORY_RECORD.size
+
+    def _read(self, f, index, count=1):
+        """Records index..index+count-1 from an open file"""
+        f.seek(HISTORY_HEADER_SIZE + index * HISTORY_RECORD.size)
+        data = f.read(count * HISTORY_RECORD.size)
+        return list(HISTORY_RECORD.iter_unpack(data[:len(data) - len(data) % HISTORY_RECORD.size]))
+
+    def _open_for_read(self):
+        self.flush()
+        f = open(self.path, "rb")
+        if f.read(HISTORY_HEADER_SIZE) != HISTORY_MAGIC:
+            f.close()
+            raise ValueError(f"Not a history file: {self.path}")
+        return f
+
+    def _bisect(self, f, timestamp, low, high, right=False):
+        """First index in low..high whose timestamp is >= (> if right) timestamp"""
+        while low < high:
+            middle = (low + high) // 2
+            value = self._read(f, middle)[0][0]
+            if value < timestamp or (right and value == timestamp):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def span(self, start=None, end=None):
+        """Index range of the entries with start <= timestamp < end - O(log n) reads"""
+        count = len(self)
+        if count == 0 or (start is None and end is None):
+            return 0, count
+        with self._open_for_read() as f:
+            first = 0 if start is None else self._bisect(f, start, 0, count)
+            stop = count if end is None else self._bisect(f, end, first, count)
+        return first, max(first, stop)
+
+    def entry(self, index):
+        """Entry at an index, as (timestamp, cents, balance)"""
+        if not 0 <= index < len(self):
+            raise IndexError("history index out of range")
+        with self._open_for_read() as f:
+            return self._read(f, index)[0]
+
+    def rows(self, first, stop, chunk=READ_CHUNK):
+        """
+        Stream entries first..stop-1, reading chunk records at a time
+
+        Yields:
+            list: (timestamp, cents, balance) tuples, one list per chunk
+        """
+        if first >= stop or not os.path.exists(self.path):
+            return
+        with self._open_for_read() as f:
+            for low in range(first, stop, chunk):
+                rows = self._read(f, low, min(chunk, stop - low))
+                if not rows:
+                    return
+                yield rows
+
+    def entries(self, start=None, end=None):
+        """Entries with start <= timestamp < end, as a list"""
+        return [row for rows in self.rows(*self.span(start, end)) for row in rows]
+
+    def balance_as_of(self, timestamp):
+        """Balance in cents at a point in time, or None if the history is empty"""
+        count = len(self)
+        if count == 0:
+            return None
+        with self._open_for_read() as f:
+            index = self._bisect(f, timestamp, 0, count, right=True) - 1
+            _, cents, balance = self._read(f, max(index, 0))[0]
+        return balance - cents if index < 0 else balance
+
+    def append(self, timestamp, cents, balance):
+        """Record one transaction - see AccountHistory.append"""
+        if self._file is None:
+            self._open_for_append()
+        if self._last_timestamp is not None and timestamp < self._last_timestamp:
+            timestamp = self._last_timestamp
+        self._last_timestamp = timestamp
+        self._pending += HISTORY_RECORD.pack(timestamp, cents, balance)
+        return timestamp
+
+    def _open_for_append(self):
+        """Open (or create) the file, dropping a torn last record"""
+        f = open(self.path, "ab+")
+        f.seek(0)
+        header = f.read(HISTORY_HEADER_SIZE)
+        if not header:
+            f.write(HISTORY_MAGIC)
+            f.flush()
+        elif header != HISTORY_MAGIC:
+            f.close()
+            raise ValueError(f"Not a history file: {self.path}")
+        size = f.seek(0, os.SEEK_END)
+        whole = size - (size - HISTORY_HEADER_SIZE) % HISTORY_RECORD.size
+        if whole != size:
+            f.truncate(whole)
+        if whole > HISTORY_HEADER_SIZE:
+            self._last_timestamp = self._read(f, (whole - HISTORY_HEADER_SIZE) // HISTORY_RECORD.size - 1)[0][0]
+        self._file = f
+        self._pending = bytearray()
+
+    def flush(self):
+        """Write appended records to the file"""
+        if self._file is not None and self._pending:
+            self._file.write(self._pending)
+            self._file.flush()
+            self._pending = bytearray()
+
+    def close(self):
+        """Flush and close the file"""
+        if self._file is not None:
+            self.flush()
+            self._file.close()
+            self._file = None
+
+
+class Ledger:
+    """Transaction histories of every account, recorded by Operations"""
+
+    def __init__(self, clock=time_ns):
+        """
+        Initialize an empty ledger
+
+        Args:
+            clock (callable): Returns the current time in ns (default: time.time_ns)
+        """
+        self.clock = clock
+        self._accounts = {}
+
+    def __len__(self):
+        """Total number of recorded transactions"""
+        return sum(len(history) for history in self._accounts.values())
+
+    def __contains__(self, account_id):
+        return account_id in self._accounts
+
+    def record(self, account_id, cents, balance, timestamp=None):
+        """
+        Append a transaction to an account's history
+
+        Args:
+            account_id (int): Account the transaction was applied to
+            cents (int): Signed amount in cents (debits negative)
+            balance (int): Balance after the transaction in cents
+            timestamp (int): When it was applied (default: now)
+
+        Returns:
+            int: Timestamp recorded
+        """
+        history = self._accounts.get(account_id)
+        if history is None:
+            history = self._accounts[account_id] = self._new_history(account_id)
+        return history.append(self.clock() if timestamp is None else timestamp, cents, balance)
+
+    def _new_history(self, account_id):
+        """History for an account's first transaction"""
+        return AccountHistory()
+
+    def history(self, account_id):
+        """An account's AccountHistory, or None if it has no transactions"""
+        return self._accounts.get(account_id)
+
+    def accounts(self):
+        """Ids of the accounts with at least one transaction"""
+        return list(self._accounts)
+
+    def entries(self, account_id, start=None, end=None):
+        """
+        An account's transactions with start <= timestamp < end
+
+        Returns:
+            list: (timestamp, cents, balance) tuples in timestamp order
+        """
+        history = self._accounts.get(account_id)
+        if history is None:
+            return []
+        return history.entries(start, end)
+
+    def balance_as_of(self, account_id, timestamp, default=None):
+        """
+        An account's balance at a point in time
+
+        Args:
+            account_id (int): Account id
+            timestamp (int): Point in time, ns since the epoch
+            default (int): Returned when the account has no history
+
+        Returns:
+            int: Balance in cents
+        """
+        history = self._accounts.get(account_id)
+        if history is None:
+            return default
+        return history.balance_as_of(timestamp)
+
+    def memory_usage(self):
+        """Bytes held by the history columns"""
+        return sum(history.memory_usage() for history in self._accounts.values())
+
+
+class FileLedger(Ledger):
+    """
+    Ledger keeping each account's history in DIRECTORY/<account id>.hist
+
+    Records are buffered per account and written on flush() or close().
+    """
+
+    def __init__(self, directory, clock=time_ns):
+        """
+        Open a ledger directory (created if needed)
+
+        Args:
+            directory (str): Directory holding the history files
+            clock (callable): Returns the current time in ns
+        """
+        super().__init__(clock)
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def _path(self, account_id):
+        return os.path.join(self.directory, f"{account_id}.hist")
+
+    def _new_history(self, account_id):
+        return HistoryFile(self._path(account_id))
+
+    def __len__(self):
+        return sum(len(HistoryFile(self._path(account_id))) for account_id in self.accounts())
+
+    def __contains__(self, account_id):
+        return account_id in self._accounts or os.path.exists(self._path(account_id))
+
+    def history(self, account_id):
+        """An account's HistoryFile, or None if it has no transactions"""
+        history = self._accounts.get(account_id)
+        if history is None and os.path.exists(self._path(account_id)):
+            history = self._accounts[account_id] = HistoryFile(self._path(account_id))
+        return history
+
+    def accounts(self):
+        """Ids of the accounts with a history file"""
+        return sorted(int(name[:-5]) for name in os.listdir(self.directory) if name.endswith(".hist"))
+
+    def entries(self, account_id, start=None, end=None):
+        history = self.history(account_id)
+        return [] if history is None else history.entries(start, end)
+
+    def balance_as_of(self, account_id, timestamp, default=None):
+        history = self.history(account_id)
+        return default if history is None else history.balance_as_of(timestamp)
+
+    def memory_usage(self):
+        """Bytes of records waiting to be written"""
+        return sum(len(history._pending) for history in self._accounts.values() if history._file is not None)
+
+    def flush(self):
+        """Write buffered records of every account"""
+        for history in self._accounts.values():
+            history.flush()
+
+    def close(self):
+        """Flush and close every history file"""
+        for history in self._accounts.values():
+            history.close()
+        self._accounts = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
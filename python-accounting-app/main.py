@@ -5,32 +5,75 @@ Converted from COBOL MainProgram (main.cob)
 """
 
 import sys
-from operations import Operations
+from operations import Operations, STATUS_REJECTED
+
+# One-shot subcommands - CALL 'Operations' USING the matching operation
+SUBCOMMANDS = {"balance": "TOTAL ", "credit": "CREDIT", "debit": "DEBIT "}
+SUBCOMMAND_USAGE = "usage: main.py {balance | credit AMOUNT | debit AMOUNT} [--account ID] [--data DIR]"
+
+# Directory of the per-account transaction histories, inside --data DIR
+HISTORY_DIRECTORY = "history"
+
+# Log bytes after the last snapshot before a one-shot run writes a new one
+COMPACT_LOG_BYTES = 1 << 20
 
 
 class MainProgram:
     """Main program class handling user interface and menu navigation"""
 
-    def __init__(self):
-        """Initialize the main program"""
+    def __init__(self, collect_stats=False, tracer=None, quiet=False, output=None, input_source=None, data_program=None):
+        """
+        Initialize the main program
+
+        Args:
+            collect_stats (bool): Collect operation statistics and offer the
+                View Statistics menu option
+            tracer (Tracer): Record sampled call-path traces of menu choices
+            quiet (bool): Scripted session - no menu and no prompts, only
+                the results
+            output (file): Stream for all output (None = sys.stdout)
+            input_source (callable): Called with the prompt to read each
+                input line, like input() (None = input())
+            data_program (DataProgram): Balance storage (None = in memory)
+        """
         self.user_choice = 0
         self.continue_flag = True
-        self.operations = Operations()
+        self.collect_stats = collect_stats
+        self.quiet = quiet
+        self.output = output
+        self.operations = Operations(data_program)
+        self.operations.output = output
+        self.operations.data_program.output = output
+        self.operations.prompts = not quiet
+        self.input_source = input_source
+        self.operations.input_source = input_source
+        if collect_stats:
+            self.operations.enable_stats()
+        self.last_choice = 5 if collect_stats else 4
+
+        # Tracing shadows process_choice on this instance only
+        self.tracer = tracer
+        if tracer is not None:
+            self.process_choice = self._traced_process_choice
 
     def display_menu(self):
         """Display the main menu to the user"""
-        print("--------------------------------")
-        print("Account Management System")
-        print("1. View Balance")
-        print("2. Credit Account")
-        print("3. Debit Account")
-        print("4. Exit")
-        print("--------------------------------")
+        if self.quiet:
+            return
+        print("--------------------------------", file=self.output)
+        print("Account Management System", file=self.output)
+        print("1. View Balance", file=self.output)
+        print("2. Credit Account", file=self.output)
+        print("3. Debit Account", file=self.output)
+        print("4. Exit", file=self.output)
+        if self.collect_stats:
+            print("5. View Statistics", file=self.output)
+        print("--------------------------------", file=self.output)
 
     def get_user_choice(self):
         """Get and validate user input for menu choice"""
         try:
-            choice = input("Enter your choice (1-4): ")
+            choice = (self.input_source or input)("" if self.quiet else f"Enter your choice (1-{self.last_choice}): ")
             return int(choice)
         except ValueError:
             return 0  # Invalid choice will be handled in main loop
@@ -53,9 +96,41 @@ class MainProgram:
             # Exit - equivalent to MOVE 'NO' TO CONTINUE-FLAG
             self.continue_flag = False
 
+        elif choice == 5 and self.collect_stats:
+            # View Statistics - not part of the COBOL menu
+            self.display_stats()
+
         else:
             # Invalid choice - equivalent to WHEN OTHER
-            print("Invalid choice, please select 1-4.")
+            print(f"Invalid choice, please select 1-{self.last_choice}.", file=self.output)
+
+    def _traced_process_choice(self, choice):
+        """process_choice, recorded as a trace when the tracer samples it"""
+        if not self.tracer.should_sample():
+            return MainProgram.process_choice(self, choice)
+
+        operations = self.operations
+        targets = [
+            (operations, "execute_operation", "Operations.execute_operation"),
+            (operations, "_handle_total_operation", "Operations._handle_total_operation"),
+            (operations, "_handle_credit_operation", "Operations._handle_credit_operation"),
+            (operations, "_handle_debit_operation", "Operations._handle_debit_operation"),
+            (operations, "_validate_amount", "Operations._validate_amount"),
+            (operations.data_program, "execute_operation", "DataProgram.execute_operation"),
+        ]
+        return self.tracer.trace(
+            "MainProgram.process_choice",
+            MainProgram.process_choice,
+            (self, choice),
+            targets,
+            {"choice": choice},
+        )
+
+    def display_stats(self):
+        """Display operation latency and outcome statistics"""
+        print("--------------------------------", file=self.output)
+        for line in self.operations.stats_report():
+            print(line, file=self.output)
 
     def run(self):
         """Main execution loop - equivalent to MAIN-LOGIC paragraph"""
@@ -66,19 +141,348 @@ class MainProgram:
             self.process_choice(user_choice)
 
         # Exit message - equivalent to DISPLAY "Exiting the program. Goodbye!"
-        print("Exiting the program. Goodbye!")
+        print("Exiting the program. Goodbye!", file=self.output)
+
+
+def parse_arguments(argv=None):
+    """Parse command line options"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Account Management System")
+    parser.add_argument("--ingest", metavar="FILE", help="Process a CSV or JSONL transaction file instead of the menu")
+    parser.add_argument("--format", choices=["csv", "jsonl"], help="Transaction file format (default: from extension)")
+    parser.add_argument("--rejects", metavar="FILE", help="File receiving rejected lines (default: FILE.rej)")
+    parser.add_argument("--stats", action="store_true", help="Collect operation statistics (menu option 5)")
+    parser.add_argument(
+        "--quiet",
+        action=argparse.BooleanOptionalAction,
+        help="No menu or prompts, block-buffered results (default: when stdin is not a terminal)",
+    )
+    parser.add_argument("--flush-lines", type=int, default=1000, help="With --quiet, flush output every N lines")
+    parser.add_argument("--trace", metavar="FILE", help="Append sampled call-path traces to FILE (JSONL)")
+    parser.add_argument("--trace-rate", type=float, default=0.01, help="Fraction of menu choices traced (default: 0.01)")
+    parser.add_argument("--serve", action="store_true", help="Serve TOTAL/CREDIT/DEBIT over TCP instead of the menu")
+    parser.add_argument("--host", default="127.0.0.1", help="Address for --serve (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=7070, help="Port for --serve (default: 7070)")
+    parser.add_argument(
+        "--store",
+        metavar="SPEC",
+        help="Balance store: memory, json:PATH, sqlite:PATH or mmap:PATH (default: $ACCOUNT_STORE or memory)",
+    )
+    parser.add_argument(
+        "--cache-mb", type=float, help="Cache the hottest accounts of a file-backed --store in this many MiB"
+    )
+    return parser.parse_args(argv)
+
+
+def run_ingest(args, data_program=None):
+    """Batch mode - stream a transaction file through Operations"""
+    from ingest import IngestProgram
+
+    ingest_program = IngestProgram(Operations(data_program), reject_path=args.rejects or args.ingest + ".rej")
+    summary = ingest_program.run(args.ingest, args.format)
+    ingest_program.report(summary)
+
+
+def run_server(args, data_program=None):
+    """Server mode - accept TOTAL/CREDIT/DEBIT requests from network clients"""
+    import server
+
+    server.run_server(args.host, args.port, Operations(data_program))
+
+
+def _parse_subcommand(argv):
+    """
+    Split one-shot arguments without argparse, which costs more to import
+    than the whole operation takes
+
+    Returns:
+        tuple: (operation, amount, account_id, data_directory)
+
+    Raises:
+        ValueError: If the arguments do not match SUBCOMMAND_USAGE
+    """
+    from account_store import DEFAULT_ACCOUNT_ID, check_account_id
+
+    options = {"--account": None, "--data": None}
+    positional = []
+    arguments = iter(argv[1:])
+    for argument in arguments:
+        name, equals, value = argument.partition("=")
+        if name in options:
+            options[name] = value if equals else next(arguments, None)
+            if options[name] is None:
+                raise ValueError(f"{name} needs a value")
+        else:
+            positional.append(argument)
+
+    operation = SUBCOMMANDS[argv[0]]
+    expected = 0 if operation == "TOTAL " else 1
+    if len(positional) != expected:
+        raise ValueError("balance takes no amount" if expected == 0 else f"{argv[0]} needs one AMOUNT")
+
+    account_id = DEFAULT_ACCOUNT_ID
+    if options["--account"] is not None:
+        account_id = check_account_id(int(options["--account"]))
+    return operation, positional[0] if positional else None, account_id, options["--data"]
+
+
+def _open_one_shot_data(directory):
+    """Persistent DataProgram for one-shot runs, with its snapshot path and offset"""
+    import os
+    from snapshot import open_data_program, read_snapshot_header
+    from wal import HEADER_SIZE
+
+    os.makedirs(directory, exist_ok=True)
+    snapshot_path = os.path.join(directory, "accounts.snap")
+    data_program = open_data_program(snapshot_path, os.path.join(directory, "accounts.wal"))
+    # Read after recovery, which may have restarted the log
+    snapshot_offset = HEADER_SIZE
+    if os.path.exists(snapshot_path):
+        snapshot_offset = read_snapshot_header(snapshot_path)[1]
+    return data_program, snapshot_path, snapshot_offset
+
+
+def run_subcommand(argv):
+    """
+    One-shot mode - apply a single operation without the menu and exit
+
+    Only the modules the operation needs are imported; persistence
+    (--data DIR) keeps balances in a snapshot plus write-ahead log.
+
+    Args:
+        argv (list): Subcommand and its arguments, e.g. ['credit', '100.00']
+
+    Returns:
+        int: Exit status - 0 done, 1 insufficient funds, 2 invalid arguments
+            (main() exits with 3 when the operation fails with an error,
+            e.g. an unreadable data directory)
+    """
+    from money import AmountError, format_cents, parse_amount
+
+    try:
+        operation, amount, account_id, directory = _parse_subcommand(argv)
+        if amount is not None:
+            parse_amount(amount)
+    except AmountError as e:
+        print(e.reason)
+        return 2
+    except ValueError as e:
+        print(f"{SUBCOMMAND_USAGE}\n{e}", file=sys.stderr)
+        return 2
+
+    data_program = None
+    if directory is not None:
+        data_program, snapshot_path, snapshot_offset = _open_one_shot_data(directory)
+    operations = Operations(data_program)
+    if directory is not None and operation != "TOTAL ":
+        import os
+        from ledger import FileLedger
 
+        # Keep the transaction history for statements
+        operations.enable_ledger(FileLedger(os.path.join(directory, HISTORY_DIRECTORY)))
 
-def main():
+    try:
+        operation, _, status, balance = operations.apply_transaction(operation, amount, account_id)
+        if data_program is not None and data_program.wal.tell() - snapshot_offset >= COMPACT_LOG_BYTES:
+            from snapshot import Checkpointer
+
+            Checkpointer(data_program, snapshot_path).checkpoint()
+    finally:
+        operations.data_program.close()
+        if operations.ledger is not None:
+            operations.ledger.close()
+
+    # Same messages as the menu operations
+    if operation == "TOTAL":
+        print(f"Current balance: {format_cents(balance)}")
+    elif status == STATUS_REJECTED:
+        print("Insufficient funds for this debit.")
+        return 1
+    elif operation == "CREDIT":
+        print(f"Amount credited. New balance: {format_cents(balance)}")
+    else:
+        print(f"Amount debited. New balance: {format_cents(balance)}")
+    return 0
+
+
+def run_statement(argv):
+    """
+    Statement subcommand - stream an account's transaction history
+
+    Reads the history kept by one-shot credits and debits in --data DIR.
+    With --limit, the token for the next page is printed to stderr.
+
+    Args:
+        argv (list): Arguments after 'statement'
+
+    Returns:
+        int: Exit status - 0 done, 2 invalid arguments or cursor
+    """
+    import argparse
+    import os
+    from account_store import DEFAULT_ACCOUNT_ID, check_account_id
+    from ledger import FileLedger
+    from statement import StatementCursor, parse_timestamp, write_statement
+
+    parser = argparse.ArgumentParser(prog="main.py statement", description="Write an account statement")
+    parser.add_argument("--data", metavar="DIR", required=True, help="Data directory of the one-shot subcommands")
+    parser.add_argument("--account", type=int, default=DEFAULT_ACCOUNT_ID, help="Account id (default: 0)")
+    parser.add_argument("--format", choices=["csv", "jsonl"], default="csv", help="Output format (default: csv)")
+    parser.add_argument("--from", dest="start", metavar="TIME", help="First time included (ISO 8601 or ns)")
+    parser.add_argument("--to", dest="end", metavar="TIME", help="First time excluded (ISO 8601 or ns)")
+    parser.add_argument("--limit", type=int, help="Entries per page (default: all)")
+    parser.add_argument("--cursor", metavar="TOKEN", help="Continue from a previous page")
+    parser.add_argument("--output", metavar="FILE", help="Write to FILE instead of stdout")
+    args = parser.parse_args(argv)
+
+    try:
+        account_id = check_account_id(args.account)
+        start = parse_timestamp(args.start) if args.start else None
+        end = parse_timestamp(args.end) if args.end else None
+        with FileLedger(os.path.join(args.data, HISTORY_DIRECTORY)) as ledger:
+            cursor = StatementCursor(ledger.history(account_id), account_id, start, end, args.cursor)
+            stream = open(args.output, "w", encoding="utf-8", newline="") if args.output else sys.stdout
+            try:
+                write_statement(cursor, stream, args.format, args.limit, header=args.cursor is None)
+            finally:
+                if args.output:
+                    stream.close()
+            token = cursor.token
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+
+    if args.limit is not None and token is not None:
+        print(f"Next page: --cursor {token}", file=sys.stderr)
+    return 0
+
+
+def run_accrue(argv):
+    """
+    Accrue subcommand - end-of-day interest and fees for every account in --data DIR
+
+    Balances are updated in one pass and saved as a new snapshot rather
+    than journaled account by account. Requires NumPy.
+
+    Args:
+        argv (list): Arguments after 'accrue'
+
+    Returns:
+        int: Exit status - 0 done, 2 invalid arguments
+    """
+    import argparse
+    import os
+    from money import AmountError
+
+    parser = argparse.ArgumentParser(prog="main.py accrue", description="Apply interest and fees to every account")
+    parser.add_argument("--data", metavar="DIR", required=True, help="Data directory of the one-shot subcommands")
+    parser.add_argument("--rate", default="0", help="Interest rate for this run, e.g. 0.0001 (default: 0)")
+    parser.add_argument("--fee", default="0", help="Maintenance fee per account (default: 0)")
+    parser.add_argument("--entries", metavar="FILE", help="Write the generated entries to FILE as CSV")
+    parser.add_argument("--history", action="store_true", help="Also add the entries to the statement history")
+    args = parser.parse_args(argv)
+
+    try:
+        from accrual import accrue, record_entries, write_entries
+    except ImportError as e:
+        print(f"accrue needs NumPy: {e}", file=sys.stderr)
+        return 2
+    from snapshot import Checkpointer
+
+    data_program, snapshot_path, _ = _open_one_shot_data(args.data)
+    try:
+        result = accrue(data_program, args.rate, args.fee, journal=False)
+        Checkpointer(data_program, snapshot_path).checkpoint()
+    except AmountError as e:
+        print(f"Invalid fee: {e.reason}", file=sys.stderr)
+        return 2
+    except ValueError as e:
+        print(e, file=sys.stderr)
+        return 2
+    finally:
+        data_program.close()
+
+    entries = result["entries"]
+    if args.entries:
+        with open(args.entries, "w", encoding="utf-8", newline="") as f:
+            write_entries(entries, f)
+    if args.history:
+        from ledger import FileLedger
+
+        with FileLedger(os.path.join(args.data, HISTORY_DIRECTORY)) as ledger:
+            record_entries(entries, ledger)
+
+    for name, value in result["summary"].items():
+        print(f"{name.replace('_', ' ').capitalize()}: {value}")
+    return 0
+
+
+def main(argv=None):
     """Entry point - equivalent to COBOL program execution"""
+    if argv is None:
+        argv = sys.argv[1:]
+    if argv and argv[0] == "statement":
+        sys.exit(run_statement(argv[1:]))
+    if argv and argv[0] == "accrue":
+        sys.exit(run_accrue(argv[1:]))
+    if argv and argv[0] in SUBCOMMANDS:
+        try:
+            status = run_subcommand(argv)
+        except Exception as e:
+            print(f"An error occurred: {e}")
+            status = 3
+        sys.exit(status)
+
+    args = parse_arguments(argv)
+    data_program = None
     try:
-        main_program = MainProgram()
-        main_program.run()
+        # Enhanced: balances kept in the configured store instead of memory only
+        from storage import open_data_program
+
+        cache_bytes = int(args.cache_mb * (1 << 20)) if args.cache_mb else None
+        data_program = open_data_program(args.store, cache_bytes)
+
+        if args.ingest:
+            run_ingest(args, data_program)
+            return
+
+        if args.serve:
+            run_server(args, data_program)
+            return
+
+        tracer = None
+        if args.trace:
+            from tracing import Tracer
+
+            tracer = Tracer(args.trace, args.trace_rate)
+
+        # Scripted session - results only, written in blocks
+        quiet = args.quiet if args.quiet is not None else not sys.stdin.isatty()
+        output = None
+        if quiet:
+            from console import BufferedOutput
+
+            output = BufferedOutput(flush_lines=args.flush_lines)
+        try:
+            main_program = MainProgram(
+                collect_stats=args.stats, tracer=tracer, quiet=quiet, output=output, data_program=data_program
+            )
+            main_program.run()
+        finally:
+            if output is not None:
+                output.close()
+            if tracer is not None:
+                tracer.close()
     except KeyboardInterrupt:
         print("\nProgram interrupted by user. Goodbye!")
     except Exception as e:
         print(f"An error occurred: {e}")
         sys.exit(1)
+    finally:
+        # Commit whatever a batching store still holds
+        if data_program is not None:
+            data_program.close()
 
 
 if __name__ == "__main__":
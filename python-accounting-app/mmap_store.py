@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+Mapped Account Store Module - Fixed-width balance records in a memory-mapped file
+File-backed counterpart of the COBOL STORAGE-BALANCE working-storage item
+"""
+
+import mmap
+import os
+import struct
+from array import array
+
+from account_store import check_account_id
+from money import INITIAL_BALANCE_CENTS
+
+# Header: magic, record size, record capacity, open accounts
+MAPPED_MAGIC = b"ACCTMAP1"
+HEADER = struct.Struct("<8sqqq")
+HEADER_SIZE = HEADER.size
+
+# Record: status word (0 = never written) and balance in cents. The balance
+# is the PIC 9(6)V99 value as a binary count of cents, i.e. with the implied
+# decimal point (V99) of the COBOL picture
+RECORD = struct.Struct("<qq")
+RECORD_SIZE = RECORD.size
+RECORD_OPEN = 1
+
+# Highest account id a mapped file holds. The slot is the id itself, so the
+# file grows with the id range, not the account count: this cap keeps it at
+# most 256 MiB of records, and items() / snapshots scan at most that many
+MAX_MAPPED_ACCOUNT_ID = (1 << 24) - 1
+
+# Header words, as indexes into the header memoryview
+_CAPACITY = 1
+_OPEN_COUNT = 2
+
+
+class MappedAccountStore:
+    """
+    Account balances in fixed-width records of a memory-mapped file
+
+    The record for an account sits at slot == account id, so reads and
+    writes are O(1) and go straight to the mapped pages through a
+    memoryview - nothing is parsed on open and the OS page cache does the
+    caching. Because of that, ids above MAX_MAPPED_ACCOUNT_ID are refused;
+    sparse or larger ids belong in the sqlite: store. Like AccountStore,
+    writers must be serialized by the caller.
+    """
+
+    def __init__(self, path, capacity=1024, flush_every=None, default_cents=INITIAL_BALANCE_CENTS):
+        """
+        Open (or create) a mapped account file
+
+        Args:
+            path (str): Account file
+            capacity (int): Initial number of records for a new file (at
+                most MAX_MAPPED_ACCOUNT_ID + 1)
+            flush_every (int): msync after this many writes (None = leave it
+                to the OS, or call flush() explicitly)
+            default_cents (int): Balance of an account that was never written
+        """
+        self.path = path
+        self.flush_every = flush_every
+        self.default_cents = default_cents
+        self._unflushed = 0
+        if not 0 < capacity <= MAX_MAPPED_ACCOUNT_ID + 1:
+            raise ValueError(f"Capacity out of range (1-{MAX_MAPPED_ACCOUNT_ID + 1}): {capacity}")
+
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o644)
+        size = os.fstat(self._fd).st_size
+        if size == 0:
+            os.ftruncate(self._fd, HEADER_SIZE + capacity * RECORD_SIZE)
+            os.pwrite(self._fd, HEADER.pack(MAPPED_MAGIC, RECORD_SIZE, capacity, 0), 0)
+        else:
+            magic, record_size, capacity, _ = HEADER.unpack(os.pread(self._fd, HEADER_SIZE, 0))
+            if magic != MAPPED_MAGIC or record_size != RECORD_SIZE:
+                os.close(self._fd)
+                raise ValueError(f"Not a mapped account file: {path}")
+            if size < HEADER_SIZE + capacity * RECORD_SIZE:
+                os.close(self._fd)
+                raise ValueError(f"Truncated mapped account file: {path}")
+        self._map()
+
+    def _map(self):
+        """Map the file and build the zero-copy views"""
+        self._mmap = mmap.mmap(self._fd, 0)
+        view = memoryview(self._mmap)
+        self._header = view[8:HEADER_SIZE].cast("q")
+        # Interleaved words: status at 2 * slot, balance at 2 * slot + 1
+        self._words = view[HEADER_SIZE:].cast("q")
+
+    @property
+    def capacity(self):
+        """Number of records in the file"""
+        return self._header[_CAPACITY]
+
+    def __len__(self):
+        return self._header[_OPEN_COUNT]
+
+    def __contains__(self, account_id):
+        words = self._words
+        index = account_id * 2
+        return 0 <= index < len(words) and words[index] == RECORD_OPEN
+
+    def get_cents(self, account_id):
+        """
+        Read an account balance straight from its mapped record
+
+        Args:
+            account_id (int): Account (slot) to read
+
+        Returns:
+            int: Balance in cents (default_cents if the account was never written)
+        """
+        words = self._words
+        index = account_id * 2
+        if 0 <= index < len(words) and words[index]:
+            return words[index + 1]
+        return self.default_cents
+
+    def set_cents(self, account_id, cents):
+        """
+        Write an account balance in place, opening the account if needed
+
+        Args:
+            account_id (int): Account (slot) to write
+            cents (int): New balance in cents
+
+        Raises:
+            ValueError: If the id is negative or above MAX_MAPPED_ACCOUNT_ID
+        """
+        index = account_id * 2
+        words = self._words
+        if not 0 <= index < len(words):
+            check_account_id(account_id)
+            if account_id > MAX_MAPPED_ACCOUNT_ID:
+                raise ValueError(
+                    f"Account id out of range for a mapped store (0-{MAX_MAPPED_ACCOUNT_ID}): {account_id}"
+                )
+            self._grow(account_id + 1)
+            words = self._words
+
+        words[index + 1] = cents
+        if not words[index]:
+            words[index] = RECORD_OPEN
+            self._header[_OPEN_COUNT] += 1
+
+        if self.flush_every:
+            self._unflushed += 1
+            if self._unflushed >= self.flush_every:
+                self.flush()
+
+    def _grow(self, minimum):
+        """Extend the file to at least minimum records and remap it"""
+        capacity = min(max(minimum, self.capacity * 2), MAX_MAPPED_ACCOUNT_ID + 1)
+        self.flush()
+        os.ftruncate(self._fd, HEADER_SIZE + capacity * RECORD_SIZE)
+        os.pwrite(self._fd, struct.pack("<q", capacity), 8 + _CAPACITY * 8)
+        # Old views stay valid for readers that still hold them; the old
+        # mapping is released once they are gone
+        self._map()
+
+    def flush(self):
+        """msync dirty pages to the file"""
+        self._mmap.flush()
+        self._unflushed = 0
+
+    def items(self):
+        """Iterate (account_id, cents) pairs of open accounts in id order"""
+        words = self._words
+        for index in range(0, len(words), 2):
+            if words[index]:
+                yield index // 2, words[index + 1]
+
+    def copy_arrays(self):
+        """Return (ids, balances) arrays of the open accounts, for snapshots"""
+        ids, balances = array("I"), array("q")
+        for account_id, cents in self.items():
+            ids.append(account_id)
+            balances.append(cents)
+        return ids, balances
+
+    def close(self):
+        """Flush and unmap the file"""
+        if self._fd is None:
+            return
+        self.flush()
+        self._header.release()
+        self._words.release()
+        self._mmap.close()
+        os.close(self._fd)
+        self._fd = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,160 @@
+#!/usr/bin/env python3
+"""
+Money Module - Fixed-point arithmetic for PIC 9(6)V99 amounts
+Amounts are plain int cents in the hot path; Decimal is only used at the edges
+"""
+
+from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+
+# PIC 9(6)V99 - two implied decimal places
+CENTS_PER_UNIT = 100
+CENT = Decimal("0.01")
+
+# Largest amount accepted for a single transaction (999999.99)
+MAX_AMOUNT = Decimal("999999.99")
+MAX_AMOUNT_CENTS = 99999999
+
+# STORAGE-BALANCE PIC 9(6)V99 VALUE 1000.00
+INITIAL_BALANCE_CENTS = 100000
+
+# Plain decimal literals handled without building a Decimal - compiled on
+# first use, so one-shot runs that only see canonical amounts never import re
+_AMOUNT_REGEX = r"\s*([+-]?)([0-9]*)(?:\.([0-9]*))?\s*\Z"
+_amount_pattern = None
+
+# Reasons reported by AmountError - match the _get_amount_input messages
+NEGATIVE = "Amount cannot be negative."
+OVER_LIMIT = "Amount exceeds maximum limit (999999.99)."
+MALFORMED = "Invalid amount format."
+
+
+class AmountError(ValueError):
+    """Raised when a value is not a valid transaction amount"""
+
+    def __init__(self, reason):
+        super().__init__(reason)
+        self.reason = reason
+
+
+def to_cents(value):
+    """
+    Convert a Decimal to int cents, rounding ROUND_HALF_UP like _format_currency
+
+    Args:
+        value (Decimal): Value to convert
+
+    Returns:
+        int: Value in cents
+    """
+    return int(value.quantize(CENT, rounding=ROUND_HALF_UP).scaleb(2))
+
+
+def to_decimal(cents):
+    """
+    Convert int cents to a Decimal with exactly 2 decimal places
+
+    Args:
+        cents (int): Value in cents
+
+    Returns:
+        Decimal: Same value as _format_currency would produce
+    """
+    return Decimal(cents).scaleb(-2)
+
+
+def format_cents(cents):
+    """Render int cents as a display string, e.g. 100000 -> '1000.00'"""
+    if cents < 0:
+        return "-" + format_cents(-cents)
+    units, fraction = divmod(cents, CENTS_PER_UNIT)
+    return f"{units}.{fraction:02d}"
+
+
+def _parse_decimal_amount(amount):
+    """Validate a Decimal amount - reference path used for unusual literals"""
+    try:
+        if amount < 0:
+            raise AmountError(NEGATIVE)
+        if amount > MAX_AMOUNT:
+            raise AmountError(OVER_LIMIT)
+        return to_cents(amount)
+    except InvalidOperation:
+        raise AmountError(MALFORMED)
+
+
+def parse_amount(value):
+    """
+    Parse and validate a transaction amount into int cents
+
+    Same rules as Operations._get_amount_input: the amount must be between 0
+    and 999999.99 before rounding, and is then rounded ROUND_HALF_UP to
+    2 decimal places.
+
+    Args:
+        value (str|Decimal|int|float): Amount to parse
+
+    Returns:
+        int: Amount in cents
+
+    Raises:
+        AmountError: If the amount is malformed, negative or over the limit
+    """
+    if type(value) is str and value[-3:-2] == ".":
+        # Canonical 'units.cc' literal - the common case in transaction files
+        digits = value[:-3] + value[-2:]
+        if digits.isdigit() and digits.isascii():
+            cents = int(digits)
+            if cents <= MAX_AMOUNT_CENTS:
+                return cents
+
+    if isinstance(value, str):
+        global _amount_pattern
+        if _amount_pattern is None:
+            import re
+
+            _amount_pattern = re.compile(_AMOUNT_REGEX)
+        match = _amount_pattern.match(value)
+        if match is None:
+            # Exponents, underscores, NaN/Infinity - let Decimal decide
+            try:
+                amount = Decimal(value)
+            except (ValueError, TypeError, InvalidOperation):
+                raise AmountError(MALFORMED)
+            return _parse_decimal_amount(amount)
+
+        sign, units, fraction = match.groups()
+        fraction = fraction or ""
+        if not units and not fraction:
+            raise AmountError(MALFORMED)
+
+        cents = int(units or "0") * CENTS_PER_UNIT + int((fraction + "00")[:2])
+        rest = fraction[2:]
+
+        if sign == "-" and (cents or rest.strip("0")):
+            raise AmountError(NEGATIVE)
+        if cents > MAX_AMOUNT_CENTS or (cents == MAX_AMOUNT_CENTS and rest.strip("0")):
+            raise AmountError(OVER_LIMIT)
+
+        # ROUND_HALF_UP - the first dropped digit decides
+        if rest and rest[0] >= "5":
+            cents += 1
+        return cents
+
+    if isinstance(value, bool):
+        raise AmountError(MALFORMED)
+
+    if isinstance(value, int):
+        if value < 0:
+            raise AmountError(NEGATIVE)
+        if value * CENTS_PER_UNIT > MAX_AMOUNT_CENTS:
+            raise AmountError(OVER_LIMIT)
+        return value * CENTS_PER_UNIT
+
+    if isinstance(value, Decimal):
+        return _parse_decimal_amount(value)
+
+    try:
+        amount = Decimal(str(value))
+    except (ValueError, TypeError, InvalidOperation):
+        raise AmountError(MALFORMED)
+    return _parse_decimal_amount(amount)
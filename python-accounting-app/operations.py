@@ -4,21 +4,301 @@ Operations Module - Business Logic for Account Management
 Converted from COBOL Operations (operations.cob)
 """
 
+from operator import itemgetter
+from time import perf_counter_ns
 from decimal import Decimal, ROUND_HALF_UP, InvalidOperation
+from account_store import DEFAULT_ACCOUNT_ID
 from data import DataProgram
+from money import MAX_AMOUNT, AmountError, parse_amount, to_decimal
+
+# Transaction outcomes reported by the batch API
+STATUS_ACCEPTED = "ACCEPTED"
+STATUS_REJECTED = "REJECTED"  # Insufficient funds for this debit
+STATUS_INVALID = "INVALID"  # Unknown operation or invalid amount
+
+# Operation names accepted by the batch API, with and without COBOL padding
+_BATCH_OPERATIONS = {
+    name: name.strip()
+    for name in ("TOTAL", "TOTAL ", "CREDIT", "DEBIT", "DEBIT ", "total", "credit", "debit")
+}
+
+
+class _NoLock:
+    """Stand-in for a stripe lock when the instance is not thread-safe"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NO_LOCK = _NoLock()
 
 
 class Operations:
     """Operations class handling all account business logic"""
 
-    def __init__(self):
-        """Initialize the operations module"""
+    def __init__(self, data_program=None, lock_stripes=None):
+        """
+        Initialize the operations module
+
+        Args:
+            data_program (DataProgram): Data layer to use (default: a new one)
+            lock_stripes (int): Enable thread-safe mode with this many account
+                lock stripes (None = single-threaded, no locking)
+        """
         self.operation_type = ""
         self.amount = Decimal("0.00")
         self.final_balance = Decimal(
             "1000.00"
         )  # Initial balance equivalent to PIC 9(6)V99 VALUE 1000.00
-        self.data_program = DataProgram()
+        self.data_program = data_program if data_program is not None else DataProgram()
+
+        # Thread-safe mode - accounts hash onto a fixed set of locks, so
+        # unrelated accounts rarely wait for each other
+        self._locks = None
+        # Idempotency keys hash onto their own stripes, always taken before
+        # the account's, so one key sent for two accounts is claimed once
+        self._key_locks = None
+        if lock_stripes:
+            import threading
+
+            self._locks = [threading.Lock() for _ in range(lock_stripes)]
+            self._key_locks = [threading.Lock() for _ in range(lock_stripes)]
+
+        # Console - output stream for print (None = sys.stdout), source of
+        # input lines (callable taking the prompt, None = input()) and
+        # whether prompts are shown (off for scripted sessions)
+        self.output = None
+        self.input_source = None
+        self.prompts = True
+
+        # Transaction history - None until enable_ledger()
+        self.ledger = None
+
+        # Outcomes of recent keyed requests - None until enable_idempotency()
+        self.idempotency = None
+
+        # Buffered credits of hot accounts - None until enable_hot_accounts()
+        self.escrow = None
+
+        # Statistics - None until enable_stats(); _timing is set while a
+        # sampled operation is timed
+        self._stats = None
+        self._countdown = 0
+        self._input_ns = 0
+        self._timing = False
+
+    def enable_ledger(self, ledger=None):
+        """
+        Start recording accepted credits and debits in a transaction ledger
+
+        Args:
+            ledger (Ledger): Ledger to record into (default: a new one)
+
+        Returns:
+            Ledger: The ledger being recorded into
+        """
+        if ledger is None:
+            from ledger import Ledger
+
+            ledger = Ledger()
+        self.ledger = ledger
+        return ledger
+
+    def enable_idempotency(self, cache=None):
+        """
+        Start remembering the outcome of credits and debits sent with an
+        idempotency key, so a retried request is not applied twice
+
+        Args:
+            cache (IdempotencyCache): Cache to remember outcomes in
+                (default: a new one with the default size and expiry)
+
+        Returns:
+            IdempotencyCache: The cache in use
+        """
+        if cache is None:
+            from idempotency import IdempotencyCache
+
+            cache = IdempotencyCache()
+        self.idempotency = cache
+        return cache
+
+    def enable_hot_accounts(self, account_ids, max_pending=None):
+        """
+        Collect credits to high-contention accounts without the account lock
+
+        Credits to these accounts go into per-worker buffers instead of a
+        read-modify-write of the balance; each amount is still validated
+        (0 to 999999.99) as it arrives. The buffered credits are merged
+        into the stored balance, in order, under the account lock whenever
+        the account is read or debited, or a worker's buffer fills up - so
+        every TOTAL and every funds check sees all credits that completed
+        before it, and balances stay exact. Until merged, a buffered credit
+        is not durable and its result carries no balance (None).
+
+        apply_transaction and _call_data_program check self.escrow
+        explicitly; nothing is shadowed, so this combines with stats and
+        tracing.
+
+        Args:
+            account_ids (iterable): Hot accounts, e.g. merchants with heavy credit fan-in
+            max_pending (int): Credits a worker buffers per account before
+                merging them itself, at least 1 (default:
+                escrow.DEFAULT_MAX_PENDING)
+
+        Returns:
+            CreditEscrow: The credit buffers
+
+        Raises:
+            ValueError: If max_pending is below 1
+        """
+        from escrow import DEFAULT_MAX_PENDING, CreditEscrow
+
+        if max_pending is None:
+            max_pending = DEFAULT_MAX_PENDING
+        self.escrow = CreditEscrow(account_ids, max_pending)
+        return self.escrow
+
+    def _merge_escrow(self, account_id):
+        """
+        Fold an account's buffered credits into its stored balance - the
+        caller holds the account lock
+
+        Returns:
+            int: The merged balance in cents
+        """
+        data_program = self.data_program
+        balance = data_program.read_cents(account_id)
+        credits = self.escrow.drain(account_id)
+        if credits:
+            ledger = self.ledger
+            if ledger is None:
+                balance += sum(cents for _, cents in credits)
+            else:
+                # In the order they were accepted, each with its own time
+                credits.sort(key=itemgetter(0))
+                for timestamp, cents in credits:
+                    # ADD AMOUNT TO FINAL-BALANCE, one buffered credit at a time
+                    balance += cents
+                    ledger.record(account_id, cents, balance, timestamp or None)
+            data_program.write_cents(balance, account_id)
+        return balance
+
+    def merge_hot_accounts(self):
+        """Merge the buffered credits of every hot account, e.g. before shutdown"""
+        if self.escrow is None:
+            return
+        for account_id in self.escrow.accounts:
+            with self._account_lock(account_id):
+                self._merge_escrow(account_id)
+
+    def _apply_hot_transaction(self, operation, amount, account_id, idempotency_key):
+        """apply_transaction for a hot account (see enable_hot_accounts)"""
+        escrow = self.escrow
+        if operation == "CREDIT" and idempotency_key is None:
+            try:
+                cents = parse_amount(amount)
+            except AmountError:
+                cents = None
+            if cents is not None:
+                # Commutative - no lock, no read, no write; the ledger gets
+                # the time it was accepted, not the time it is merged
+                ledger = self.ledger
+                if escrow.add(account_id, cents, ledger.clock() if ledger is not None else 0):
+                    with self._account_lock(account_id):
+                        self._merge_escrow(account_id)
+                return operation, cents, STATUS_ACCEPTED, None
+
+        # Everything else runs under the same lock as the merge before it,
+        # so no credit can slip in between
+        with self._key_lock(idempotency_key), self._account_lock(account_id):
+            balance = self._merge_escrow(account_id)
+            if operation == "TOTAL":
+                return operation, amount, STATUS_ACCEPTED, balance
+            if operation != "CREDIT" and operation != "DEBIT":
+                return operation, amount, STATUS_INVALID, balance
+            try:
+                cents = parse_amount(amount)
+            except AmountError:
+                return operation, amount, STATUS_INVALID, balance
+            if idempotency_key is None:
+                return self._apply_cents(operation, cents, account_id)
+            return self._apply_keyed(operation, cents, account_id, idempotency_key)
+
+    def enable_stats(self, sample_every=32):
+        """
+        Start collecting outcome counters and latency histograms
+
+        A counting variant of execute_operation shadows the method on this
+        instance only, so an instance without stats runs exactly the
+        uninstrumented code; sampled operations time their DataProgram
+        calls and user input through the _timing flag. The batch entry
+        points are not instrumented.
+
+        Args:
+            sample_every (int): Time one operation in this many (1 = all)
+
+        Returns:
+            OperationStats: The statistics being collected
+        """
+        if self._stats is None:
+            from stats import OperationStats
+
+            self._stats = OperationStats(sample_every)
+            self._countdown = 1
+            self.execute_operation = self._counted_execute_operation
+        return self._stats
+
+    def disable_stats(self):
+        """Stop collecting statistics and drop the instrumented variant"""
+        self.__dict__.pop("execute_operation", None)
+        self._stats = None
+
+    def stats(self):
+        """
+        Dump the collected statistics
+
+        Returns:
+            dict: Sampled per-operation latency summaries (ns), accepted/
+                rejected/invalid counters and sampled DataProgram time, or
+                None if disabled
+        """
+        if self._stats is None:
+            return None
+        return self._stats.snapshot()
+
+    def stats_report(self):
+        """Human-readable statistics, as a list of lines (empty if disabled)"""
+        if self._stats is None:
+            return []
+        return self._stats.report()
+
+    def _counted_execute_operation(self, passed_operation, account_id=None):
+        """execute_operation, counting outcomes and timing one in sample_every"""
+        self._countdown -= 1
+        if self._countdown:
+            status = Operations.execute_operation(self, passed_operation, account_id)
+        else:
+            self._countdown = self._stats.sample_every
+            status = self._timed_execute_operation(passed_operation, account_id)
+        self._stats.outcomes[status] += 1
+        return status
+
+    def _timed_execute_operation(self, passed_operation, account_id):
+        """execute_operation, timing it (minus user input) and its DataProgram calls"""
+        self._input_ns = 0
+        self._timing = True
+        try:
+            start = perf_counter_ns()
+            status = Operations.execute_operation(self, passed_operation, account_id)
+            elapsed = perf_counter_ns() - start - self._input_ns
+        finally:
+            self._timing = False
+        self._stats.record(self.operation_type, elapsed)
+        return status
 
     def _format_currency(self, value):
         """Format decimal value to 2 decimal places like COBOL PIC 9(6)V99"""
@@ -26,105 +306,438 @@ class Operations:
 
     def _get_amount_input(self, prompt_message):
         """Get and validate amount input from user"""
+        start = perf_counter_ns() if self._timing else 0
         while True:
-            try:
-                amount_str = input(prompt_message)
-                amount = Decimal(amount_str)
+            amount_str = (self.input_source or input)(prompt_message if self.prompts else "")
+            amount = self._validate_amount(amount_str)
+            if amount is not None:
+                if self._timing:
+                    # Time the user took is not part of the operation latency
+                    self._input_ns += perf_counter_ns() - start
+                return amount
 
-                # Validate amount is non-negative and within COBOL limits (999999.99)
-                if amount < 0:
-                    print("Amount cannot be negative. Please try again.")
-                    continue
-                elif amount > Decimal("999999.99"):
-                    print("Amount exceeds maximum limit (999999.99). Please try again.")
-                    continue
+    def _validate_amount(self, amount_str):
+        """
+        Validate one amount entry, explaining the problem if it is rejected
 
-                return self._format_currency(amount)
+        Args:
+            amount_str (str): Text entered by the user
 
-            except (ValueError, TypeError, InvalidOperation):
-                print("Invalid amount format. Please enter a valid number.")
-                continue
+        Returns:
+            Decimal: Amount rounded to 2 decimal places, or None if invalid
+        """
+        try:
+            amount = Decimal(amount_str)
+
+            # Validate amount is non-negative and within COBOL limits (999999.99)
+            if amount < 0:
+                print("Amount cannot be negative. Please try again.", file=self.output)
+                return None
+            elif amount > MAX_AMOUNT:
+                print("Amount exceeds maximum limit (999999.99). Please try again.", file=self.output)
+                return None
+
+            return self._format_currency(amount)
+
+        except (ValueError, TypeError, InvalidOperation):
+            print("Invalid amount format. Please enter a valid number.", file=self.output)
+            return None
+
+    def _account_lock(self, account_id):
+        """Stripe lock guarding an account's read-compare-write sequence"""
+        if self._locks is None:
+            return _NO_LOCK
+        if account_id is None:
+            account_id = DEFAULT_ACCOUNT_ID
+        return self._locks[hash(account_id) % len(self._locks)]
+
+    def _key_lock(self, idempotency_key):
+        """Stripe lock claiming an idempotency key - taken before any account lock"""
+        if self._key_locks is None or idempotency_key is None:
+            return _NO_LOCK
+        return self._key_locks[hash(idempotency_key) % len(self._key_locks)]
+
+    def _call_data_program(self, operation, balance, account_id):
+        """
+        CALL 'DataProgram' USING operation, balance (and the account, if any)
+
+        The one hook point of the console operations: buffered credits of
+        a hot account are merged before it is read, and a sampled operation
+        adds the call to the DataProgram time. Callers hold the account lock.
+        """
+        start = perf_counter_ns() if self._timing else 0
+        escrow = self.escrow
+        if escrow is not None and operation == "read":
+            merge_id = DEFAULT_ACCOUNT_ID if account_id is None else account_id
+            if merge_id in escrow.accounts:
+                self._merge_escrow(merge_id)
 
-    def _handle_total_operation(self):
+        if account_id is None:
+            result = self.data_program.execute_operation(operation, balance)
+        else:
+            result = self.data_program.execute_operation(operation, balance, account_id)
+
+        if self._timing:
+            stats = self._stats
+            stats.data_ns += perf_counter_ns() - start
+            stats.data_calls += 1
+        return result
+
+    def _record(self, account_id, amount, balance):
+        """Add an applied transaction to the ledger - both values already have 2 decimal places"""
+        if account_id is None:
+            account_id = DEFAULT_ACCOUNT_ID
+        self.ledger.record(account_id, int(amount.scaleb(2)), int(balance.scaleb(2)))
+
+    def _handle_total_operation(self, account_id=None):
         """Handle balance inquiry - equivalent to IF OPERATION-TYPE = 'TOTAL '"""
-        # CALL 'DataProgram' USING 'read', FINAL-BALANCE
-        self.final_balance = self.data_program.execute_operation(
-            "read", self.final_balance
-        )
+        with self._account_lock(account_id):
+            # CALL 'DataProgram' USING 'read', FINAL-BALANCE
+            balance = self._call_data_program("read", self.final_balance, account_id)
+        self.final_balance = balance
 
         # DISPLAY "Current balance: " FINAL-BALANCE
-        print(f"Current balance: {self.final_balance}")
+        print(f"Current balance: {balance}", file=self.output)
+        return STATUS_ACCEPTED
 
-    def _handle_credit_operation(self):
+    def _handle_credit_operation(self, account_id=None):
         """Handle credit transaction - equivalent to ELSE IF OPERATION-TYPE = 'CREDIT'"""
         # DISPLAY "Enter credit amount: "
         # ACCEPT AMOUNT
-        self.amount = self._get_amount_input("Enter credit amount: ")
+        amount = self._get_amount_input("Enter credit amount: ")
+        self.amount = amount
 
-        # CALL 'DataProgram' USING 'read', FINAL-BALANCE
-        self.final_balance = self.data_program.execute_operation(
-            "read", self.final_balance
-        )
+        # Read, add and write back as one step for this account
+        with self._account_lock(account_id):
+            # CALL 'DataProgram' USING 'read', FINAL-BALANCE
+            balance = self._call_data_program("read", self.final_balance, account_id)
 
-        # ADD AMOUNT TO FINAL-BALANCE
-        self.final_balance = self._format_currency(self.final_balance + self.amount)
+            # ADD AMOUNT TO FINAL-BALANCE
+            balance = self._format_currency(balance + amount)
 
-        # CALL 'DataProgram' USING 'WRITE', FINAL-BALANCE
-        self.data_program.execute_operation("write", self.final_balance)
+            # CALL 'DataProgram' USING 'WRITE', FINAL-BALANCE
+            self._call_data_program("write", balance, account_id)
+            if self.ledger is not None:
+                self._record(account_id, amount, balance)
+        self.final_balance = balance
 
         # DISPLAY "Amount credited. New balance: " FINAL-BALANCE
-        print(f"Amount credited. New balance: {self.final_balance}")
+        print(f"Amount credited. New balance: {balance}", file=self.output)
+        return STATUS_ACCEPTED
 
-    def _handle_debit_operation(self):
+    def _handle_debit_operation(self, account_id=None):
         """Handle debit transaction - equivalent to ELSE IF OPERATION-TYPE = 'DEBIT '"""
         # DISPLAY "Enter debit amount: "
         # ACCEPT AMOUNT
-        self.amount = self._get_amount_input("Enter debit amount: ")
+        amount = self._get_amount_input("Enter debit amount: ")
+        self.amount = amount
 
-        # CALL 'DataProgram' USING 'read', FINAL-BALANCE
-        self.final_balance = self.data_program.execute_operation(
-            "read", self.final_balance
-        )
+        # The funds check and the write must see the same balance
+        with self._account_lock(account_id):
+            # CALL 'DataProgram' USING 'read', FINAL-BALANCE
+            balance = self._call_data_program("read", self.final_balance, account_id)
 
-        # IF FINAL-BALANCE >= AMOUNT
-        if self.final_balance >= self.amount:
-            # SUBTRACT AMOUNT FROM FINAL-BALANCE
-            self.final_balance = self._format_currency(self.final_balance - self.amount)
+            # IF FINAL-BALANCE >= AMOUNT
+            sufficient = balance >= amount
+            if sufficient:
+                # SUBTRACT AMOUNT FROM FINAL-BALANCE
+                balance = self._format_currency(balance - amount)
 
-            # CALL 'DataProgram' USING 'WRITE', FINAL-BALANCE
-            self.data_program.execute_operation("write", self.final_balance)
+                # CALL 'DataProgram' USING 'WRITE', FINAL-BALANCE
+                self._call_data_program("write", balance, account_id)
+                if self.ledger is not None:
+                    self._record(account_id, -amount, balance)
+        self.final_balance = balance
 
+        if sufficient:
             # DISPLAY "Amount debited. New balance: " FINAL-BALANCE
-            print(f"Amount debited. New balance: {self.final_balance}")
-        else:
-            # ELSE - DISPLAY "Insufficient funds for this debit."
-            print("Insufficient funds for this debit.")
+            print(f"Amount debited. New balance: {balance}", file=self.output)
+            return STATUS_ACCEPTED
 
-    def execute_operation(self, passed_operation):
+        # ELSE - DISPLAY "Insufficient funds for this debit."
+        print("Insufficient funds for this debit.", file=self.output)
+        return STATUS_REJECTED
+
+    def execute_operation(self, passed_operation, account_id=None):
         """
         Main operation executor - equivalent to PROCEDURE DIVISION USING PASSED-OPERATION
 
         Args:
             passed_operation (str): Operation type ('TOTAL ', 'CREDIT', 'DEBIT ')
+            account_id (int): Account to operate on (default: the single
+                STORAGE-BALANCE account)
+
+        Returns:
+            str: STATUS_ACCEPTED, STATUS_REJECTED (insufficient funds) or
+                STATUS_INVALID (unknown operation or error)
         """
         # MOVE PASSED-OPERATION TO OPERATION-TYPE
-        self.operation_type = passed_operation.strip().upper()
+        operation_type = passed_operation.strip().upper()
+        self.operation_type = operation_type
 
         try:
             # Handle each operation type - equivalent to IF/ELSE IF structure
-            if self.operation_type == "TOTAL":
-                self._handle_total_operation()
+            if operation_type == "TOTAL":
+                return self._handle_total_operation(account_id)
 
-            elif self.operation_type == "CREDIT":
-                self._handle_credit_operation()
+            elif operation_type == "CREDIT":
+                return self._handle_credit_operation(account_id)
 
-            elif self.operation_type == "DEBIT":
-                self._handle_debit_operation()
+            elif operation_type == "DEBIT":
+                return self._handle_debit_operation(account_id)
 
             else:
-                print(f"Unknown operation: {self.operation_type}")
+                print(f"Unknown operation: {operation_type}", file=self.output)
 
         except Exception as e:
-            print(f"Error processing {self.operation_type} operation: {e}")
+            print(f"Error processing {operation_type} operation: {e}", file=self.output)
+
+        # GOBACK - return to calling program
+        return STATUS_INVALID
+
+    def apply_transaction(self, passed_operation, amount=None, account_id=None, idempotency_key=None):
+        """
+        Apply one transaction without console interaction
+
+        The balance check and update run under the account's stripe lock
+        when the instance is thread-safe, so concurrent callers can never
+        overdraw an account or lose an update.
+
+        A credit or debit sent again with the same idempotency key, while
+        the key is remembered, returns the first outcome without touching
+        DataProgram. A key reused for a different request is INVALID.
+
+        Args:
+            passed_operation (str): 'TOTAL ', 'CREDIT' or 'DEBIT '
+            amount (str|Decimal|int|float): Amount (ignored for TOTAL)
+            account_id (int): Account to operate on (default: STORAGE-BALANCE)
+            idempotency_key (str): Client key identifying this request
+                across retries (ignored for TOTAL; enables the default
+                cache on first use)
+
+        Returns:
+            tuple: (operation, amount_cents, status, balance_cents), like
+                the items yielded by iter_batch
+        """
+        try:
+            operation = _BATCH_OPERATIONS.get(passed_operation)
+            if operation is None:
+                operation = passed_operation.strip().upper()
+        except (AttributeError, TypeError):
+            # Not a string (e.g. a number from a JSON file) - unknown, INVALID
+            operation = repr(passed_operation)
+        if account_id is None:
+            account_id = DEFAULT_ACCOUNT_ID
+        escrow = self.escrow
+        if escrow is not None and account_id in escrow.accounts:
+            return self._apply_hot_transaction(operation, amount, account_id, idempotency_key)
+        return self._apply_transaction(operation, amount, account_id, idempotency_key)
+
+    def _apply_transaction(self, operation, amount, account_id, idempotency_key):
+        """apply_transaction once the operation name and account are resolved"""
+        data_program = self.data_program
+
+        if operation == "TOTAL":
+            return operation, amount, STATUS_ACCEPTED, data_program.read_cents(account_id)
+
+        if operation != "CREDIT" and operation != "DEBIT":
+            return operation, amount, STATUS_INVALID, data_program.read_cents(account_id)
+
+        try:
+            cents = parse_amount(amount)
+        except AmountError:
+            return operation, amount, STATUS_INVALID, data_program.read_cents(account_id)
+
+        if idempotency_key is None:
+            with self._account_lock(account_id):
+                return self._apply_cents(operation, cents, account_id)
+        with self._key_lock(idempotency_key), self._account_lock(account_id):
+            return self._apply_keyed(operation, cents, account_id, idempotency_key)
+
+    def _apply_keyed(self, operation, cents, account_id, idempotency_key):
+        """
+        Credit or debit sent with an idempotency key - the caller holds the
+        key lock, then the account lock
+
+        The key's stripe, not the account's, makes the lookup and store one
+        step, so two concurrent requests with the same key cannot both be
+        applied, even when they name different accounts.
+        """
+        cache = self.idempotency
+        if cache is None:
+            cache = self.enable_idempotency()
+        request = (operation, cents, account_id)
+        seen = cache.get(idempotency_key)
+        if seen is not None:
+            if seen[0] == request:
+                return seen[1]
+            # Key already used for a different request
+            return operation, cents, STATUS_INVALID, self.data_program.read_cents(account_id)
+        result = self._apply_cents(operation, cents, account_id)
+        cache.put(idempotency_key, request, result)
+        return result
+
+    def _apply_cents(self, operation, cents, account_id):
+        """Credit or debit a validated amount - the caller holds the account lock"""
+        data_program = self.data_program
+        balance = data_program.read_cents(account_id)
+        if operation == "CREDIT":
+            balance += cents
+        elif balance >= cents:
+            balance -= cents
+        else:
+            return operation, cents, STATUS_REJECTED, balance
+        data_program.write_cents(balance, account_id)
+        if self.ledger is not None:
+            self.ledger.record(account_id, cents if operation == "CREDIT" else -cents, balance)
+        return operation, cents, STATUS_ACCEPTED, balance
+
+    def iter_batch(self, transactions):
+        """
+        Apply transactions one by one without console interaction
+
+        The balance is read from DataProgram once, updated locally in int
+        cents for every transaction and written back once when the iteration
+        ends, so no Decimal is created per transaction. In thread-safe mode
+        the account's stripe lock is held until the iteration ends.
+
+        Args:
+            transactions (iterable): (operation, amount) pairs, where operation
+                is 'TOTAL ', 'CREDIT' or 'DEBIT ' (amount is ignored for TOTAL);
+                anything else, including a non-string, is INVALID
+
+        Yields:
+            tuple: (operation, amount_cents, status, balance_cents) for each
+                transaction; amount is passed through unchanged when invalid
+        """
+        operation_names = _BATCH_OPERATIONS
+        ledger = self.ledger
+        with self._account_lock(DEFAULT_ACCOUNT_ID):
+            if self.escrow is not None and DEFAULT_ACCOUNT_ID in self.escrow.accounts:
+                self._merge_escrow(DEFAULT_ACCOUNT_ID)
+            # CALL 'DataProgram' USING 'read', FINAL-BALANCE
+            balance = self.data_program.read_cents()
+            updated = False
+
+            try:
+                for passed_operation, amount in transactions:
+                    try:
+                        operation = operation_names.get(passed_operation)
+                        if operation is None:
+                            operation = passed_operation.strip().upper()
+                    except (AttributeError, TypeError):
+                        # Not a string - unknown operation, INVALID below
+                        operation = repr(passed_operation)
+
+                    if operation == "TOTAL":
+                        yield operation, amount, STATUS_ACCEPTED, balance
+                        continue
+
+                    if operation != "CREDIT" and operation != "DEBIT":
+                        yield operation, amount, STATUS_INVALID, balance
+                        continue
+
+                    try:
+                        cents = parse_amount(amount)
+                    except AmountError:
+                        yield operation, amount, STATUS_INVALID, balance
+                        continue
+
+                    if operation == "CREDIT":
+                        # ADD AMOUNT TO FINAL-BALANCE
+                        balance += cents
+                        updated = True
+                        if ledger is not None:
+                            ledger.record(DEFAULT_ACCOUNT_ID, cents, balance)
+                        yield operation, cents, STATUS_ACCEPTED, balance
+
+                    elif balance >= cents:
+                        # SUBTRACT AMOUNT FROM FINAL-BALANCE
+                        balance -= cents
+                        updated = True
+                        if ledger is not None:
+                            ledger.record(DEFAULT_ACCOUNT_ID, -cents, balance)
+                        yield operation, cents, STATUS_ACCEPTED, balance
+
+                    else:
+                        # Insufficient funds for this debit
+                        yield operation, cents, STATUS_REJECTED, balance
+
+            finally:
+                self.final_balance = to_decimal(balance)
+                if updated:
+                    # CALL 'DataProgram' USING 'WRITE', FINAL-BALANCE
+                    self.data_program.write_cents(balance)
+
+    def apply_batch(self, transactions):
+        """
+        Apply a batch of (operation, amount) pairs in one call
+
+        Same rules as the interactive operations: amounts must be between 0
+        and 999999.99, are rounded ROUND_HALF_UP to 2 decimals, and debits
+        larger than the balance are rejected with "Insufficient funds".
+
+        Args:
+            transactions (iterable): (operation, amount) pairs
+
+        Returns:
+            dict: 'results' - list of (operation, amount_cents, status, balance_cents)
+                  'summary' - counts per status, Decimal totals and final balance
+        """
+        results = list(self.iter_batch(transactions))
+
+        counts = {STATUS_ACCEPTED: 0, STATUS_REJECTED: 0, STATUS_INVALID: 0}
+        credited = debited = 0
+        for operation, amount, status, _ in results:
+            counts[status] += 1
+            if status == STATUS_ACCEPTED:
+                if operation == "CREDIT":
+                    credited += amount
+                elif operation == "DEBIT":
+                    debited += amount
+
+        summary = {
+            "count": len(results),
+            "accepted": counts[STATUS_ACCEPTED],
+            "rejected": counts[STATUS_REJECTED],
+            "invalid": counts[STATUS_INVALID],
+            "total_credited": to_decimal(credited),
+            "total_debited": to_decimal(debited),
+            "final_balance": self.final_balance,
+        }
+        return {"results": results, "summary": summary}
+
+    def apply_arrays(self, account_ids, cents):
+        """
+        Apply an end-of-day batch given as NumPy arrays (requires NumPy)
+
+        Same results as calling apply_transaction for every transaction in
+        order, computed by vectorized.apply_arrays. In thread-safe mode
+        every stripe lock is held for the whole batch.
+
+        Args:
+            account_ids (array-like): Account id per transaction
+            cents (array-like): Signed amount in cents (debits negative)
+
+        Returns:
+            dict: See vectorized.apply_arrays
+        """
+        from contextlib import ExitStack
+        from vectorized import ACCEPTED, apply_arrays
+
+        with ExitStack() as stack:
+            for lock in self._locks or ():
+                stack.enter_context(lock)
+            if self.escrow is not None:
+                for account_id in self.escrow.accounts:
+                    self._merge_escrow(account_id)
+            result = apply_arrays(self.data_program, account_ids, cents)
 
-        # GOBACK - return to calling program (implicit in Python)
+            if self.ledger is not None:
+                accepted = (result["status"] == ACCEPTED).tolist()
+                for account_id, amount, balance, ok in zip(
+                    list(account_ids), list(cents), result["balances"].tolist(), accepted
+                ):
+                    if ok:
+                        self.ledger.record(int(account_id), int(amount), balance)
+        return result
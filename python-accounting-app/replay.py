@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Replay Module - Headless replay of recorded menu sessions
+Drives MainProgram from a list of input lines instead of the keyboard,
+captures everything it prints, and checks sessions against a model of
+the menu state machine for fuzzing
+"""
+
+import io
+import multiprocessing
+import random
+
+from main import MainProgram
+from money import (
+    INITIAL_BALANCE_CENTS,
+    MALFORMED,
+    NEGATIVE,
+    OVER_LIMIT,
+    AmountError,
+    format_cents,
+    parse_amount,
+)
+
+# Sessions handed to a pool worker at a time
+CHUNK_SIZE = 256
+
+# _validate_amount messages for each AmountError reason
+_AMOUNT_MESSAGES = {
+    NEGATIVE: "Amount cannot be negative. Please try again.",
+    OVER_LIMIT: "Amount exceeds maximum limit (999999.99). Please try again.",
+    MALFORMED: "Invalid amount format. Please enter a valid number.",
+}
+
+# Fuzzer alphabet - menu entries, including ones the menu must reject
+_CHOICES = ["1", "2", "3", "4", "0", "5", "9", "-1", "", " 2 ", "x", "1.0", "02", "4 "]
+
+# Amount entries - valid, on the limits, and malformed
+_AMOUNTS = [
+    "0", "0.00", "0.001", "0.005", "0.01", "1", "10.00", "99.99", "500.5", "1000.00",
+    "1000.005", "999999.99", "999999.994", "999999.995", "1000000", "-0", "-0.00",
+    "-0.01", "-5", "+7.25", " 42.10 ", "1e3", "1E-2", ".5", "5.", "abc", "", "1,000.00",
+    "nan", "inf", "--1", "1.2.3", "٣٠",
+]
+
+
+class ScriptedInput:
+    """
+    input() replacement answering from a recorded list of lines
+
+    Prompts are written to the output stream the way input() writes them
+    to stdout, so a replayed transcript matches the stdout of the same
+    session piped into main.py. Running out of lines raises EOFError,
+    like input() at the end of a piped script.
+    """
+
+    def __init__(self, lines, output=None):
+        """
+        Initialize the input source
+
+        Args:
+            lines (list): Input lines, without line endings
+            output (file): Stream receiving the prompts (None = not shown)
+        """
+        self._lines = iter(lines)
+        self.output = output
+        self.consumed = 0
+
+    def __call__(self, prompt=""):
+        if prompt and self.output is not None:
+            self.output.write(prompt)
+        for line in self._lines:
+            self.consumed += 1
+            return line
+        raise EOFError
+
+
+def replay_session(lines, quiet=True):
+    """
+    Run one menu session from recorded input lines
+
+    Args:
+        lines (list): Menu choices and amounts, in the order entered
+        quiet (bool): Replay without menu and prompts (as main.py --quiet)
+
+    Returns:
+        dict: output (transcript), balance_cents (final balance),
+            exited (True if the session chose Exit, False if it ran out
+            of input) and consumed (input lines read)
+    """
+    output = io.StringIO()
+    source = ScriptedInput(lines, output)
+    main_program = MainProgram(quiet=quiet, output=output, input_source=source)
+    try:
+        main_program.run()
+        exited = True
+    except EOFError:
+        exited = False
+    return {
+        "output": output.getvalue(),
+        "balance_cents": main_program.operations.data_program.read_cents(),
+        "exited": exited,
+        "consumed": source.consumed,
+    }
+
+
+def _replay_chunk(arguments):
+    """Pool worker - replay a chunk of sessions in order"""
+    sessions, quiet = arguments
+    return [replay_session(lines, quiet) for lines in sessions]
+
+
+def replay_sessions(sessions, quiet=True, processes=None, chunk_size=CHUNK_SIZE):
+    """
+    Replay many independent sessions, in parallel across processes
+
+    Every session starts from a fresh MainProgram, so sessions can run in
+    any process; results come back in the order of sessions.
+
+    Args:
+        sessions (list): Input line lists, one per session
+        quiet (bool): Replay without menu and prompts
+        processes (int): Worker processes (default: one per CPU; 1 = run
+            in this process)
+        chunk_size (int): Sessions sent to a worker at a time
+
+    Returns:
+        list: replay_session() result for each session
+    """
+    sessions = list(sessions)
+    if processes is None:
+        processes = multiprocessing.cpu_count()
+    chunks = [(sessions[start:start + chunk_size], quiet) for start in range(0, len(sessions), chunk_size)]
+    if processes <= 1 or len(chunks) <= 1:
+        return [result for chunk in chunks for result in _replay_chunk(chunk)]
+
+    with multiprocessing.Pool(min(processes, len(chunks))) as pool:
+        return [result for chunk in pool.imap(_replay_chunk, chunks) for result in chunk]
+
+
+def model_session(lines):
+    """
+    Expected result of a session, from a model of the menu state machine
+
+    Independent of Operations: amounts are validated by money.parse_amount
+    and balances kept in int cents. Output is the quiet-mode transcript.
+
+    Args:
+        lines (list): Menu choices and amounts, in the order entered
+
+    Returns:
+        dict: Same keys as replay_session()
+    """
+    output = []
+    balance = INITIAL_BALANCE_CENTS
+    remaining = iter(lines)
+    consumed = 0
+    exited = False
+
+    for choice in remaining:
+        consumed += 1
+        try:
+            choice = int(choice)
+        except ValueError:
+            choice = 0
+
+        if choice == 1:
+            output.append(f"Current balance: {format_cents(balance)}")
+        elif choice in (2, 3):
+            operation = "CREDIT" if choice == 2 else "DEBIT"
+            amount = None
+            for entry in remaining:
+                consumed += 1
+                try:
+                    amount = parse_amount(entry)
+                    break
+                except AmountError as e:
+                    output.append(_AMOUNT_MESSAGES[e.reason])
+            if amount is None:
+                # EOFError raised by the amount prompt is reported by execute_operation
+                output.append(f"Error processing {operation} operation: ")
+            elif choice == 2:
+                balance += amount
+                output.append(f"Amount credited. New balance: {format_cents(balance)}")
+            elif balance >= amount:
+                balance -= amount
+                output.append(f"Amount debited. New balance: {format_cents(balance)}")
+            else:
+                output.append("Insufficient funds for this debit.")
+        elif choice == 4:
+            output.append("Exiting the program. Goodbye!")
+            exited = True
+            break
+        else:
+            output.append("Invalid choice, please select 1-4.")
+
+    return {
+        "output": "".join(line + "\n" for line in output),
+        "balance_cents": balance,
+        "exited": exited,
+        "consumed": consumed,
+    }
+
+
+def random_session(rng, length):
+    """
+    Random session for fuzzing the menu
+
+    Mostly well-formed choices and amounts, mixed with invalid choices,
+    rejected amounts and sessions that end without choosing Exit.
+
+    Args:
+        rng (random.Random): Source of randomness
+        length (int): Approximate number of input lines
+
+    Returns:
+        list: Input lines
+    """
+    lines = []
+    while len(lines) < length:
+        if rng.random() < 0.8:
+            choice = rng.choice("1233")
+        else:
+            choice = rng.choice(_CHOICES)
+        lines.append(choice)
+        if choice.strip() in ("2", "3", "02"):
+            while rng.random() < 0.3:
+                lines.append(rng.choice(_AMOUNTS))
+            if rng.random() < 0.5:
+                lines.append(rng.choice(_AMOUNTS))
+            else:
+                lines.append(f"{rng.randrange(0, 200000) / 100:.2f}")
+    if rng.random() < 0.9:
+        lines.append("4")
+    return lines
+
+
+def fuzz(sessions, length=40, seed=0, processes=None):
+    """
+    Replay random sessions and compare each one with model_session()
+
+    Args:
+        sessions (int): Number of sessions to generate
+        length (int): Approximate input lines per session
+        seed (int): Seed of the session generator
+        processes (int): Worker processes for replay_sessions()
+
+    Returns:
+        list: (lines, replayed, expected) for every mismatching session
+    """
+    rng = random.Random(seed)
+    generated = [random_session(rng, rng.randrange(1, length * 2)) for _ in range(sessions)]
+    results = replay_sessions(generated, quiet=True, processes=processes)
+    return [
+        (lines, replayed, expected)
+        for lines, replayed in zip(generated, results)
+        for expected in (model_session(lines),)
+        if replayed != expected
+    ]
@@ -27,9 +27,25 @@ def main():
     parser.add_argument("--verbose", "-v", action="store_true", help="Verbose output")
     parser.add_argument("--parallel", "-n", type=int, help="Run tests in parallel")
     parser.add_argument("--testplan", action="store_true", help="Run tests matching TESTPLAN_EN.md test cases")
+    parser.add_argument("--bench", action="store_true", help="Run the benchmark suite against the saved baseline")
+    parser.add_argument("--save-baseline", action="store_true", help="With --bench, record the results as the new baseline")
     
     args = parser.parse_args()
     
+    # Benchmarks replace the test run
+    if args.bench:
+        cmd = ["python", "benchmarks/suite.py"]
+        if args.save_baseline:
+            cmd.append("--save-baseline")
+        else:
+            # A gate without a baseline must not pass
+            cmd.append("--require-baseline")
+        if not run_command(cmd):
+            print("\n❌ Benchmark regressions detected, or no baseline saved!")
+            sys.exit(1)
+        print("\n✅ No benchmark regressions!")
+        return
+    
     # Base pytest command
     cmd = ["python", "-m", "pytest"]
     
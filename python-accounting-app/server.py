@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Server Module - asyncio TCP front end for TOTAL/CREDIT/DEBIT
+Network counterpart of the MainProgram menu loop, for many concurrent clients
+"""
+
+import asyncio
+
+from account_store import DEFAULT_ACCOUNT_ID, check_account_id
+from money import format_cents
+from operations import Operations
+
+DEFAULT_HOST = "127.0.0.1"
+DEFAULT_PORT = 7070
+
+# Longest request line accepted before the connection is dropped
+MAX_LINE = 1024
+
+# Unsent response bytes per connection before the server stops reading
+# that client's requests (and where it starts reading again)
+WRITE_HIGH_WATER = 64 * 1024
+WRITE_LOW_WATER = 16 * 1024
+
+# Request commands and the number of arguments they take before the
+# optional account id
+_COMMANDS = {
+    b"TOTAL": ("TOTAL", 0),
+    b"CREDIT": ("CREDIT", 1),
+    b"DEBIT": ("DEBIT", 1),
+}
+
+
+def handle_request(operations, line):
+    """
+    Apply one request line and build its response line
+
+    Requests are 'TOTAL [ACCOUNT]', 'CREDIT AMOUNT [ACCOUNT]' or
+    'DEBIT AMOUNT [ACCOUNT]'; the account defaults to the single
+    STORAGE-BALANCE account. A credit or debit may end with 'KEY=TOKEN',
+    an idempotency key: a retry with the same key gets the first response
+    again instead of being applied twice. Responses are 'STATUS BALANCE',
+    with STATUS one of ACCEPTED, REJECTED (insufficient funds) or INVALID
+    (bad amount, or a key reused for another request), 'ACCEPTED PENDING'
+    for a credit buffered for a hot account (see
+    Operations.enable_hot_accounts), or 'ERROR MESSAGE' for a malformed
+    request.
+
+    Args:
+        operations (Operations): Business logic the request is applied to
+        line (bytes): Request line without the newline
+
+    Returns:
+        bytes: Response line including the newline
+    """
+    parts = line.split()
+    if not parts:
+        return b"ERROR Empty request\n"
+
+    command = _COMMANDS.get(parts[0].upper())
+    if command is None:
+        return b"ERROR Unknown operation\n"
+    operation, argument_count = command
+
+    key = None
+    if argument_count and parts[-1][:4].upper() == b"KEY=":
+        key = parts.pop()[4:].decode("ascii", "replace")
+        if not key:
+            return b"ERROR Empty idempotency key\n"
+
+    if not argument_count < len(parts) <= argument_count + 2:
+        return b"ERROR Wrong number of arguments\n"
+
+    account_id = DEFAULT_ACCOUNT_ID
+    if len(parts) == argument_count + 2:
+        try:
+            account_id = check_account_id(int(parts[-1]))
+        except ValueError:
+            return b"ERROR Invalid account\n"
+
+    amount = parts[1].decode("ascii", "replace") if argument_count else None
+    _, _, status, balance = operations.apply_transaction(operation, amount, account_id, key)
+    if balance is None:
+        # Credit buffered for a hot account - the balance is known once merged
+        return f"{status} PENDING\n".encode("ascii")
+    return f"{status} {format_cents(balance)}\n".encode("ascii")
+
+
+class LedgerProtocol(asyncio.Protocol):
+    """
+    One client connection
+
+    Requests are pipelined: every complete line in a received chunk is
+    applied in order and all their responses go out in a single write, so
+    a client can keep many requests in flight on one connection. A client
+    that sends faster than it reads its responses is paused once
+    WRITE_HIGH_WATER bytes of them are waiting - the protocol counterpart
+    of awaiting writer.drain() - so its memory use stays bounded.
+    """
+
+    def __init__(self, operations):
+        self.operations = operations
+        self.transport = None
+        self._buffer = b""
+
+    def connection_made(self, transport):
+        self.transport = transport
+        transport.set_write_buffer_limits(WRITE_HIGH_WATER, WRITE_LOW_WATER)
+
+    def pause_writing(self):
+        # Responses are piling up - read no more requests until they drain
+        self.transport.pause_reading()
+
+    def resume_writing(self):
+        if self.transport is not None and not self.transport.is_closing():
+            self.transport.resume_reading()
+
+    def data_received(self, data):
+        if self._buffer:
+            data = self._buffer + data
+        lines = data.split(b"\n")
+        self._buffer = lines.pop()
+
+        if lines:
+            operations = self.operations
+            self.transport.write(b"".join([handle_request(operations, line) for line in lines]))
+
+        if len(self._buffer) > MAX_LINE:
+            self.transport.write(b"ERROR Request too long\n")
+            self.transport.close()
+
+    def connection_lost(self, exc):
+        self.transport = None
+
+
+async def start_server(operations=None, host=DEFAULT_HOST, port=DEFAULT_PORT):
+    """
+    Start listening for clients
+
+    All connections share one Operations instance; requests run on the
+    event loop thread one at a time, so no locking is needed.
+
+    Args:
+        operations (Operations): Business logic to serve (default: a new one)
+        host (str): Address to bind
+        port (int): Port to bind (0 = any free port)
+
+    Returns:
+        asyncio.Server: The listening server
+    """
+    if operations is None:
+        operations = Operations()
+    loop = asyncio.get_running_loop()
+    return await loop.create_server(lambda: LedgerProtocol(operations), host, port)
+
+
+def run_server(host=DEFAULT_HOST, port=DEFAULT_PORT, operations=None):
+    """Serve clients until interrupted"""
+
+    async def serve():
+        server = await start_server(operations, host, port)
+        address = server.sockets[0].getsockname()
+        print(f"Listening on {address[0]}:{address[1]}")
+        async with server:
+            await server.serve_forever()
+
+    asyncio.run(serve())
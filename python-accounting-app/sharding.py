@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+Sharding Module - Accounts hash-partitioned across worker processes
+Each shard process runs its own Operations/DataProgram pair, so shards
+apply transactions in parallel instead of sharing one GIL
+"""
+
+import multiprocessing
+import os
+
+from account_store import DEFAULT_ACCOUNT_ID, MAX_ACCOUNT_ID
+from data import DataProgram
+from operations import STATUS_INVALID, Operations
+
+# Messages from the router to a shard process
+_APPLY = "apply"
+_READ = "read"
+_CHECKPOINT = "checkpoint"
+_STOP = "stop"
+
+
+def shard_for(account_id, shards):
+    """
+    Shard owning an account
+
+    Ids are scrambled with a multiplicative hash first, so runs of
+    consecutive account ids still spread evenly over the shards.
+
+    Args:
+        account_id (int): Account id
+        shards (int): Number of shards
+
+    Returns:
+        int: Shard index in range(shards)
+    """
+    return ((account_id * 2654435761) & 0xFFFFFFFF) % shards
+
+
+def _open_shard(index, directory, wal_options):
+    """Build the DataProgram owned by one shard"""
+    if directory is None:
+        return DataProgram()
+    from snapshot import open_data_program
+
+    return open_data_program(
+        os.path.join(directory, f"shard-{index}.snap"),
+        os.path.join(directory, f"shard-{index}.wal"),
+        **wal_options,
+    )
+
+
+def _apply_all(apply_transaction, batch):
+    """
+    Apply a shard's batch, one result per transaction
+
+    A transaction that raises is INVALID (with no balance) instead of
+    taking the shard process, and every later batch, down with it.
+    """
+    results = []
+    for operation, amount, account_id in batch:
+        try:
+            results.append(apply_transaction(operation, amount, account_id))
+        except Exception:
+            results.append((operation, amount, STATUS_INVALID, None))
+    return results
+
+
+def _run_shard(connection, index, directory, wal_options):
+    """
+    Shard process main loop
+
+    Batches are applied strictly in the order they arrive, and in list
+    order within a batch, which keeps every account's transactions in the
+    order the router received them.
+    """
+    data_program = _open_shard(index, directory, wal_options)
+    apply_transaction = Operations(data_program).apply_transaction
+    try:
+        while True:
+            message, payload = connection.recv()
+            if message == _APPLY:
+                connection.send(_apply_all(apply_transaction, payload))
+            elif message == _READ:
+                connection.send(data_program.read_cents(payload))
+            elif message == _CHECKPOINT:
+                connection.send(data_program.checkpoint_state()[:2])
+            elif message == _STOP:
+                break
+    finally:
+        data_program.close()
+        connection.close()
+
+
+class ShardedLedger:
+    """
+    Router in front of N shard processes
+
+    apply_batch splits a batch by shard, sends every shard its part before
+    waiting for any of them, and puts the results back in request order.
+    An account always maps to the same shard, so its transactions are
+    applied in submission order.
+    """
+
+    def __init__(self, shards=None, directory=None, **wal_options):
+        """
+        Start the shard processes
+
+        Args:
+            shards (int): Number of shard processes (default: CPU count)
+            directory (str): Keep each shard's snapshot and write-ahead log
+                here (None = in-memory shards)
+            **wal_options: sync_every / sync_interval_ms for the shard logs
+        """
+        self.shards = shards or os.cpu_count() or 1
+        self._connections = []
+        self._processes = []
+        for index in range(self.shards):
+            router_end, shard_end = multiprocessing.Pipe()
+            process = multiprocessing.Process(
+                target=_run_shard,
+                args=(shard_end, index, directory, wal_options),
+                name=f"shard-{index}",
+                daemon=True,
+            )
+            process.start()
+            shard_end.close()
+            self._connections.append(router_end)
+            self._processes.append(process)
+
+    def apply_batch(self, transactions):
+        """
+        Apply (operation, amount, account_id) transactions across the shards
+
+        Args:
+            transactions (iterable): (operation, amount, account_id) tuples
+
+        Returns:
+            list: (operation, amount_cents, status, balance_cents) per
+                transaction, in the order given; a transaction with an
+                invalid account id is INVALID with no balance (None) and
+                never reaches a shard
+        """
+        shards = self.shards
+        batches = [[] for _ in range(shards)]
+        positions = [[] for _ in range(shards)]
+        rejected = []
+        count = 0
+        for transaction in transactions:
+            account_id = transaction[2]
+            # check_account_id() and shard_for(), inlined for the routing loop
+            if type(account_id) is not int or not 0 <= account_id <= MAX_ACCOUNT_ID:
+                rejected.append((count, (transaction[0], transaction[1], STATUS_INVALID, None)))
+            else:
+                index = ((account_id * 2654435761) & 0xFFFFFFFF) % shards
+                batches[index].append(transaction)
+                positions[index].append(count)
+            count += 1
+
+        busy = []
+        for index, batch in enumerate(batches):
+            if batch:
+                self._connections[index].send((_APPLY, batch))
+                busy.append(index)
+
+        results = [None] * count
+        for position, result in rejected:
+            results[position] = result
+        for index in busy:
+            for position, result in zip(positions[index], self._connections[index].recv()):
+                results[position] = result
+        return results
+
+    def read_cents(self, account_id=DEFAULT_ACCOUNT_ID):
+        """Read an account balance in cents from its shard"""
+        connection = self._connections[shard_for(account_id, self.shards)]
+        connection.send((_READ, account_id))
+        return connection.recv()
+
+    def items(self):
+        """Iterate (account_id, cents) pairs of every written account, in id order"""
+        pairs = []
+        for connection in self._connections:
+            connection.send((_CHECKPOINT, None))
+        for connection in self._connections:
+            ids, balances = connection.recv()
+            pairs.extend(zip(ids, balances))
+        pairs.sort()
+        return iter(pairs)
+
+    def close(self):
+        """Stop the shard processes"""
+        for connection, process in zip(self._connections, self._processes):
+            try:
+                connection.send((_STOP, None))
+            except (BrokenPipeError, OSError):
+                pass
+            process.join()
+            connection.close()
+        self._connections = []
+        self._processes = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+SQLite Account Store Module - Balances in an SQLite database
+Table-backed counterpart of the COBOL STORAGE-BALANCE working-storage item
+"""
+
+import sqlite3
+from _thread import allocate_lock
+from array import array
+
+from account_store import check_account_id
+from money import INITIAL_BALANCE_CENTS
+
+# Writes collected before they are committed as one transaction
+DEFAULT_BATCH_SIZE = 256
+
+# Fixed statement texts - sqlite3 keeps each one prepared in the
+# connection's statement cache, so they are compiled once per connection
+_CREATE = "CREATE TABLE IF NOT EXISTS accounts (id INTEGER PRIMARY KEY, cents INTEGER NOT NULL)"
+_SELECT = "SELECT cents FROM accounts WHERE id = ?"
+_UPSERT = "INSERT INTO accounts (id, cents) VALUES (?, ?) ON CONFLICT (id) DO UPDATE SET cents = excluded.cents"
+_COUNT = "SELECT COUNT(*) FROM accounts"
+_ITEMS = "SELECT id, cents FROM accounts ORDER BY id"
+
+
+class SqliteAccountStore:
+    """
+    Account balances in an SQLite table of (id, cents) integer rows
+
+    The database runs in WAL journal mode. Writes are collected and
+    committed together, batch_size at a time, so a burst of
+    _handle_write_operation calls costs one transaction instead of one
+    each; reads see collected writes immediately. Uncommitted writes are
+    lost on a crash - call flush() at the points that must be durable.
+    Like AccountStore, writers must be serialized by the caller.
+    """
+
+    def __init__(self, path, batch_size=DEFAULT_BATCH_SIZE, default_cents=INITIAL_BALANCE_CENTS):
+        """
+        Open (or create) an account database
+
+        Args:
+            path (str): Database file (':memory:' for a private in-memory database)
+            batch_size (int): Writes per transaction (1 = commit every write)
+            default_cents (int): Balance of an account that was never written
+        """
+        self.path = path
+        self.batch_size = max(1, batch_size)
+        self.default_cents = default_cents
+        self._pending = {}
+        # One connection shared by reader threads - sqlite3 objects are not
+        # safe for concurrent use
+        self._lock = allocate_lock()
+
+        self._connection = sqlite3.connect(path, isolation_level=None, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.execute(_CREATE)
+
+    def __len__(self):
+        self.flush()
+        with self._lock:
+            return self._connection.execute(_COUNT).fetchone()[0]
+
+    def __contains__(self, account_id):
+        if account_id in self._pending:
+            return True
+        with self._lock:
+            return self._connection.execute(_SELECT, (account_id,)).fetchone() is not None
+
+    def get_cents(self, account_id):
+        """
+        Read an account balance
+
+        Args:
+            account_id (int): Account to read
+
+        Returns:
+            int: Balance in cents (default_cents if the account was never written)
+        """
+        pending = self._pending
+        if account_id in pending:
+            return pending[account_id]
+        with self._lock:
+            row = self._connection.execute(_SELECT, (account_id,)).fetchone()
+        return row[0] if row is not None else self.default_cents
+
+    def set_cents(self, account_id, cents):
+        """
+        Write an account balance, committed with the rest of its batch
+
+        Args:
+            account_id (int): Account to write
+            cents (int): New balance in cents
+        """
+        pending = self._pending
+        if account_id not in pending:
+            check_account_id(account_id)
+        pending[account_id] = cents
+        if len(pending) >= self.batch_size:
+            self.flush()
+
+    def set_many(self, account_ids, balances):
+        """Write many account balances in one transaction"""
+        for account_id in account_ids:
+            check_account_id(account_id)
+        self._pending.update(zip(account_ids, balances))
+        self.flush()
+
+    def flush(self):
+        """Commit the collected writes as one transaction"""
+        if not self._pending:
+            return
+        with self._lock:
+            pending = self._pending
+            connection = self._connection
+            connection.execute("BEGIN")
+            try:
+                connection.executemany(_UPSERT, pending.items())
+            except BaseException:
+                connection.execute("ROLLBACK")
+                raise
+            connection.execute("COMMIT")
+            # Drop the batch only once it is visible to SELECT
+            self._pending = {}
+
+    def items(self):
+        """Iterate (account_id, cents) pairs in account id order"""
+        self.flush()
+        with self._lock:
+            rows = self._connection.execute(_ITEMS).fetchall()
+        return iter(rows)
+
+    def copy_arrays(self):
+        """Return (ids, balances) arrays of every account, for snapshots"""
+        ids, balances = array("I"), array("q")
+        for account_id, cents in self.items():
+            ids.append(account_id)
+            balances.append(cents)
+        return ids, balances
+
+    def close(self):
+        """Commit pending writes and close the database"""
+        if self._connection is None:
+            return
+        self.flush()
+        self._connection.close()
+        self._connection = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
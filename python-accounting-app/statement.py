@@ -0,0 +1,221 @@
+#!/usr/bin/env python3
+"""
+Statement Module - Streaming account statements with pagination cursors
+Reads an account's ledger history in chunks and writes it as CSV or JSONL,
+so statements of any length are produced in constant memory
+"""
+
+import base64
+import struct
+from datetime import datetime, timezone
+
+from money import format_cents
+
+# Cursor token payload: account id, next entry index, end bound (-1 = none),
+# timestamp of the entry before the next one (checks the history still matches)
+_TOKEN = struct.Struct("<Iqqq")
+_NO_END = -1
+
+# Statement columns - the amount is signed, debits are negative
+CSV_HEADER = "timestamp,amount,balance\n"
+
+
+def encode_token(account_id, index, end, check):
+    """Build an opaque, URL-safe pagination token"""
+    payload = _TOKEN.pack(account_id, index, _NO_END if end is None else end, check)
+    return base64.urlsafe_b64encode(payload).rstrip(b"=").decode("ascii")
+
+
+def decode_token(token):
+    """
+    Unpack a pagination token
+
+    Returns:
+        tuple: (account_id, index, end, check)
+
+    Raises:
+        ValueError: If the token is not one built by encode_token
+    """
+    try:
+        payload = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        account_id, index, end, check = _TOKEN.unpack(payload)
+    except (ValueError, struct.error):
+        raise ValueError("Invalid statement cursor")
+    if index < 0:
+        raise ValueError("Invalid statement cursor")
+    return account_id, index, None if end == _NO_END else end, check
+
+
+class StatementCursor:
+    """
+    Position in an account's statement
+
+    Iterating streams the remaining entries chunk by chunk; token is where
+    to resume later, in this process or another one. A history only ever
+    grows at the end, so a token stays valid: resuming returns exactly the
+    entries after the last one delivered, including any recorded since.
+    """
+
+    def __init__(self, history, account_id, start=None, end=None, token=None):
+        """
+        Open a statement
+
+        Args:
+            history (AccountHistory|HistoryFile): The account's history (None = empty)
+            account_id (int): Account id, bound into tokens
+            start (int): First timestamp included, ns (ignored with a token)
+            end (int): First timestamp excluded, ns (ignored with a token)
+            token (str): Resume after the page that returned this token
+
+        Raises:
+            ValueError: If the token is malformed, for another account, or
+                does not match the history
+        """
+        self.history = history
+        self.account_id = account_id
+        if token is not None:
+            token_account, index, end, check = decode_token(token)
+            if token_account != account_id:
+                raise ValueError("Statement cursor belongs to another account")
+            if index > 0 and (history is None or index > len(history) or history.entry(index - 1)[0] != check):
+                raise ValueError("Statement cursor does not match the account history")
+            # A token is only issued while entries remain before the end
+            # bound, so the bound is always after the last entry delivered
+            if index > 0 and end is not None and end <= check:
+                raise ValueError("Statement cursor does not match the account history")
+            self.index = index
+        elif history is None:
+            self.index = 0
+        else:
+            self.index = history.span(start, None)[0]
+        self.end = end
+
+    def _stop(self):
+        """Index just past the last entry of the statement, as of now"""
+        if self.history is None:
+            return 0
+        if self.end is None:
+            return len(self.history)
+        return max(self.index, self.history.span(self.end, None)[0])
+
+    def chunks(self, limit=None):
+        """
+        Stream the remaining entries, advancing the cursor
+
+        Args:
+            limit (int): Stop after this many entries (None = all)
+
+        Yields:
+            list: (timestamp, cents, balance) tuples, one list per chunk
+        """
+        stop = self._stop()
+        if limit is not None:
+            stop = min(stop, self.index + limit)
+        if self.index >= stop:
+            return
+        for rows in self.history.rows(self.index, stop):
+            self.index += len(rows)
+            yield rows
+
+    def __iter__(self):
+        for rows in self.chunks():
+            yield from rows
+
+    def page(self, limit):
+        """
+        Next page of entries
+
+        Returns:
+            tuple: (entries, token) - token is None when nothing is left
+        """
+        entries = [row for rows in self.chunks(limit) for row in rows]
+        return entries, self.token
+
+    @property
+    def token(self):
+        """Token resuming after the entries delivered so far, None at the end"""
+        if self.index >= self._stop():
+            return None
+        check = self.history.entry(self.index - 1)[0] if self.index > 0 else 0
+        return encode_token(self.account_id, self.index, self.end, check)
+
+
+class _TimestampFormatter:
+    """ISO 8601 UTC timestamps from ns, reusing the date part within a second"""
+
+    def __init__(self):
+        self._second = None
+        self._prefix = ""
+
+    def __call__(self, timestamp):
+        second, fraction = divmod(timestamp, 1_000_000_000)
+        if second != self._second:
+            self._second = second
+            self._prefix = datetime.fromtimestamp(second, timezone.utc).strftime("%Y-%m-%dT%H:%M:%S")
+        return f"{self._prefix}.{fraction:09d}Z"
+
+
+def parse_timestamp(text):
+    """
+    Statement bound from the command line
+
+    Args:
+        text (str): ISO 8601 date or date-time (UTC unless it has an
+            offset), or an integer number of ns since the epoch
+
+    Returns:
+        int: ns since the epoch
+    """
+    if text.lstrip("-").isdigit():
+        return int(text)
+    moment = datetime.fromisoformat(text.replace("Z", "+00:00"))
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    delta = moment - datetime(1970, 1, 1, tzinfo=timezone.utc)
+    return (delta.days * 86400 + delta.seconds) * 1_000_000_000 + delta.microseconds * 1000
+
+
+def write_statement(cursor, stream, file_format="csv", limit=None, header=True):
+    """
+    Write statement entries to a text stream as they are read
+
+    Each chunk of entries is formatted and written before the next one is
+    read, so memory does not depend on the length of the statement.
+
+    Args:
+        cursor (StatementCursor): Statement position, advanced as entries are written
+        stream (file): Text stream receiving the statement
+        file_format (str): 'csv' (timestamp,amount,balance) or 'jsonl'
+        limit (int): Write at most this many entries (None = all)
+        header (bool): Start CSV output with the column names
+
+    Returns:
+        int: Number of entries written
+    """
+    formatter = _TimestampFormatter()
+    if file_format == "csv":
+        if header:
+            stream.write(CSV_HEADER)
+
+        def format_row(row):
+            timestamp, cents, balance = row
+            return f"{formatter(timestamp)},{format_cents(cents)},{format_cents(balance)}\n"
+
+    elif file_format == "jsonl":
+
+        # Every field is digits and punctuation, so no JSON escaping is needed
+        def format_row(row):
+            timestamp, cents, balance = row
+            return (
+                f'{{"timestamp": "{formatter(timestamp)}", "timestamp_ns": {timestamp}, '
+                f'"amount": "{format_cents(cents)}", "balance": "{format_cents(balance)}"}}\n'
+            )
+
+    else:
+        raise ValueError(f"Unknown statement format: {file_format}")
+
+    written = 0
+    for rows in cursor.chunks(limit):
+        stream.write("".join(map(format_row, rows)))
+        written += len(rows)
+    return written
@@ -0,0 +1,186 @@
+#!/usr/bin/env python3
+"""
+Stats Module - Latency histograms and outcome counters for Operations
+Collected only when enabled; see Operations.enable_stats()
+"""
+
+from operations import STATUS_ACCEPTED, STATUS_REJECTED, STATUS_INVALID
+
+# Log-linear buckets: values below 2**SUB_BITS ns get their own bucket, and
+# every power of two above that is split into HALF linear buckets, so a
+# recorded value is off by at most 1/HALF (~3%) - like an HDR histogram
+# with two significant binary digits of precision
+SUB_BITS = 6
+HALF = 1 << (SUB_BITS - 1)
+
+# Largest value tracked (about 18 minutes); anything slower is clamped
+MAX_NS = (1 << 40) - 1
+BUCKETS = (MAX_NS.bit_length() - SUB_BITS + 1) * HALF + HALF
+
+# Operations that get a histogram each
+OPERATIONS = ("TOTAL", "CREDIT", "DEBIT")
+
+# Percentiles shown by report()
+REPORT_PERCENTILES = (50.0, 90.0, 99.0, 99.9)
+
+
+def bucket_index(ns):
+    """Bucket holding a value in nanoseconds"""
+    shift = ns.bit_length() - SUB_BITS
+    if shift > 0:
+        return shift * HALF + (ns >> shift)
+    return ns
+
+
+def bucket_high(index):
+    """Largest value that falls into a bucket"""
+    if index < 2 * HALF:
+        return index
+    shift = index // HALF - 1
+    return ((index - shift * HALF + 1) << shift) - 1
+
+
+class LatencyHistogram:
+    """Fixed-size log-linear histogram of durations in nanoseconds"""
+
+    def __init__(self):
+        self.counts = [0] * BUCKETS
+        self.count = 0
+        self.total_ns = 0
+        self.min_ns = 0
+        self.max_ns = 0
+
+    def record(self, ns):
+        """Add one duration"""
+        if ns > MAX_NS:
+            ns = MAX_NS
+        elif ns < 0:
+            ns = 0
+        shift = ns.bit_length() - SUB_BITS
+        self.counts[shift * HALF + (ns >> shift) if shift > 0 else ns] += 1
+        if not self.count or ns < self.min_ns:
+            self.min_ns = ns
+        if ns > self.max_ns:
+            self.max_ns = ns
+        self.count += 1
+        self.total_ns += ns
+
+    def merge(self, other):
+        """Add the durations recorded by another histogram"""
+        if not other.count:
+            return
+        self.counts = [mine + theirs for mine, theirs in zip(self.counts, other.counts)]
+        if not self.count or other.min_ns < self.min_ns:
+            self.min_ns = other.min_ns
+        if other.max_ns > self.max_ns:
+            self.max_ns = other.max_ns
+        self.count += other.count
+        self.total_ns += other.total_ns
+
+    def percentile(self, percent):
+        """
+        Value at or below which the given percentage of durations fall
+
+        Args:
+            percent (float): Percentile, 0-100
+
+        Returns:
+            int: Upper bound of the bucket holding that rank, in ns (0 if empty)
+        """
+        if not self.count:
+            return 0
+        rank = max(1, -int(-self.count * percent // 100))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bucket_high(index), self.max_ns)
+        return self.max_ns
+
+    def snapshot(self):
+        """Summary of the histogram as a dict"""
+        summary = {
+            "count": self.count,
+            "min_ns": self.min_ns,
+            "max_ns": self.max_ns,
+            "mean_ns": self.total_ns // self.count if self.count else 0,
+        }
+        for percent in REPORT_PERCENTILES:
+            summary[f"p{percent:g}_ns"] = self.percentile(percent)
+        return summary
+
+
+class OperationStats:
+    """
+    Outcome counters, per-operation latency histograms and DataProgram time
+
+    Counters see every operation. Timing is sampled: one operation in
+    sample_every is timed, with its DataProgram calls, so the cost of the
+    clock reads is spread thin. The histograms are a uniform sample of
+    the latency distribution, which is what the percentiles need.
+    """
+
+    def __init__(self, sample_every=32):
+        """
+        Initialize empty statistics
+
+        Args:
+            sample_every (int): Time one operation in this many (1 = all)
+        """
+        self.sample_every = max(1, sample_every)
+        self.histograms = {operation: LatencyHistogram() for operation in OPERATIONS}
+        # Outcome counters - REJECTED is insufficient funds, INVALID is an
+        # unknown operation, an invalid amount or an error
+        self.outcomes = {STATUS_ACCEPTED: 0, STATUS_REJECTED: 0, STATUS_INVALID: 0}
+        self.data_ns = 0
+        self.data_calls = 0
+
+    @property
+    def accepted(self):
+        return self.outcomes[STATUS_ACCEPTED]
+
+    @property
+    def rejected(self):
+        return self.outcomes[STATUS_REJECTED]
+
+    @property
+    def invalid(self):
+        return self.outcomes[STATUS_INVALID]
+
+    def record(self, operation, ns):
+        """Add the duration of one sampled operation"""
+        histogram = self.histograms.get(operation)
+        if histogram is not None:
+            histogram.record(ns)
+
+    def snapshot(self):
+        """All statistics as a dict"""
+        return {
+            "operations": {operation: histogram.snapshot() for operation, histogram in self.histograms.items()},
+            "accepted": self.accepted,
+            "rejected": self.rejected,
+            "invalid": self.invalid,
+            "sample_every": self.sample_every,
+            "data_calls": self.data_calls,
+            "data_ns": self.data_ns,
+        }
+
+    def report(self):
+        """
+        Human-readable statistics
+
+        Returns:
+            list: Report lines
+        """
+        lines = [f"{'Operation':<10}{'Sampled':>8}{'Mean':>10}" + "".join(f"{f'p{p:g}':>10}" for p in REPORT_PERCENTILES)]
+        for operation, histogram in self.histograms.items():
+            summary = histogram.snapshot()
+            values = [summary["mean_ns"]] + [summary[f"p{p:g}_ns"] for p in REPORT_PERCENTILES]
+            lines.append(f"{operation:<10}{summary['count']:>8}" + "".join(f"{value / 1000:>8.1f}us" for value in values))
+        lines.append(f"Accepted: {self.accepted}  Rejected: {self.rejected}  Invalid: {self.invalid}")
+        mean_data = self.data_ns / self.data_calls / 1000 if self.data_calls else 0.0
+        lines.append(
+            f"DataProgram: {self.data_calls} sampled calls, {self.data_ns / 1e6:.3f} ms, {mean_data:.1f}us mean"
+        )
+        lines.append(f"(1 in {self.sample_every} operations timed)")
+        return lines
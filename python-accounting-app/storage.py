@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Storage Module - Choose the balance store behind DataProgram
+A store spec names the backend and, for file-backed ones, its file
+"""
+
+import os
+
+# Environment variable holding the default store spec
+STORE_ENVIRONMENT = "ACCOUNT_STORE"
+
+# Spec of the in-memory default (balances are lost at exit, like the COBOL program)
+MEMORY = "memory"
+
+STORE_USAGE = "memory | json:PATH | sqlite:PATH | mmap:PATH"
+
+
+def open_store(spec=None, cache_bytes=None):
+    """
+    Open the balance store described by a spec
+
+    Args:
+        spec (str): 'memory', 'json:PATH' (the old account_data.json
+            format), 'sqlite:PATH' or 'mmap:PATH' (ids up to
+            mmap_store.MAX_MAPPED_ACCOUNT_ID only; None = $ACCOUNT_STORE,
+            or 'memory' when it is not set)
+        cache_bytes (int): Put a hot-account cache of this many bytes in
+            front of a file-backed store (None = no cache)
+
+    Returns:
+        Store with the AccountStore interface (get_cents, set_cents, items,
+        copy_arrays), plus close() for the file-backed ones
+
+    Raises:
+        ValueError: If the spec names no known backend or lacks a path
+    """
+    if spec is None:
+        spec = os.environ.get(STORE_ENVIRONMENT) or MEMORY
+    kind, _, path = spec.partition(":")
+    kind = kind.strip().lower()
+
+    if kind == MEMORY and not path:
+        from account_store import AccountStore
+
+        return AccountStore()
+    if not path:
+        raise ValueError(f"Unknown account store '{spec}' (expected {STORE_USAGE})")
+
+    # Backends are imported on demand - a run only pays for the one it uses
+    if kind == "json":
+        from json_store import JsonAccountStore
+
+        store = JsonAccountStore(path)
+    elif kind == "sqlite":
+        from sqlite_store import SqliteAccountStore
+
+        store = SqliteAccountStore(path)
+    elif kind == "mmap":
+        from mmap_store import MappedAccountStore
+
+        store = MappedAccountStore(path)
+    else:
+        raise ValueError(f"Unknown account store '{spec}' (expected {STORE_USAGE})")
+
+    if cache_bytes:
+        from cache_store import CachedAccountStore
+
+        store = CachedAccountStore(store, cache_bytes)
+    return store
+
+
+def open_data_program(spec=None, cache_bytes=None):
+    """DataProgram over the store described by spec (see open_store)"""
+    from data import DataProgram
+
+    return DataProgram(open_store(spec, cache_bytes))
@@ -0,0 +1,84 @@
+import pytest
+import random
+from array import array
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from account_store import AccountStore, DEFAULT_ACCOUNT_ID, MAX_ACCOUNT_ID
+
+
+class TestAccountStore:
+    """Unit tests for the array-backed multi-account store"""
+
+    @pytest.fixture
+    def store(self):
+        """Create a store that merges pending accounts early"""
+        return AccountStore(merge_threshold=8)
+
+    @pytest.mark.unit
+    def test_unknown_account_reads_default(self, store):
+        """Accounts never written read as the COBOL initial balance"""
+        assert store.get_cents(DEFAULT_ACCOUNT_ID) == 100000
+        assert store.get_cents(12345) == 100000
+        assert len(store) == 0
+        assert 12345 not in store
+
+    @pytest.mark.unit
+    def test_set_and_get_across_merges(self, store):
+        """Balances survive merges of pending accounts into the sorted arrays"""
+        rng = random.Random(7)
+        expected = {}
+        for _ in range(500):
+            account_id = rng.randrange(0, 10000)
+            expected[account_id] = rng.randrange(0, 10 ** 8)
+            store.set_cents(account_id, expected[account_id])
+
+        assert len(store) == len(expected)
+        for account_id, cents in expected.items():
+            assert store.get_cents(account_id) == cents
+            assert account_id in store
+        assert list(store.items()) == sorted(expected.items())
+
+    @pytest.mark.unit
+    def test_invalid_account_ids(self, store):
+        """Account ids must be unsigned 32-bit integers"""
+        with pytest.raises(ValueError):
+            store.set_cents(-1, 0)
+        with pytest.raises(ValueError):
+            store.set_cents(MAX_ACCOUNT_ID + 1, 0)
+        with pytest.raises(TypeError):
+            store.set_cents('ACC-1', 0)
+
+    @pytest.mark.unit
+    def test_set_many(self, store):
+        """Bulk writes update existing accounts and open new ones"""
+        store.set_cents(5, 1)
+        store.set_many([3, 5, 9] + list(range(100, 120)), [30, 50, 90] + list(range(20)))
+
+        assert store.get_cents(5) == 50
+        assert store.get_cents(9) == 90
+        assert store.get_cents(119) == 19
+        assert len(store) == 23
+        with pytest.raises(ValueError):
+            store.set_many([MAX_ACCOUNT_ID + 1], [0])
+
+    @pytest.mark.unit
+    def test_load_replaces_contents(self, store):
+        """Bulk load installs sorted arrays directly"""
+        store.set_cents(1, 1)
+        store.load(array('I', [2, 4, 6]), array('q', [20, 40, 60]))
+
+        assert store.get_cents(1) == 100000
+        assert store.get_cents(4) == 40
+        with pytest.raises(ValueError):
+            store.load(array('I', [1]), array('q', []))
+
+    @pytest.mark.unit
+    def test_memory_under_16_bytes_per_account(self):
+        """Compact arrays keep each account under 16 bytes"""
+        store = AccountStore()
+        for account_id in random.Random(1).sample(range(MAX_ACCOUNT_ID), 100000):
+            store.set_cents(account_id, 100000)
+
+        assert store.memory_usage() / len(store) < 16
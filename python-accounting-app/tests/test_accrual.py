@@ -0,0 +1,127 @@
+import pytest
+import io
+import random
+from decimal import Decimal
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+from accrual import FEE, INTEREST, accrue, interest_cents, write_entries
+from data import DataProgram
+from ledger import Ledger
+from main import main
+from money import AmountError, to_cents, to_decimal
+from operations import Operations
+from wal import WriteAheadLog, read_log
+
+
+def reference_balance(cents, rate, fee):
+    """Interest then fee through the scalar Decimal rules"""
+    operations = Operations()
+    balance = to_decimal(cents)
+    balance = operations._format_currency(balance + operations._format_currency(balance * Decimal(rate)))
+    if balance >= Decimal(fee):
+        balance = operations._format_currency(balance - Decimal(fee))
+    return to_cents(balance)
+
+
+class TestAccrue:
+    """Test cases for the end-of-day accrual job"""
+
+    @pytest.fixture
+    def data_program(self):
+        """Accounts with balances around the rounding and fee edges"""
+        data_program = DataProgram()
+        rng = random.Random(11)
+        for account_id in range(2000):
+            data_program.write_cents(rng.choice([0, 1, 49, 50, 99, 150, 151, rng.randrange(0, 10 ** 11)]), account_id)
+        return data_program
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("rate", ["0.0001", "0.005", "0.000123456", "0.5", "1", "0"])
+    def test_matches_decimal_rules(self, data_program, rate):
+        """Every balance equals interest and fee applied with Decimal"""
+        opening = dict(data_program.store.items())
+        result = accrue(data_program, rate, "1.50")
+
+        for account_id, cents in opening.items():
+            assert data_program.read_cents(account_id) == reference_balance(cents, rate, "1.50")
+        summary = result["summary"]
+        assert summary["accounts"] == 2000
+        assert summary["fees_charged"] + summary["fees_rejected"] == 2000
+        assert summary["closing_total"] == to_decimal(sum(cents for _, cents in data_program.store.items()))
+
+    @pytest.mark.unit
+    def test_half_cent_rounds_up(self):
+        """balance * rate ending in exactly half a cent rounds away from zero"""
+        balances = np.array([50, 49, 150, -50, 0], dtype=np.int64)
+        assert interest_cents(balances, 1, 100).tolist() == [1, 0, 2, -1, 0]
+
+    @pytest.mark.unit
+    def test_entries_and_rejected_fee(self):
+        """Entries come per account, interest first; uncovered fees are rejected"""
+        data_program = DataProgram()
+        data_program.write_cents(10000, 3)
+        data_program.write_cents(100, 8)
+        ledger = Ledger(clock=lambda: 42)
+        result = accrue(data_program, "0.01", "2.00", ledger=ledger)
+
+        entries = result["entries"]
+        assert entries["account_ids"].tolist() == [3, 3, 8]
+        assert entries["kinds"].tolist() == [INTEREST, FEE, INTEREST]
+        assert entries["amounts"].tolist() == [100, -200, 1]
+        assert entries["balances"].tolist() == [10100, 9900, 101]
+        assert result["summary"]["fees_rejected"] == 1
+        assert data_program.read_cents(8) == 101
+        assert ledger.entries(3) == [(42, 100, 10100), (42, -200, 9900)]
+
+        stream = io.StringIO()
+        assert write_entries(entries, stream) == 3
+        assert stream.getvalue().splitlines()[1:] == ["3,INTEREST,1.00,101.00", "3,FEE,-2.00,99.00", "8,INTEREST,0.01,1.01"]
+
+    @pytest.mark.unit
+    def test_journaled_changes(self, tmp_path):
+        """Changed balances go to the write-ahead log unless journal=False"""
+        path = str(tmp_path / "accounts.wal")
+        with WriteAheadLog(path) as wal:
+            data_program = DataProgram(wal=wal)
+            data_program.write_cents(500, 1)
+            data_program.write_cents(0, 2)
+            accrue(data_program, fee="1.00")
+            accrue(data_program, fee="1.00", journal=False)
+
+        assert [(account_id, cents) for _, account_id, cents in read_log(path)] == [(1, 500), (2, 0), (1, 400)]
+
+    @pytest.mark.unit
+    def test_invalid_arguments(self, data_program):
+        """Negative rates and invalid fees are refused before anything changes"""
+        before = dict(data_program.store.items())
+        with pytest.raises(ValueError):
+            accrue(data_program, "-0.01")
+        with pytest.raises(ValueError):
+            accrue(data_program, "abc")
+        with pytest.raises(AmountError):
+            accrue(data_program, fee="1000000.00")
+        assert dict(data_program.store.items()) == before
+
+
+class TestAccrueCommand:
+    """Test cases for main.py accrue"""
+
+    @pytest.mark.integration
+    def test_accrue_persists(self, tmp_path, capsys):
+        """The job's balances survive a restart and its entries are written"""
+        data = str(tmp_path)
+        with pytest.raises(SystemExit):
+            main(["credit", "100.00", "--data", data])
+        with pytest.raises(SystemExit) as exit_info:
+            main(["accrue", "--data", data, "--rate", "0.01", "--fee", "1.00", "--entries", str(tmp_path / "entries.csv")])
+        assert exit_info.value.code == 0
+        assert "Total interest: 11.00" in capsys.readouterr().out
+        assert (tmp_path / "entries.csv").read_text().splitlines()[1:] == ["0,INTEREST,11.00,1111.00", "0,FEE,-1.00,1110.00"]
+
+        with pytest.raises(SystemExit):
+            main(["balance", "--data", data])
+        assert capsys.readouterr().out == "Current balance: 1110.00\n"
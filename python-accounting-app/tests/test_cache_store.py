@@ -0,0 +1,176 @@
+import pytest
+import random
+from decimal import Decimal
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from account_store import AccountStore
+from cache_store import ENTRY_BYTES, CachedAccountStore
+from data import DataProgram
+from sqlite_store import SqliteAccountStore
+from storage import open_store
+
+
+class CountingStore(AccountStore):
+    """AccountStore counting the calls that reach it"""
+
+    def __init__(self):
+        super().__init__()
+        self.reads = 0
+        self.writes = 0
+
+    def get_cents(self, account_id):
+        self.reads += 1
+        return super().get_cents(account_id)
+
+    def set_cents(self, account_id, cents):
+        self.writes += 1
+        super().set_cents(account_id, cents)
+
+
+def cache_of(store, accounts, policy='clock'):
+    """Cache holding exactly `accounts` accounts"""
+    return CachedAccountStore(store, ENTRY_BYTES[policy] * accounts, policy)
+
+
+class TestCachedAccountStore:
+    """Unit tests for the hot-account cache"""
+
+    @pytest.mark.unit
+    def test_read_through(self):
+        """A miss reads the store once; later reads are hits"""
+        store = CountingStore()
+        store.set_cents(1, 500)
+        cache = cache_of(store, 4)
+        assert cache.get_cents(1) == 500
+        assert cache.get_cents(1) == 500
+        assert cache.get_cents(2) == 100000
+        assert store.reads == 2
+        assert (cache.hits, cache.misses) == (1, 2)
+        assert cache.hit_ratio == pytest.approx(1 / 3)
+
+    @pytest.mark.unit
+    def test_write_back(self):
+        """Writes stay in the cache until flush"""
+        store = CountingStore()
+        cache = cache_of(store, 4)
+        cache.set_cents(3, 300)
+        cache.set_cents(3, 301)
+        assert cache.get_cents(3) == 301
+        assert store.writes == 0 and 3 not in store
+        assert 3 in cache
+        assert cache.stats()['dirty'] == 1
+
+        cache.flush()
+        assert store.get_cents(3) == 301
+        assert cache.stats()['dirty'] == 0
+        assert list(cache.items()) == [(3, 301)]
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('policy', ['clock', 'lru'])
+    def test_eviction_writes_back_dirty_accounts(self, policy):
+        """An evicted dirty account reaches the store; clean ones are dropped"""
+        store = CountingStore()
+        cache = cache_of(store, 2, policy)
+        cache.set_cents(1, 10)
+        cache.get_cents(2)
+        cache.get_cents(3)
+        cache.get_cents(4)
+        assert store.get_cents(1) == 10
+        assert cache.evictions == 2
+        assert cache.writebacks == 1
+        assert store.writes == 1
+        assert cache.stats()['cached'] == 2
+
+    @pytest.mark.unit
+    def test_lru_order(self):
+        """LRU evicts the least recently used account"""
+        cache = cache_of(AccountStore(), 3, 'lru')
+        for account_id in (1, 2, 3):
+            cache.get_cents(account_id)
+        cache.get_cents(1)
+        cache.get_cents(4)
+        cache.misses = 0
+        cache.get_cents(1)
+        cache.get_cents(3)
+        cache.get_cents(4)
+        assert cache.misses == 0
+        cache.get_cents(2)
+        assert cache.misses == 1
+
+    @pytest.mark.unit
+    def test_clock_keeps_referenced_accounts(self):
+        """CLOCK gives accounts hit since they were cached a second chance"""
+        cache = cache_of(AccountStore(), 3)
+        for account_id in (1, 2, 3):
+            cache.get_cents(account_id)
+        cache.get_cents(1)
+        cache.get_cents(3)
+        cache.get_cents(4)  # evicts 2, the only unreferenced one
+        cache.misses = 0
+        for account_id in (1, 3, 4):
+            cache.get_cents(account_id)
+        assert cache.misses == 0
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('policy', ['clock', 'lru'])
+    def test_matches_store_under_random_load(self, policy):
+        """Any mix of reads and writes gives the same balances as the store alone"""
+        rng = random.Random(5)
+        reference = AccountStore()
+        backing = AccountStore()
+        cache = cache_of(backing, 16, policy)
+        for _ in range(5000):
+            account_id = rng.randrange(64)
+            if rng.random() < 0.3:
+                cents = rng.randrange(10 ** 6)
+                reference.set_cents(account_id, cents)
+                cache.set_cents(account_id, cents)
+            else:
+                assert cache.get_cents(account_id) == reference.get_cents(account_id)
+        cache.flush()
+        assert list(backing.items()) == list(reference.items())
+        assert len(cache) == len(reference)
+
+    @pytest.mark.unit
+    def test_set_many_updates_cached_copies(self):
+        """set_many writes through and replaces cached balances"""
+        store = AccountStore()
+        cache = cache_of(store, 4)
+        cache.set_cents(1, 1)
+        cache.set_many([1, 2], [10, 20])
+        assert cache.get_cents(1) == 10
+        assert store.get_cents(1) == 10 and store.get_cents(2) == 20
+        assert cache.stats()['dirty'] == 0
+
+    @pytest.mark.unit
+    def test_budget(self):
+        """The memory budget sets the capacity; unknown policies are refused"""
+        cache = CachedAccountStore(AccountStore(), 1 << 20)
+        assert cache.capacity == (1 << 20) // ENTRY_BYTES['clock']
+        assert cache.memory_usage() <= 1 << 20
+        with pytest.raises(ValueError):
+            CachedAccountStore(AccountStore(), 10)
+        with pytest.raises(ValueError):
+            CachedAccountStore(AccountStore(), 1 << 20, 'fifo')
+        with pytest.raises(ValueError):
+            cache.set_cents(-1, 0)
+
+
+class TestCachedDataProgram:
+    """DataProgram over a cached SQLite store"""
+
+    @pytest.mark.integration
+    def test_balances_survive_close(self, tmp_path):
+        """Closing writes back the cached balances"""
+        path = str(tmp_path / 'accounts.db')
+        data_program = DataProgram(open_store(f'sqlite:{path}', cache_bytes=ENTRY_BYTES['clock'] * 8))
+        assert isinstance(data_program.store, CachedAccountStore)
+        for account_id in range(20):
+            data_program.execute_operation('WRITE', Decimal('2.50') * account_id, account_id=account_id)
+        assert data_program.execute_operation('READ', 0, account_id=19) == Decimal('47.50')
+        data_program.close()
+
+        with SqliteAccountStore(path) as store:
+            assert [cents for _, cents in store.items()] == [250 * account_id for account_id in range(20)]
@@ -0,0 +1,116 @@
+import pytest
+import random
+import threading
+from decimal import Decimal
+from unittest.mock import patch
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from money import MAX_AMOUNT_CENTS
+from operations import Operations, STATUS_ACCEPTED, STATUS_REJECTED, STATUS_INVALID
+
+
+def _run_threads(count, target):
+    """Start count threads running target(index) together and wait for them"""
+    barrier = threading.Barrier(count)
+
+    def run(index):
+        barrier.wait()
+        target(index)
+
+    threads = [threading.Thread(target=run, args=(index,)) for index in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+
+class TestConcurrentOperations:
+    """Stress tests for thread-safe Operations sharing one DataProgram"""
+
+    @pytest.fixture
+    def operations(self):
+        """Create thread-safe operations over a fresh data program"""
+        return Operations(DataProgram(), lock_stripes=16)
+
+    @pytest.mark.unit
+    def test_thread_safe_mode_is_opt_in(self):
+        """Default instances keep the original lock-free behaviour"""
+        assert Operations()._locks is None
+        assert len(Operations(lock_stripes=4)._locks) == 4
+
+    @pytest.mark.unit
+    def test_apply_transaction(self, operations):
+        """apply_transaction reports the same statuses as the batch path"""
+        assert operations.apply_transaction("CREDIT", "250.00", 3) == ("CREDIT", 25000, STATUS_ACCEPTED, 125000)
+        assert operations.apply_transaction("DEBIT ", "2000.00", 3) == ("DEBIT", 200000, STATUS_REJECTED, 125000)
+        assert operations.apply_transaction("DEBIT", "abc", 3) == ("DEBIT", "abc", STATUS_INVALID, 125000)
+        assert operations.apply_transaction(5, "1.00", 3) == ("5", "1.00", STATUS_INVALID, 125000)
+        assert operations.apply_transaction(None, None, 3)[2:] == (STATUS_INVALID, 125000)
+        assert operations.apply_transaction("TOTAL ", account_id=3)[3] == 125000
+        assert operations.apply_transaction("TOTAL ")[3] == 100000
+
+    @pytest.mark.integration
+    @pytest.mark.slow
+    def test_random_credits_and_debits_keep_invariants(self, operations):
+        """Hammer a few accounts: no overdraft, no lost update, amounts within PIC 9(6)V99"""
+        accounts = [1, 2, 3, 4]
+        results = [[] for _ in range(16)]
+
+        def worker(index):
+            rng = random.Random(index)
+            for _ in range(1500):
+                account_id = rng.choice(accounts)
+                operation = rng.choice(("CREDIT", "DEBIT ", "DEBIT "))
+                amount = f"{rng.randrange(0, 150000) / 100:.2f}"
+                result = operations.apply_transaction(operation, amount, account_id)
+                # A balance observed by any caller is never negative
+                assert result[3] >= 0
+                results[index].append((account_id, result))
+
+        _run_threads(16, worker)
+
+        expected = dict.fromkeys(accounts, 100000)
+        rejected = 0
+        for account_results in results:
+            for account_id, (operation, cents, status, _) in account_results:
+                if status == STATUS_ACCEPTED:
+                    assert 0 <= cents <= MAX_AMOUNT_CENTS
+                    expected[account_id] += cents if operation == "CREDIT" else -cents
+                elif status == STATUS_REJECTED:
+                    rejected += 1
+
+        # Every accepted transaction is reflected exactly once
+        for account_id in accounts:
+            balance = operations.data_program.read_cents(account_id)
+            assert balance == expected[account_id]
+            assert balance >= 0
+        assert rejected > 0
+
+    @pytest.mark.integration
+    def test_concurrent_debits_never_overdraw(self, operations):
+        """Only as many debits succeed as the balance covers"""
+        accepted = []
+
+        def worker(index):
+            for _ in range(50):
+                result = operations.apply_transaction("DEBIT", "10.00", 7)
+                if result[2] == STATUS_ACCEPTED:
+                    accepted.append(result)
+
+        _run_threads(8, worker)
+
+        assert len(accepted) == 100
+        assert operations.data_program.read_cents(7) == 0
+
+    @pytest.mark.integration
+    def test_interactive_credits_from_many_threads(self, operations, capsys):
+        """The menu path holds the stripe lock across read, add and write"""
+        with patch('builtins.input', return_value='1.00'):
+            _run_threads(8, lambda index: [operations.execute_operation("CREDIT", 5) for _ in range(100)])
+
+        assert operations.data_program.read_cents(5) == 100000 + 800 * 100
+        assert operations.data_program.execute_operation('read', 0, 5) == Decimal("1800.00")
+        assert "Error" not in capsys.readouterr().out
@@ -0,0 +1,113 @@
+import pytest
+import io
+from unittest.mock import patch
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from console import BUFFER_SIZE, BufferedOutput
+from main import MainProgram, main
+
+SESSION = ['1', '2', '100.00', '3', 'abc', '50.00', '3', '99999.00', '7', '1', '4']
+
+
+class CountingStream(io.StringIO):
+    """StringIO that counts the writes it receives"""
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+
+    def write(self, text):
+        self.writes += 1
+        return super().write(text)
+
+
+class TestBufferedOutput:
+    """Unit tests for the block-buffered writer"""
+
+    @pytest.mark.unit
+    def test_flushes_every_n_lines(self):
+        """Output reaches the stream in blocks of flush_lines lines"""
+        stream = CountingStream()
+        output = BufferedOutput(stream, flush_lines=10)
+        for number in range(25):
+            print(f"line {number}", file=output)
+
+        assert stream.writes == 2
+        assert stream.getvalue().count("\n") == 20
+        output.close()
+        assert stream.writes == 3
+        assert stream.getvalue() == "".join(f"line {number}\n" for number in range(25))
+
+    @pytest.mark.unit
+    def test_flushes_by_size(self):
+        """Long output is flushed even when lines are not counted"""
+        stream = CountingStream()
+        output = BufferedOutput(stream, flush_lines=0)
+        output.write("x" * BUFFER_SIZE)
+        assert stream.writes == 1
+        output.write("tail")
+        output.close()
+        assert stream.getvalue() == "x" * BUFFER_SIZE + "tail"
+
+
+class TestQuietSession:
+    """Test cases for scripted sessions without menu or prompts"""
+
+    def run_session(self, quiet):
+        """Run SESSION through MainProgram, returning (output, final balance)"""
+        stream = io.StringIO()
+        with BufferedOutput(stream) as output:
+            main_program = MainProgram(quiet=quiet, output=output)
+            with patch('builtins.input', side_effect=SESSION) as mock_input:
+                main_program.run()
+        prompts = [call.args[0] for call in mock_input.call_args_list]
+        return stream.getvalue(), main_program.operations.data_program.read_cents(), prompts
+
+    @pytest.mark.integration
+    def test_quiet_session_matches_menu_session(self):
+        """Quiet mode prints the same results, minus menu and prompts"""
+        quiet_output, quiet_balance, quiet_prompts = self.run_session(quiet=True)
+        menu_output, menu_balance, menu_prompts = self.run_session(quiet=False)
+
+        assert quiet_balance == menu_balance == 105000
+        assert set(quiet_prompts) == {""}
+        assert "Enter credit amount: " in menu_prompts
+
+        menu_lines = [line for line in menu_output.splitlines() if line.startswith(("Current", "Amount", "Insufficient", "Invalid", "Exiting"))]
+        assert quiet_output.splitlines() == menu_lines
+        assert "Account Management System" not in quiet_output
+        assert quiet_output.splitlines()[-1] == "Exiting the program. Goodbye!"
+
+    @pytest.mark.unit
+    def test_data_program_messages_buffered(self, capsys):
+        """DataProgram messages go through the same buffer as the results"""
+        stream = io.StringIO()
+        with BufferedOutput(stream) as output:
+            main_program = MainProgram(quiet=True, output=output)
+            print("before", file=output)
+            main_program.operations.data_program.execute_operation('purge', 0)
+            print("after", file=output)
+        assert stream.getvalue() == "before\nUnknown operation: purge\nafter\n"
+        assert capsys.readouterr().out == ""
+
+    @pytest.mark.integration
+    def test_main_quiet_flag(self, capsys, monkeypatch):
+        """main --quiet reads the script from stdin and prints only results"""
+        monkeypatch.setattr('sys.stdin', io.StringIO("2\n10.00\n1\n4\n"))
+        main(['--quiet'])
+
+        assert capsys.readouterr().out == (
+            "Amount credited. New balance: 1010.00\n"
+            "Current balance: 1010.00\n"
+            "Exiting the program. Goodbye!\n"
+        )
+
+    @pytest.mark.integration
+    def test_main_no_quiet_keeps_menu(self, capsys, monkeypatch):
+        """--no-quiet shows the menu even when stdin is not a terminal"""
+        monkeypatch.setattr('sys.stdin', io.StringIO("4\n"))
+        main(['--no-quiet'])
+
+        assert "Account Management System" in capsys.readouterr().out
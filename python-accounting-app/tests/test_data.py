@@ -72,3 +72,28 @@ class TestDataProgram:
         data_program.execute_operation('write', Decimal('1500.50'))
         assert data_program.get_current_balance() == Decimal('1500.50')
     
+    @pytest.mark.unit
+    def test_account_id_read_write(self, data_program):
+        """READ/WRITE with an account id leave STORAGE-BALANCE untouched"""
+        result = data_program.execute_operation('write', Decimal('42.50'), 7)
+        assert result == Decimal('42.50')
+
+        assert data_program.execute_operation('read', Decimal('0.00'), 7) == Decimal('42.50')
+        assert data_program.execute_operation('read', Decimal('0.00'), 8) == Decimal('1000.00')
+        assert data_program.storage_balance == Decimal('1000.00')
+
+    @pytest.mark.unit
+    def test_default_account_is_storage_balance(self, data_program):
+        """Operations without an account id use the single STORAGE-BALANCE account"""
+        data_program.execute_operation('write', Decimal('10.00'))
+        assert data_program.execute_operation('read', Decimal('0.00'), 0) == Decimal('10.00')
+        assert data_program.read_cents() == 1000
+
+    @pytest.mark.unit
+    def test_invalid_account_id(self, data_program, capsys):
+        """Invalid account ids are reported like other DataProgram errors"""
+        result = data_program.execute_operation('write', Decimal('10.00'), -5)
+
+        assert result == Decimal('10.00')
+        captured = capsys.readouterr()
+        assert "Error in DataProgram operation 'write'" in captured.out
@@ -0,0 +1,192 @@
+import pytest
+import threading
+from unittest.mock import patch
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from escrow import CreditEscrow
+from ledger import Ledger
+from operations import Operations
+
+
+class TestCreditEscrow:
+    """Unit tests for the per-worker credit buffers"""
+
+    @pytest.mark.unit
+    def test_add_and_drain(self):
+        """Credits are drained once, in order, and add() reports a full buffer"""
+        escrow = CreditEscrow([7], max_pending=3)
+        assert escrow.add(7, 100) is False
+        assert escrow.add(7, 200, 15) is False
+        assert escrow.add(7, 300) is True
+        assert escrow.pending(7) == escrow.pending() == 3
+        assert escrow.drain(7) == [(0, 100), (15, 200), (0, 300)]
+        assert escrow.drain(7) == []
+        assert escrow.pending() == 0
+        with pytest.raises(ValueError):
+            CreditEscrow([7], max_pending=0)
+
+    @pytest.mark.unit
+    def test_buffers_per_thread(self):
+        """Each thread gets its own buffer, and drain() empties them all"""
+        escrow = CreditEscrow([1, 2])
+
+        def credit():
+            for _ in range(500):
+                escrow.add(1, 1)
+
+        threads = [threading.Thread(target=credit) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(escrow._buffers[1]) == 4
+        assert escrow.pending(2) == 0
+        assert sum(cents for _, cents in escrow.drain(1)) == 2000
+
+
+class TestHotAccounts:
+    """Test cases for Operations with hot-account credit aggregation"""
+
+    @pytest.fixture
+    def operations(self):
+        """Operations with account 5 hot"""
+        operations = Operations(DataProgram(), lock_stripes=8)
+        operations.enable_hot_accounts([5], max_pending=100)
+        return operations
+
+    @pytest.mark.unit
+    def test_credits_buffered_until_read(self, operations):
+        """Credits return no balance and show up on the next TOTAL"""
+        assert operations.apply_transaction('CREDIT', '10.00', 5) == ('CREDIT', 1000, 'ACCEPTED', None)
+        operations.apply_transaction('CREDIT', '2.50', 5)
+        assert operations.escrow.pending(5) == 2
+        assert operations.data_program.read_cents(5) == 100000
+        assert operations.apply_transaction('TOTAL', None, 5)[3] == 101250
+        assert operations.escrow.pending() == 0
+
+    @pytest.mark.unit
+    def test_debit_sees_buffered_credits(self, operations):
+        """The funds check of a debit includes every earlier credit"""
+        for _ in range(10):
+            operations.apply_transaction('CREDIT', '500.00', 5)
+        assert operations.apply_transaction('DEBIT', '5500.00', 5) == ('DEBIT', 550000, 'ACCEPTED', 50000)
+        assert operations.apply_transaction('DEBIT', '500.01', 5)[2:] == ('REJECTED', 50000)
+
+    @pytest.mark.unit
+    def test_amount_limits(self, operations):
+        """Each credit is checked against 999999.99 before it is buffered"""
+        assert operations.apply_transaction('CREDIT', '999999.99', 5)[2] == 'ACCEPTED'
+        assert operations.apply_transaction('CREDIT', '1000000.00', 5) == ('CREDIT', '1000000.00', 'INVALID', 100099999)
+        assert operations.apply_transaction('CREDIT', '-1', 5)[2] == 'INVALID'
+        assert operations.apply_transaction('DEBIT', 'abc', 5)[2:] == ('INVALID', 100099999)
+        assert operations.apply_transaction('TOTAL', None, 5)[3] == 100099999
+
+    @pytest.mark.unit
+    def test_full_buffer_merges(self, operations):
+        """A worker merges its own buffer when it reaches max_pending"""
+        for _ in range(250):
+            operations.apply_transaction('CREDIT', '1.00', 5)
+        assert operations.escrow.pending(5) == 50
+        assert operations.data_program.read_cents(5) == 120000
+
+    @pytest.mark.unit
+    def test_other_accounts_unchanged(self, operations):
+        """Accounts that are not hot are credited directly"""
+        assert operations.apply_transaction('CREDIT', '1.00', 6) == ('CREDIT', 100, 'ACCEPTED', 100100)
+        assert operations.escrow.pending() == 0
+
+    @pytest.mark.unit
+    def test_idempotency_key(self, operations):
+        """Keyed credits are applied directly, after the buffered ones"""
+        operations.enable_idempotency()
+        operations.apply_transaction('CREDIT', '1.00', 5)
+        assert operations.apply_transaction('CREDIT', '1.00', 5, 'k1')[3] == 100200
+        assert operations.apply_transaction('CREDIT', '1.00', 5, 'k1')[3] == 100200
+        operations.apply_transaction('CREDIT', '5.00', 5)
+        assert operations.apply_transaction('DEBIT', '1007.00', 5, 'k2') == ('DEBIT', 100700, 'ACCEPTED', 0)
+        assert operations.apply_transaction('DEBIT', '1007.00', 5, 'k2')[3] == 0
+        assert operations.apply_transaction('DEBIT', '1.00', 5, 'k1')[2] == 'INVALID'
+
+    @pytest.mark.unit
+    def test_ledger_records_each_credit(self, operations):
+        """Merged credits are recorded one by one, at the time they were accepted"""
+        clock = iter(range(1000, 2000, 100)).__next__
+        operations.enable_ledger(Ledger(clock=clock))
+        for amount in ('1.00', '2.00', '3.00'):
+            operations.apply_transaction('CREDIT', amount, 5)
+        operations.merge_hot_accounts()
+        assert operations.ledger.entries(5) == [(1000, 100, 100100), (1100, 200, 100300), (1200, 300, 100600)]
+
+    @pytest.mark.unit
+    def test_max_pending_checked(self):
+        """An explicit max_pending below 1 is refused, not replaced by the default"""
+        operations = Operations(DataProgram())
+        with pytest.raises(ValueError):
+            operations.enable_hot_accounts([5], max_pending=0)
+        assert operations.enable_hot_accounts([5], max_pending=1).max_pending == 1
+
+    @pytest.mark.unit
+    def test_batch_merges(self):
+        """A batch on a hot default account applies after the buffered credits"""
+        operations = Operations(DataProgram())
+        operations.enable_hot_accounts([0])
+        operations.apply_transaction('CREDIT', '100.00', 0)
+        results = operations.apply_batch([('DEBIT', '1100.00')])['results']
+        assert results[0][2:] == ('ACCEPTED', 0)
+
+    @pytest.mark.unit
+    def test_arrays_merge(self, operations):
+        """An end-of-day array batch applies after the buffered credits"""
+        np = pytest.importorskip("numpy")
+        operations.apply_transaction('CREDIT', '100.00', 5)
+        result = operations.apply_arrays(np.array([5]), np.array([-110000]))
+        assert result['balances'].tolist() == [0]
+
+    @pytest.mark.unit
+    def test_menu_total_merges(self, operations):
+        """The console TOTAL path reads the merged balance"""
+        operations.apply_transaction('CREDIT', '10.00', 5)
+        operations._handle_total_operation(5)
+        assert operations.data_program.read_cents(5) == 101000
+        assert operations.escrow.pending() == 0
+
+    @pytest.mark.unit
+    def test_with_stats(self, operations, capsys):
+        """Timed console operations keep merging buffered credits"""
+        operations.enable_stats(sample_every=1)
+        for merged in (1500, 2000, 2500):
+            operations.apply_transaction('CREDIT', '500.00', 5)
+            operations.execute_operation('TOTAL ', 5)
+            assert operations.final_balance == merged
+        with patch('builtins.input', return_value='2500.00'):
+            operations.apply_transaction('CREDIT', '500.00', 5)
+            assert operations.execute_operation('DEBIT ', 5) == 'ACCEPTED'
+        assert operations.data_program.read_cents(5) == 50000
+        assert operations.stats()['data_calls'] == 5
+        assert not {'_call_data_program', '_get_amount_input', 'apply_transaction'} & set(vars(operations))
+
+    @pytest.mark.integration
+    def test_concurrent_balances_exact(self, operations):
+        """Credits and debits from many threads leave the exact balance"""
+        accepted_debits = []
+
+        def worker():
+            debits = 0
+            for index in range(2000):
+                if index % 10 == 9:
+                    debits += operations.apply_transaction('DEBIT', '5.00', 5)[2] == 'ACCEPTED'
+                else:
+                    operations.apply_transaction('CREDIT', '1.00', 5)
+            accepted_debits.append(debits)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        expected = 100000 + 4 * 1800 * 100 - sum(accepted_debits) * 500
+        assert operations.apply_transaction('TOTAL', None, 5)[3] == expected
+        assert sum(accepted_debits) == 4 * 200
@@ -0,0 +1,199 @@
+import pytest
+import threading
+import time
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from idempotency import IdempotencyCache
+from operations import Operations, STATUS_ACCEPTED, STATUS_INVALID, STATUS_REJECTED
+
+
+class FakeClock:
+    """Clock advanced by hand"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestIdempotencyCache:
+    """Unit tests for the bounded key -> outcome cache"""
+
+    @pytest.mark.unit
+    def test_get_and_put(self):
+        """A stored key returns its request and result; unknown keys miss"""
+        cache = IdempotencyCache()
+        assert cache.get('a') is None
+        cache.put('a', ('CREDIT', 100, 0), ('CREDIT', 100, 'ACCEPTED', 100100))
+        assert cache.get('a') == (('CREDIT', 100, 0), ('CREDIT', 100, 'ACCEPTED', 100100))
+        assert 'a' in cache and 'b' not in cache
+        assert (cache.hits, cache.misses) == (1, 1)
+
+    @pytest.mark.unit
+    def test_size_eviction_is_lru(self):
+        """Past max_keys the least recently used key is dropped"""
+        cache = IdempotencyCache(max_keys=3, ttl=None)
+        for key in 'abc':
+            cache.put(key, key, key)
+        cache.get('a')
+        cache.put('d', 'd', 'd')
+        assert len(cache) == 3
+        assert 'b' not in cache
+        assert all(key in cache for key in 'acd')
+        assert cache.evictions == 1
+
+    @pytest.mark.unit
+    def test_time_expiry(self):
+        """Keys expire ttl seconds after they were stored"""
+        clock = FakeClock()
+        cache = IdempotencyCache(max_keys=100, ttl=10, clock=clock)
+        cache.put('a', 1, 1)
+        clock.now = 5
+        cache.put('b', 2, 2)
+        clock.now = 10
+        assert cache.get('a') is None
+        assert cache.get('b') == (2, 2)
+
+        # Expired keys are also swept from the old end when storing
+        cache.put('c', 3, 3)
+        clock.now = 20
+        cache.put('d', 4, 4)
+        assert len(cache) == 1
+        assert cache.expirations == 3
+
+    @pytest.mark.unit
+    def test_memory_stays_bounded(self):
+        """A stream of unique keys never holds more than max_keys"""
+        cache = IdempotencyCache(max_keys=1000)
+        for number in range(50_000):
+            cache.put(number, None, None)
+        assert len(cache) == 1000
+        assert cache.evictions == 49_000
+
+    @pytest.mark.unit
+    def test_invalid_size(self):
+        """A cache must hold at least one key"""
+        with pytest.raises(ValueError):
+            IdempotencyCache(max_keys=0)
+
+
+class TestIdempotentOperations:
+    """apply_transaction with idempotency keys"""
+
+    @pytest.fixture
+    def operations(self):
+        """Create operations over a fresh data program"""
+        return Operations(DataProgram())
+
+    @pytest.mark.unit
+    def test_retry_is_not_applied_twice(self, operations):
+        """A retried credit returns the original outcome and balance"""
+        first = operations.apply_transaction('CREDIT', '100.00', idempotency_key='k1')
+        retry = operations.apply_transaction('CREDIT', '100.00', idempotency_key='k1')
+        assert first == retry == ('CREDIT', 10000, STATUS_ACCEPTED, 110000)
+        assert operations.data_program.read_cents() == 110000
+
+        # A new key is a new request
+        operations.apply_transaction('CREDIT', '100.00', idempotency_key='k2')
+        assert operations.data_program.read_cents() == 120000
+
+    @pytest.mark.unit
+    def test_retry_skips_data_program(self, operations, monkeypatch):
+        """A remembered outcome is returned without reading or writing balances"""
+        operations.apply_transaction('DEBIT ', '10.00', account_id=4, idempotency_key='k')
+
+        def fail(*args):
+            raise AssertionError('DataProgram used for a retry')
+
+        monkeypatch.setattr(operations.data_program, 'read_cents', fail)
+        monkeypatch.setattr(operations.data_program, 'write_cents', fail)
+        assert operations.apply_transaction('DEBIT ', '10.00', account_id=4, idempotency_key='k') == (
+            'DEBIT', 1000, STATUS_ACCEPTED, 99000)
+
+    @pytest.mark.unit
+    def test_rejected_outcome_is_kept(self, operations):
+        """A rejected debit stays rejected on retry, even after a credit"""
+        assert operations.apply_transaction('DEBIT', '2000.00', idempotency_key='d')[2] == STATUS_REJECTED
+        operations.apply_transaction('CREDIT', '5000.00')
+        assert operations.apply_transaction('DEBIT', '2000.00', idempotency_key='d') == (
+            'DEBIT', 200000, STATUS_REJECTED, 100000)
+        assert operations.data_program.read_cents() == 600000
+
+    @pytest.mark.unit
+    def test_key_reused_for_another_request(self, operations):
+        """The same key with another amount or account is INVALID"""
+        operations.apply_transaction('CREDIT', '1.00', idempotency_key='k')
+        assert operations.apply_transaction('CREDIT', '2.00', idempotency_key='k') == (
+            'CREDIT', 200, STATUS_INVALID, 100100)
+        assert operations.apply_transaction('CREDIT', '1.00', account_id=3, idempotency_key='k')[2] == STATUS_INVALID
+        assert operations.data_program.read_cents() == 100100
+        assert operations.data_program.read_cents(3) == 100000
+
+    @pytest.mark.unit
+    def test_expired_key_applies_again(self, operations):
+        """Once a key has been forgotten the request is applied again"""
+        clock = FakeClock()
+        operations.enable_idempotency(IdempotencyCache(ttl=60, clock=clock))
+        operations.apply_transaction('CREDIT', '1.00', idempotency_key='k')
+        clock.now = 61
+        operations.apply_transaction('CREDIT', '1.00', idempotency_key='k')
+        assert operations.data_program.read_cents() == 100200
+
+    @pytest.mark.unit
+    def test_without_keys_nothing_is_cached(self, operations):
+        """Requests without a key never create the cache"""
+        operations.apply_transaction('CREDIT', '1.00')
+        operations.apply_transaction('TOTAL', idempotency_key='t')
+        assert operations.idempotency is None
+
+    @pytest.mark.integration
+    def test_concurrent_retries_apply_once(self):
+        """Retries racing on threads are applied exactly once"""
+        operations = Operations(DataProgram(), lock_stripes=8)
+        barrier = threading.Barrier(8)
+
+        def client(number):
+            barrier.wait()
+            for key in range(200):
+                operations.apply_transaction('CREDIT', '1.00', account_id=key % 5, idempotency_key=str(key))
+
+        threads = [threading.Thread(target=client, args=(number,)) for number in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert [operations.data_program.read_cents(account) for account in range(5)] == [104000] * 5
+
+    @pytest.mark.integration
+    def test_same_key_for_two_accounts_applies_once(self):
+        """A key sent concurrently for two different accounts is claimed once"""
+
+        class SlowDataProgram(DataProgram):
+            """Widens the window between the key lookup and the key store"""
+
+            def read_cents(self, account_id=0):
+                time.sleep(0.005)
+                return DataProgram.read_cents(self, account_id)
+
+        operations = Operations(SlowDataProgram(), lock_stripes=8)
+        assert operations._account_lock(1) is not operations._account_lock(2)
+        for round_number in range(5):
+            barrier = threading.Barrier(2)
+            statuses = []
+
+            def client(account_id):
+                barrier.wait()
+                result = operations.apply_transaction('CREDIT', '1.00', account_id, idempotency_key=f'k{round_number}')
+                statuses.append(result[2])
+
+            threads = [threading.Thread(target=client, args=(account_id,)) for account_id in (1, 2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            assert sorted(statuses) == [STATUS_ACCEPTED, STATUS_INVALID]
+        assert operations.data_program.read_cents(1) + operations.data_program.read_cents(2) == 200500
@@ -0,0 +1,106 @@
+import pytest
+from decimal import Decimal
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ingest import IngestProgram, read_records, detect_format
+from main import main
+
+
+class TestIngest:
+    """Unit and integration tests for the streaming --ingest mode"""
+
+    @pytest.mark.unit
+    def test_detect_format(self):
+        """File format is guessed from the extension"""
+        assert detect_format('nightly.csv') == 'csv'
+        assert detect_format('nightly.jsonl') == 'jsonl'
+        assert detect_format('nightly.NDJSON') == 'jsonl'
+
+    @pytest.mark.unit
+    def test_read_records_csv(self):
+        """CSV lines are parsed lazily, header and blank lines skipped"""
+        malformed = []
+        lines = ['operation,amount\n', 'CREDIT,100.00\n', '\n', 'oops\n', 'TOTAL\n']
+
+        records = list(read_records(lines, 'csv', lambda *args: malformed.append(args)))
+
+        assert records == [(2, 'CREDIT,100.00', 'CREDIT', '100.00'), (5, 'TOTAL', 'TOTAL', None)]
+        assert malformed[0][0] == 4
+
+    @pytest.mark.unit
+    def test_read_records_jsonl(self):
+        """JSONL records need an 'operation' field"""
+        malformed = []
+        lines = ['{"operation": "DEBIT", "amount": "5.00"}', '{"amount": 1}', '{not json']
+
+        records = list(read_records(lines, 'jsonl', lambda *args: malformed.append(args)))
+
+        assert records == [(1, lines[0], 'DEBIT', '5.00')]
+        assert [m[0] for m in malformed] == [2, 3]
+
+    @pytest.mark.integration
+    def test_ingest_csv_with_rejects(self, tmp_path):
+        """Bad records are written to the reject file and do not stop the run"""
+        source = tmp_path / 'tx.csv'
+        source.write_text('CREDIT,250.50\nDEBIT,5000.00\nDEBIT,abc\nnot a record\nDEBIT,200.00\n')
+        rejects = tmp_path / 'tx.rej'
+
+        program = IngestProgram(reject_path=str(rejects))
+        summary = program.run(str(source))
+
+        assert summary['lines'] == 5
+        assert summary['accepted'] == 2
+        assert summary['rejected'] == 1
+        assert summary['invalid'] == 1
+        assert summary['malformed'] == 1
+        assert summary['final_balance'] == Decimal('1050.50')
+        assert program.operations.data_program.get_current_balance() == Decimal('1050.50')
+
+        reject_lines = rejects.read_text().splitlines()
+        assert [line.split('\t')[0] for line in reject_lines] == ['2', '3', '4']
+        assert reject_lines[0].endswith('DEBIT,5000.00')
+
+    @pytest.mark.integration
+    def test_ingest_jsonl(self, tmp_path):
+        """JSONL files stream through the same pipeline"""
+        source = tmp_path / 'tx.jsonl'
+        source.write_text('{"operation": "CREDIT", "amount": "0.005"}\n{"operation": "TOTAL"}\n')
+
+        summary = IngestProgram().run(str(source))
+
+        assert summary['accepted'] == 2
+        assert summary['final_balance'] == Decimal('1000.01')
+
+    @pytest.mark.integration
+    def test_ingest_jsonl_non_string_operation(self, tmp_path):
+        """A numeric or null operation is a malformed record, not a crash"""
+        source = tmp_path / 'tx.jsonl'
+        source.write_text(
+            '{"operation": 5, "amount": "1"}\n{"operation": null}\n'
+            '{"operation": ["CREDIT"], "amount": "1"}\n{"operation": "CREDIT", "amount": "1.00"}\n'
+        )
+        rejects = tmp_path / 'tx.rej'
+
+        summary = IngestProgram(reject_path=str(rejects)).run(str(source))
+
+        assert (summary['accepted'], summary['malformed']) == (1, 3)
+        assert summary['final_balance'] == Decimal('1001.00')
+        assert [line.split('\t')[1] for line in rejects.read_text().splitlines()] == [
+            "MALFORMED: 'operation' must be a string"] * 3
+
+    @pytest.mark.integration
+    def test_main_ingest_option(self, tmp_path, capsys):
+        """main.py --ingest reports throughput instead of showing the menu"""
+        source = tmp_path / 'tx.csv'
+        source.write_text('CREDIT,100.00\nDEBIT,50.00\n')
+
+        main(['--ingest', str(source)])
+
+        captured = capsys.readouterr()
+        assert "Lines processed: 2" in captured.out
+        assert "Final balance: 1050.00" in captured.out
+        assert "lines/s" in captured.out
+        assert "Account Management System" not in captured.out
+        assert (tmp_path / 'tx.csv.rej').exists()
@@ -0,0 +1,95 @@
+import pytest
+from decimal import Decimal
+from unittest.mock import patch
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ledger import AccountHistory, Ledger
+from operations import Operations
+
+
+class TestAccountHistory:
+    """Unit tests for the columnar history of one account"""
+
+    @pytest.fixture
+    def history(self):
+        """Five transactions at t = 10, 20, 20, 30, 40"""
+        history = AccountHistory()
+        balance = 100000
+        for timestamp, cents in [(10, 500), (20, -200), (20, 1000), (30, -50), (40, 7)]:
+            balance += cents
+            history.append(timestamp, cents, balance)
+        return history
+
+    @pytest.mark.unit
+    def test_range_query(self, history):
+        """Start is inclusive, end exclusive, equal timestamps stay together"""
+        assert history.entries(20, 30) == [(20, -200, 100300), (20, 1000, 101300)]
+        assert history.entries(None, 20) == [(10, 500, 100500)]
+        assert history.entries(35) == [(40, 7, 101257)]
+        assert history.entries(41) == []
+        assert history.entries(30, 10) == []
+        assert len(history.entries()) == 5
+
+    @pytest.mark.unit
+    def test_balance_as_of(self, history):
+        """As-of lookups include transactions at exactly that time"""
+        assert history.balance_as_of(9) == 100000
+        assert history.balance_as_of(10) == 100500
+        assert history.balance_as_of(25) == 101300
+        assert history.balance_as_of(10 ** 18) == 101257
+        assert AccountHistory().balance_as_of(10) is None
+
+    @pytest.mark.unit
+    def test_clock_going_back(self, history):
+        """A timestamp earlier than the last one is clamped to keep order"""
+        assert history.append(5, 1, 101258) == 40
+        assert list(history.timestamps) == [10, 20, 20, 30, 40, 40]
+
+    @pytest.mark.unit
+    def test_columns_are_compact(self, history):
+        """Each entry costs three int64 slots"""
+        assert history.memory_usage() == 5 * 3 * 8
+
+
+class TestLedgerRecording:
+    """Test cases for the ledger recorded by Operations"""
+
+    @pytest.fixture
+    def operations(self):
+        """Operations recording into a ledger with a fake clock"""
+        operations = Operations()
+        ticks = iter(range(1, 1000))
+        operations.enable_ledger(Ledger(clock=lambda: next(ticks)))
+        return operations
+
+    @pytest.mark.unit
+    def test_disabled_by_default(self):
+        """No ledger unless enabled"""
+        assert Operations().ledger is None
+
+    @pytest.mark.integration
+    def test_console_operations(self, operations, capsys):
+        """Accepted credits and debits are recorded, rejections are not"""
+        with patch('builtins.input', side_effect=['100.00', '50.25', '5000.00']):
+            operations.execute_operation("CREDIT")
+            operations.execute_operation("DEBIT ")
+            operations.execute_operation("DEBIT ")
+        operations.execute_operation("TOTAL ")
+
+        assert operations.ledger.entries(0) == [(1, 10000, 110000), (2, -5025, 104975)]
+        assert operations.ledger.balance_as_of(0, 2) == operations.data_program.read_cents()
+
+    @pytest.mark.integration
+    def test_apply_transaction_and_batch(self, operations):
+        """Headless paths record per account, signed"""
+        operations.apply_transaction("CREDIT", "10.00", account_id=7)
+        operations.apply_transaction("DEBIT", "99999.00", account_id=7)
+        operations.apply_batch([("DEBIT", "1.50"), ("CREDIT", "bad"), ("CREDIT", Decimal("2.00"))])
+
+        assert operations.ledger.entries(7) == [(1, 1000, 101000)]
+        assert operations.ledger.entries(0) == [(2, -150, 99850), (3, 200, 100050)]
+        assert len(operations.ledger) == 3
+        assert operations.ledger.balance_as_of(0, 0, default=-1) == 100000
+        assert operations.ledger.balance_as_of(8, 5, default=-1) == -1
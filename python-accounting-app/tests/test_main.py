@@ -4,7 +4,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from main import MainProgram
+from main import MainProgram, main
 
 
 class TestMainProgram:
@@ -166,3 +166,68 @@ class TestMainProgram:
         
         captured = capsys.readouterr()
         assert "Exiting the program. Goodbye!" in captured.out
+
+
+class TestSubcommands:
+    """Test cases for the one-shot balance/credit/debit subcommands"""
+
+    def run_main(self, argv, capsys):
+        """Run main() with argv, returning (exit status, stdout)"""
+        with pytest.raises(SystemExit) as exit_info:
+            main(argv)
+        return exit_info.value.code, capsys.readouterr().out
+
+    @pytest.mark.unit
+    @patch('builtins.input', side_effect=AssertionError("menu must not prompt"))
+    def test_balance_skips_menu(self, mock_input, capsys):
+        """balance prints the balance without showing the menu"""
+        status, output = self.run_main(['balance'], capsys)
+        assert status == 0
+        assert output == "Current balance: 1000.00\n"
+
+    @pytest.mark.unit
+    def test_credit_and_debit(self, capsys):
+        """credit and debit print the same messages as the menu"""
+        assert self.run_main(['credit', '250.5'], capsys) == (0, "Amount credited. New balance: 1250.50\n")
+        assert self.run_main(['debit', '100.00'], capsys) == (0, "Amount debited. New balance: 900.00\n")
+        assert self.run_main(['debit', '1000.01'], capsys) == (1, "Insufficient funds for this debit.\n")
+
+    @pytest.mark.unit
+    def test_invalid_arguments(self, capsys):
+        """Bad amounts and usage errors exit with status 2"""
+        assert self.run_main(['credit', 'abc'], capsys) == (2, "Invalid amount format.\n")
+        assert self.run_main(['debit', '1000000'], capsys) == (2, "Amount exceeds maximum limit (999999.99).\n")
+        assert self.run_main(['credit'], capsys)[0] == 2
+        assert self.run_main(['balance', '10'], capsys)[0] == 2
+        assert self.run_main(['balance', '--account'], capsys)[0] == 2
+
+    @pytest.mark.integration
+    def test_internal_error_status(self, tmp_path, capsys):
+        """An unreadable data directory exits with 3, not the insufficient-funds 1"""
+        data = tmp_path / "state"
+        data.mkdir()
+        (data / "accounts.snap").write_bytes(b"not a snapshot" * 4)
+        status, output = self.run_main(['debit', '1.00', '--data', str(data)], capsys)
+        assert status == 3
+        assert output.startswith("An error occurred: ")
+
+    @pytest.mark.integration
+    def test_persistent_data_directory(self, tmp_path, capsys):
+        """With --data, balances carry over between one-shot runs"""
+        data = str(tmp_path / "state")
+        self.run_main(['credit', '100.00', '--data', data, '--account', '7'], capsys)
+        self.run_main(['debit', '0.25', '--data=' + data, '--account=7'], capsys)
+        assert self.run_main(['balance', '--data', data, '--account', '7'], capsys) == (0, "Current balance: 1099.75\n")
+        assert self.run_main(['balance', '--data', data], capsys) == (0, "Current balance: 1000.00\n")
+
+    @pytest.mark.integration
+    def test_log_compacted_into_snapshot(self, tmp_path, capsys, monkeypatch):
+        """Once the log tail is long enough a one-shot run writes a snapshot"""
+        monkeypatch.setattr('main.COMPACT_LOG_BYTES', 32)
+        data = tmp_path / "state"
+        self.run_main(['credit', '1.00', '--data', str(data)], capsys)
+        assert not (data / "accounts.snap").exists()
+        self.run_main(['credit', '1.00', '--data', str(data)], capsys)
+        self.run_main(['credit', '1.00', '--data', str(data)], capsys)
+        assert (data / "accounts.snap").exists()
+        assert self.run_main(['balance', '--data', str(data)], capsys) == (0, "Current balance: 1003.00\n")
@@ -0,0 +1,114 @@
+import pytest
+import time
+from decimal import Decimal
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from mmap_store import HEADER_SIZE, MAX_MAPPED_ACCOUNT_ID, RECORD_SIZE, MappedAccountStore
+
+
+class TestMappedAccountStore:
+    """Unit tests for the memory-mapped fixed-width record store"""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        """Path of a fresh account file"""
+        return str(tmp_path / 'accounts.dat')
+
+    @pytest.mark.unit
+    def test_new_file_layout(self, path):
+        """A new file holds a header and capacity fixed-width records"""
+        with MappedAccountStore(path, capacity=100) as store:
+            assert store.capacity == 100
+            assert len(store) == 0
+            assert store.get_cents(5) == 100000
+        assert os.path.getsize(path) == HEADER_SIZE + 100 * RECORD_SIZE
+
+    @pytest.mark.unit
+    def test_write_in_place_and_reopen(self, path):
+        """Balances written in place survive closing and reopening the file"""
+        with MappedAccountStore(path, capacity=10) as store:
+            store.set_cents(3, 125075)
+            store.set_cents(0, 0)
+            store.set_cents(3, 99)
+            assert len(store) == 2
+
+        with MappedAccountStore(path) as store:
+            assert store.get_cents(3) == 99
+            assert store.get_cents(0) == 0
+            assert 3 in store and 4 not in store
+            assert list(store.items()) == [(0, 0), (3, 99)]
+
+    @pytest.mark.unit
+    def test_grows_for_large_account_ids(self, path):
+        """Writing past the capacity extends the file"""
+        with MappedAccountStore(path, capacity=4) as store:
+            store.set_cents(1, 10)
+            store.set_cents(1000, 20)
+            assert store.capacity >= 1001
+            assert store.get_cents(1) == 10
+            assert store.get_cents(1000) == 20
+        with pytest.raises(ValueError):
+            MappedAccountStore(path).set_cents(-1, 0)
+
+    @pytest.mark.unit
+    def test_account_id_cap(self, path):
+        """Ids past MAX_MAPPED_ACCOUNT_ID are refused instead of growing a huge sparse file"""
+        with MappedAccountStore(path, capacity=4) as store:
+            with pytest.raises(ValueError):
+                store.set_cents(4_000_000_000, 1)
+            with pytest.raises(ValueError):
+                store.set_cents(MAX_MAPPED_ACCOUNT_ID + 1, 1)
+            assert store.capacity == 4
+            assert store.get_cents(4_000_000_000) == 100000
+            assert 4_000_000_000 not in store
+        assert os.path.getsize(path) == HEADER_SIZE + 4 * RECORD_SIZE
+        with pytest.raises(ValueError):
+            MappedAccountStore(path + '.big', capacity=MAX_MAPPED_ACCOUNT_ID + 2)
+
+    @pytest.mark.unit
+    def test_flush_policy(self, path):
+        """flush_every triggers an msync after that many writes"""
+        with MappedAccountStore(path, capacity=10, flush_every=3) as store:
+            store.set_cents(1, 1)
+            store.set_cents(2, 2)
+            assert store._unflushed == 2
+            store.set_cents(3, 3)
+            assert store._unflushed == 0
+
+    @pytest.mark.unit
+    def test_rejects_foreign_file(self, tmp_path):
+        """Files without the mapped-store header are refused"""
+        path = tmp_path / 'account_data.json'
+        path.write_text('{"balance": "1000.00", "padding": "' + 'x' * 64 + '"}')
+        with pytest.raises(ValueError):
+            MappedAccountStore(str(path))
+
+    @pytest.mark.unit
+    def test_large_file_opens_without_reading(self, path):
+        """Opening maps the file - no time proportional to its size"""
+        MappedAccountStore(path, capacity=5_000_000).close()
+
+        start = time.perf_counter()
+        store = MappedAccountStore(path)
+        elapsed = time.perf_counter() - start
+
+        assert store.capacity == 5_000_000
+        assert store.get_cents(4_999_999) == 100000
+        store.close()
+        assert elapsed < 0.05
+
+    @pytest.mark.integration
+    def test_data_program_backend(self, path):
+        """DataProgram reads and writes through the mapped records"""
+        data_program = DataProgram(store=MappedAccountStore(path))
+        data_program.execute_operation('write', Decimal('1250.75'))
+        data_program.execute_operation('write', Decimal('42.00'), 9)
+        data_program.close()
+
+        reopened = DataProgram(store=MappedAccountStore(path))
+        assert reopened.storage_balance == Decimal('1250.75')
+        assert reopened.execute_operation('read', Decimal('0.00'), 9) == Decimal('42.00')
+        reopened.close()
@@ -0,0 +1,148 @@
+import pytest
+import random
+from decimal import Decimal
+from unittest.mock import patch
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from money import (
+    AmountError, MALFORMED, NEGATIVE, OVER_LIMIT,
+    format_cents, parse_amount, to_cents, to_decimal,
+)
+from operations import Operations
+
+# Inputs where the rounding or validation rules are easy to get wrong
+EDGE_CASES = [
+    '0', '0.00', '0.004', '0.005', '0.0049999', '0.015', '0.025', '1.005', '2.675',
+    '999999.99', '999999.990', '999999.991', '999999.994', '999999.985', '1000000',
+    '-0.001', '-1', '-0.005', '+5', ' 12.5 ', '.5', '5.', '.', '', ' ', 'abc', '1.2.3',
+    '1e3', '1E-3', '9.99999e5', '1_000.50', 'NaN', 'Infinity', '-Infinity', '12,50',
+    '00012.30', '123.456789', '0.995', '99.995', '1' * 7,
+]
+
+
+def reference_amount(text):
+    """Current Decimal path - Operations._get_amount_input with one console entry"""
+    ops = Operations()
+    with patch('builtins.input', side_effect=[text, '0']), patch('builtins.print') as mock_print:
+        amount = ops._get_amount_input('')
+    if mock_print.call_args_list:
+        # First entry was refused; the fallback '0' ended the loop
+        return mock_print.call_args_list[0].args[0]
+    return amount
+
+
+def random_amount_text(rng):
+    """Random amount literal with 0 to 6 decimals"""
+    units = rng.choice([0, 1, 9, 99, 999999, rng.randint(0, 1200000)])
+    decimals = rng.randint(0, 6)
+    if decimals == 0:
+        return str(units)
+    fraction = ''.join(rng.choice('0123456789') for _ in range(decimals))
+    return f'{units}.{fraction}'
+
+
+class TestMoney:
+    """Unit tests for the integer-cents fixed-point engine"""
+
+    @pytest.mark.unit
+    def test_to_decimal_round_trip(self):
+        """Cents convert to Decimals with exactly 2 decimal places"""
+        assert to_decimal(100000) == Decimal('1000.00')
+        assert str(to_decimal(100000)) == '1000.00'
+        assert str(to_decimal(5)) == '0.05'
+        assert to_cents(Decimal('1250.75')) == 125075
+
+    @pytest.mark.unit
+    def test_to_cents_rounds_half_up(self):
+        """to_cents rounds like _format_currency"""
+        assert to_cents(Decimal('123.456')) == 12346
+        assert to_cents(Decimal('123.454')) == 12345
+        assert to_cents(Decimal('0.005')) == 1
+
+    @pytest.mark.unit
+    def test_format_cents(self):
+        """Display strings match str() of the quantized Decimal"""
+        for cents in (0, 1, 99, 100, 100000, 99999999, 100099999):
+            assert format_cents(cents) == str(to_decimal(cents))
+        assert format_cents(-150) == '-1.50'
+
+    @pytest.mark.unit
+    def test_parse_amount_errors(self):
+        """Invalid amounts report the same reason as the console prompt"""
+        for text, reason in (('-1', NEGATIVE), ('1000000', OVER_LIMIT), ('abc', MALFORMED)):
+            with pytest.raises(AmountError) as excinfo:
+                parse_amount(text)
+            assert excinfo.value.reason == reason
+
+    @pytest.mark.unit
+    def test_parse_amount_non_string_inputs(self):
+        """Decimal, int and float amounts are accepted like Decimal(str(value))"""
+        assert parse_amount(Decimal('10.005')) == 1001
+        assert parse_amount(7) == 700
+        assert parse_amount(2.5) == 250
+        with pytest.raises(AmountError):
+            parse_amount(True)
+
+
+class TestMoneyDifferential:
+    """Differential tests - integer cents against the current Decimal path"""
+
+    def assert_identical(self, text):
+        expected = reference_amount(text)
+        try:
+            actual = to_decimal(parse_amount(text))
+        except AmountError as e:
+            actual = e.reason
+            expected = expected.split(' Please')[0] if isinstance(expected, str) else expected
+            if expected.startswith('Invalid amount format'):
+                expected = MALFORMED
+            assert actual == expected, text
+            return
+
+        assert isinstance(expected, Decimal), (text, expected)
+        if expected.is_zero():
+            # Decimal keeps the sign of '-0'; a balance cannot tell them apart
+            assert actual == expected, text
+        else:
+            assert actual.as_tuple() == expected.as_tuple(), text
+
+    @pytest.mark.unit
+    def test_edge_cases_identical(self):
+        """Edge-case literals give bit-identical amounts or the same rejection"""
+        for text in EDGE_CASES:
+            self.assert_identical(text)
+
+    @pytest.mark.unit
+    def test_random_amounts_identical(self):
+        """Random literals with more than 2 decimals round identically"""
+        rng = random.Random(20241018)
+        for _ in range(2000):
+            self.assert_identical(random_amount_text(rng))
+
+    @pytest.mark.integration
+    def test_random_sessions_identical(self):
+        """Batch cents engine ends every step on the interactive Decimal balance"""
+        rng = random.Random(42)
+        for _ in range(20):
+            transactions = [
+                (rng.choice(['CREDIT', 'DEBIT ']), random_amount_text(rng))
+                for _ in range(100)
+            ]
+            # Keep amounts within the limit so the console loop never re-prompts
+            transactions = [(op, amount) for op, amount in transactions if Decimal(amount) <= Decimal('999999.99')]
+
+            interactive = Operations()
+            expected = []
+            with patch('builtins.input', side_effect=[amount for _, amount in transactions]), \
+                    patch('builtins.print'):
+                for op, _ in transactions:
+                    interactive.execute_operation(op)
+                    expected.append(interactive.data_program.get_current_balance())
+
+            batch = Operations()
+            actual = [to_decimal(balance) for _, _, _, balance in batch.iter_batch(transactions)]
+
+            assert [b.as_tuple() for b in actual] == [b.as_tuple() for b in expected]
+            assert batch.final_balance == interactive.data_program.get_current_balance()
@@ -5,7 +5,7 @@ import sys
 import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from operations import Operations
+from operations import Operations, STATUS_ACCEPTED, STATUS_REJECTED, STATUS_INVALID
 
 
 class TestOperations:
@@ -217,3 +217,89 @@ class TestOperations:
         
         captured = capsys.readouterr()
         assert "Amount exceeds maximum limit" in captured.out
+
+
+class TestBatchOperations:
+    """Unit tests for the non-interactive batch API"""
+
+    @pytest.fixture
+    def operations(self):
+        """Create Operations instance with a real DataProgram"""
+        return Operations()
+
+    @pytest.mark.unit
+    def test_apply_batch_credit_and_debit(self, operations):
+        """Batch credit then debit updates DataProgram once"""
+        batch = operations.apply_batch([('CREDIT', '250.50'), ('DEBIT ', Decimal('200.00'))])
+
+        assert batch['results'] == [
+            ('CREDIT', 25050, STATUS_ACCEPTED, 125050),
+            ('DEBIT', 20000, STATUS_ACCEPTED, 105050),
+        ]
+        assert batch['summary']['accepted'] == 2
+        assert batch['summary']['final_balance'] == Decimal('1050.50')
+        assert operations.data_program.get_current_balance() == Decimal('1050.50')
+
+    @pytest.mark.unit
+    def test_apply_batch_insufficient_funds(self, operations):
+        """Debits larger than the balance are rejected and leave it unchanged"""
+        batch = operations.apply_batch([('DEBIT ', '1500.00'), ('DEBIT ', '1000.00')])
+
+        assert batch['results'][0][2] == STATUS_REJECTED
+        assert batch['results'][0][3] == 100000
+        assert batch['results'][1][2] == STATUS_ACCEPTED
+        assert batch['summary']['rejected'] == 1
+        assert batch['summary']['final_balance'] == Decimal('0.00')
+
+    @pytest.mark.unit
+    def test_apply_batch_invalid_items(self, operations):
+        """Negative, over-limit, malformed amounts and unknown operations are invalid"""
+        batch = operations.apply_batch([
+            ('CREDIT', '-1'),
+            ('CREDIT', '1000000.00'),
+            ('DEBIT ', 'abc'),
+            ('REFUND', '10.00'),
+            (5, '10.00'),
+            (None, None),
+            (['CREDIT'], '10.00'),
+            ('CREDIT', '999999.99'),
+        ])
+
+        statuses = [status for _, _, status, _ in batch['results']]
+        assert statuses == [STATUS_INVALID] * 7 + [STATUS_ACCEPTED]
+        assert batch['summary']['invalid'] == 7
+        assert batch['summary']['final_balance'] == Decimal('1000999.99')
+
+    @pytest.mark.unit
+    def test_apply_batch_rounding(self, operations):
+        """Amounts are rounded ROUND_HALF_UP like _get_amount_input"""
+        batch = operations.apply_batch([('CREDIT', '0.005'), ('CREDIT', '0.004'), ('TOTAL ', None)])
+
+        assert batch['results'][0][1] == 1
+        assert batch['results'][1][1] == 0
+        assert batch['results'][2] == ('TOTAL', None, STATUS_ACCEPTED, 100001)
+        assert batch['summary']['total_credited'] == Decimal('0.01')
+
+    @pytest.mark.unit
+    def test_apply_batch_matches_interactive_path(self, operations, capsys):
+        """Batch results match the interactive CREDIT/DEBIT sequence"""
+        amounts = ['500.25', '150.75', '2000.00', '123.456']
+        operations_list = ['CREDIT', 'DEBIT ', 'DEBIT ', 'CREDIT']
+
+        interactive = Operations()
+        with patch('builtins.input', side_effect=amounts):
+            for op in operations_list:
+                interactive.execute_operation(op)
+
+        batch = operations.apply_batch(zip(operations_list, amounts))
+
+        assert batch['summary']['final_balance'] == interactive.data_program.get_current_balance()
+
+    @pytest.mark.unit
+    def test_apply_batch_empty(self, operations):
+        """Empty batch leaves the balance untouched"""
+        batch = operations.apply_batch([])
+
+        assert batch['results'] == []
+        assert batch['summary']['count'] == 0
+        assert batch['summary']['final_balance'] == Decimal('1000.00')
@@ -0,0 +1,102 @@
+import pytest
+import subprocess
+from unittest.mock import patch
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from replay import ScriptedInput, fuzz, model_session, replay_session, replay_sessions
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+SESSION = ['1', '2', '100.00', '3', 'abc', '50.00', '3', '99999.00', '7', '1', '4']
+
+
+class TestReplaySession:
+    """Test cases for replaying recorded sessions"""
+
+    @pytest.mark.integration
+    def test_quiet_replay(self):
+        """A session replays to its results and final balance"""
+        result = replay_session(SESSION)
+
+        assert result["balance_cents"] == 105000
+        assert result["exited"] is True
+        assert result["consumed"] == len(SESSION)
+        assert result["output"].splitlines() == [
+            "Current balance: 1000.00",
+            "Amount credited. New balance: 1100.00",
+            "Invalid amount format. Please enter a valid number.",
+            "Amount debited. New balance: 1050.00",
+            "Insufficient funds for this debit.",
+            "Invalid choice, please select 1-4.",
+            "Current balance: 1050.00",
+            "Exiting the program. Goodbye!",
+        ]
+
+    @pytest.mark.integration
+    def test_does_not_use_builtin_input(self):
+        """Replay never goes through input()"""
+        with patch('builtins.input', side_effect=AssertionError("input() called")):
+            assert replay_session(SESSION, quiet=False)["exited"] is True
+
+    @pytest.mark.integration
+    def test_transcript_matches_piped_run(self):
+        """The full-menu transcript is the stdout of the same piped session"""
+        piped = subprocess.run(
+            [sys.executable, "main.py", "--no-quiet"],
+            cwd=APP_DIR,
+            input="".join(line + "\n" for line in SESSION),
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+        assert replay_session(SESSION, quiet=False)["output"] == piped.stdout
+
+    @pytest.mark.unit
+    def test_end_of_input(self):
+        """Running out of lines ends the session like end of stdin"""
+        result = replay_session(['2', '10.00', '3'])
+
+        assert result["exited"] is False
+        assert result["balance_cents"] == 101000
+        assert result["output"].splitlines()[-1] == "Error processing DEBIT operation: "
+
+    @pytest.mark.unit
+    def test_scripted_input_shows_prompts(self):
+        """Prompts go to the output stream, lines come from the script"""
+        written = []
+
+        class Output:
+            write = written.append
+
+        source = ScriptedInput(['1'], Output())
+        assert source("Enter: ") == '1'
+        with pytest.raises(EOFError):
+            source("")
+        assert written == ["Enter: "]
+        assert source.consumed == 1
+
+
+class TestReplaySessions:
+    """Test cases for parallel replay and fuzzing"""
+
+    @pytest.mark.integration
+    def test_pool_matches_in_process(self):
+        """Results come back in session order whichever way they run"""
+        sessions = [SESSION[:length] for length in range(len(SESSION) + 1)] * 5
+        in_process = replay_sessions(sessions, processes=1)
+        pooled = replay_sessions(sessions, processes=2, chunk_size=7)
+
+        assert pooled == in_process
+        assert in_process[-1] == replay_session(SESSION)
+
+    @pytest.mark.unit
+    def test_model_matches_replay(self):
+        """The state machine model agrees with a known session"""
+        assert model_session(SESSION) == replay_session(SESSION)
+
+    @pytest.mark.integration
+    def test_fuzz_menu(self):
+        """Random sessions behave exactly like the model"""
+        assert fuzz(500, seed=1, processes=1) == []
@@ -0,0 +1,175 @@
+import pytest
+import asyncio
+import socket
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from operations import Operations
+from server import WRITE_HIGH_WATER, WRITE_LOW_WATER, LedgerProtocol, handle_request, start_server
+
+
+class TestServer:
+    """Test cases for the asyncio TCP front end"""
+
+    @pytest.fixture
+    def operations(self):
+        """Create operations over a fresh data program"""
+        return Operations(DataProgram())
+
+    @pytest.mark.unit
+    def test_handle_request_operations(self, operations):
+        """Requests map onto TOTAL/CREDIT/DEBIT semantics"""
+        assert handle_request(operations, b"TOTAL") == b"ACCEPTED 1000.00\n"
+        assert handle_request(operations, b"CREDIT 250.50") == b"ACCEPTED 1250.50\n"
+        assert handle_request(operations, b"debit 50.50") == b"ACCEPTED 1200.00\n"
+        assert handle_request(operations, b"DEBIT 5000.00") == b"REJECTED 1200.00\n"
+        assert handle_request(operations, b"CREDIT 1000000.00") == b"INVALID 1200.00\n"
+        assert handle_request(operations, b"CREDIT -1") == b"INVALID 1200.00\n"
+
+    @pytest.mark.unit
+    def test_handle_request_accounts(self, operations):
+        """A trailing account id selects the account; the default is STORAGE-BALANCE"""
+        assert handle_request(operations, b"CREDIT 10.00 42") == b"ACCEPTED 1010.00\n"
+        assert handle_request(operations, b"TOTAL 42") == b"ACCEPTED 1010.00\n"
+        assert handle_request(operations, b"TOTAL") == b"ACCEPTED 1000.00\n"
+
+    @pytest.mark.unit
+    def test_handle_request_idempotency_key(self, operations):
+        """A retried request with the same key gets the first response again"""
+        assert handle_request(operations, b"CREDIT 10.00 KEY=a1") == b"ACCEPTED 1010.00\n"
+        assert handle_request(operations, b"CREDIT 10.00 KEY=a1") == b"ACCEPTED 1010.00\n"
+        assert handle_request(operations, b"DEBIT 5.00 7 key=b2") == b"ACCEPTED 995.00\n"
+        assert handle_request(operations, b"DEBIT 5.00 7 key=b2") == b"ACCEPTED 995.00\n"
+        assert handle_request(operations, b"DEBIT 1.00 KEY=a1") == b"INVALID 1010.00\n"
+        assert handle_request(operations, b"CREDIT 1.00 KEY=") == b"ERROR Empty idempotency key\n"
+        assert handle_request(operations, b"TOTAL 7") == b"ACCEPTED 995.00\n"
+
+    @pytest.mark.unit
+    def test_handle_request_hot_account(self, operations):
+        """A credit buffered for a hot account has no balance yet"""
+        operations.enable_hot_accounts([9])
+        assert handle_request(operations, b"CREDIT 10.00 9") == b"ACCEPTED PENDING\n"
+        assert handle_request(operations, b"TOTAL 9") == b"ACCEPTED 1010.00\n"
+
+    @pytest.mark.unit
+    def test_handle_request_errors(self, operations):
+        """Malformed requests get an ERROR line and change nothing"""
+        assert handle_request(operations, b"") == b"ERROR Empty request\n"
+        assert handle_request(operations, b"TRANSFER 1") == b"ERROR Unknown operation\n"
+        assert handle_request(operations, b"CREDIT") == b"ERROR Wrong number of arguments\n"
+        assert handle_request(operations, b"TOTAL 1 2") == b"ERROR Wrong number of arguments\n"
+        assert handle_request(operations, b"CREDIT 1.00 abc") == b"ERROR Invalid account\n"
+        assert handle_request(operations, b"CREDIT 1.00 -3") == b"ERROR Invalid account\n"
+        assert operations.data_program.read_cents() == 100000
+
+    @pytest.mark.integration
+    def test_pipelined_requests_over_tcp(self, operations):
+        """Many requests in flight on one connection come back in order"""
+
+        async def session():
+            server = await start_server(operations, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                reader, writer = await asyncio.open_connection("127.0.0.1", port)
+                # Split a request across writes to exercise line buffering
+                writer.write(b"CREDIT 1.00\n" * 100 + b"DEBIT 10")
+                await writer.drain()
+                writer.write(b"0.00\nTOTAL\n")
+                lines = [await reader.readline() for _ in range(102)]
+                writer.close()
+                await writer.wait_closed()
+            return lines
+
+        lines = asyncio.run(session())
+
+        assert lines[0] == b"ACCEPTED 1001.00\n"
+        assert lines[99] == b"ACCEPTED 1100.00\n"
+        assert lines[100] == b"ACCEPTED 1000.00\n"
+        assert lines[101] == b"ACCEPTED 1000.00\n"
+
+    @pytest.mark.unit
+    def test_slow_reader_pauses_reading(self, operations):
+        """Unsent responses past the high-water mark stop reading from that client"""
+
+        class Transport:
+            reading = True
+
+            def set_write_buffer_limits(self, high, low):
+                self.limits = (high, low)
+
+            def pause_reading(self):
+                self.reading = False
+
+            def resume_reading(self):
+                self.reading = True
+
+            def is_closing(self):
+                return False
+
+        transport = Transport()
+        protocol = LedgerProtocol(operations)
+        protocol.connection_made(transport)
+        assert transport.limits == (WRITE_HIGH_WATER, WRITE_LOW_WATER)
+        protocol.pause_writing()
+        assert not transport.reading
+        protocol.resume_writing()
+        assert transport.reading
+
+    @pytest.mark.integration
+    def test_client_reading_late_gets_every_response(self, operations, monkeypatch):
+        """A client that floods requests before reading is paused, then served in full"""
+        pauses = []
+        pause_writing = LedgerProtocol.pause_writing
+
+        def counted_pause_writing(protocol):
+            pauses.append(protocol)
+            pause_writing(protocol)
+
+        monkeypatch.setattr(LedgerProtocol, "pause_writing", counted_pause_writing)
+        requests = 400000
+
+        async def session():
+            server = await start_server(operations, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                # A small receive window, so responses back up on the server
+                sock = socket.socket()
+                sock.setsockopt(socket.SOL_SOCKET, socket.SO_RCVBUF, 4096)
+                sock.connect(("127.0.0.1", port))
+                reader, writer = await asyncio.open_connection(sock=sock)
+                writer.transport.set_write_buffer_limits(1 << 24)
+                writer.write(b"TOTAL\n" * requests)
+                await asyncio.sleep(0.3)
+                responses = await reader.readexactly(requests * len(b"ACCEPTED 1000.00\n"))
+                writer.close()
+                await writer.wait_closed()
+            return responses
+
+        responses = asyncio.run(session())
+
+        assert pauses
+        assert responses == b"ACCEPTED 1000.00\n" * requests
+
+    @pytest.mark.integration
+    def test_concurrent_clients_share_balances(self, operations):
+        """Credits from several connections all land on the shared account"""
+
+        async def client(port):
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            writer.write(b"CREDIT 1.00 9\n" * 50)
+            for _ in range(50):
+                await reader.readline()
+            writer.close()
+            await writer.wait_closed()
+
+        async def session():
+            server = await start_server(operations, "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+            async with server:
+                await asyncio.gather(*[client(port) for _ in range(8)])
+
+        asyncio.run(session())
+
+        assert operations.data_program.read_cents(9) == 100000 + 8 * 50 * 100
@@ -0,0 +1,96 @@
+import pytest
+import random
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from operations import Operations, STATUS_ACCEPTED, STATUS_INVALID, STATUS_REJECTED
+from sharding import ShardedLedger, _apply_all, shard_for
+
+
+def make_transactions(count, accounts, seed):
+    """Random credits, debits and inquiries over a few accounts"""
+    rng = random.Random(seed)
+    return [
+        (rng.choice(("TOTAL ", "CREDIT", "DEBIT ", "DEBIT ")), f"{rng.randrange(0, 80000) / 100:.2f}", rng.randrange(accounts))
+        for _ in range(count)
+    ]
+
+
+class TestShardedLedger:
+    """Test cases for the process-sharded ledger"""
+
+    @pytest.fixture
+    def ledger(self):
+        """Start a ledger with three shard processes"""
+        with ShardedLedger(shards=3) as ledger:
+            yield ledger
+
+    @pytest.mark.unit
+    def test_shard_for_spreads_consecutive_ids(self):
+        """Consecutive account ids are spread over every shard"""
+        counts = [0] * 4
+        for account_id in range(4000):
+            counts[shard_for(account_id, 4)] += 1
+        assert all(900 < count < 1100 for count in counts)
+        assert shard_for(12345, 4) == shard_for(12345, 4)
+
+    @pytest.mark.integration
+    def test_matches_single_process_operations(self, ledger):
+        """Sharded results equal applying the same transactions in one process"""
+        reference = Operations(DataProgram())
+        for seed in range(3):
+            transactions = make_transactions(2000, 50, seed)
+            expected = [reference.apply_transaction(*transaction) for transaction in transactions]
+            assert ledger.apply_batch(transactions) == expected
+
+        assert list(ledger.items()) == list(reference.data_program.store.items())
+        assert ledger.read_cents(7) == reference.data_program.read_cents(7)
+
+    @pytest.mark.integration
+    def test_per_account_order_is_preserved(self, ledger):
+        """A debit submitted after a credit sees that credit"""
+        results = ledger.apply_batch([
+            ("DEBIT", "1500.00", 5),
+            ("CREDIT", "600.00", 5),
+            ("DEBIT", "1500.00", 5),
+        ])
+        assert results[0][2] == STATUS_REJECTED
+        assert [result[3] for result in results] == [100000, 160000, 10000]
+
+    @pytest.mark.integration
+    def test_invalid_rows_do_not_stop_shards(self, ledger):
+        """Bad rows come back INVALID and the shards keep serving later batches"""
+        results = ledger.apply_batch([
+            ("CREDIT", "10.00", -1),
+            ("CREDIT", "10.00", 2 ** 32),
+            ("CREDIT", "10.00", "7"),
+            (5, "10.00", 7),
+            ("CREDIT", "10.00", 7),
+        ])
+        assert [result[2] for result in results] == [STATUS_INVALID] * 4 + [STATUS_ACCEPTED]
+        assert results[0] == ("CREDIT", "10.00", STATUS_INVALID, None)
+
+        results = ledger.apply_batch([("CREDIT", "1.00", account_id) for account_id in range(10)])
+        assert [result[2] for result in results] == [STATUS_ACCEPTED] * 10
+        assert ledger.read_cents(7) == 101100
+
+    @pytest.mark.unit
+    def test_failing_transaction_is_invalid(self):
+        """A transaction that raises inside a shard is INVALID, the rest still apply"""
+        def apply_transaction(operation, amount, account_id):
+            if account_id == 2:
+                raise RuntimeError("store failure")
+            return operation, amount, STATUS_ACCEPTED, 0
+
+        results = _apply_all(apply_transaction, [("CREDIT", "1", 1), ("CREDIT", "1", 2), ("CREDIT", "1", 3)])
+        assert [result[2] for result in results] == [STATUS_ACCEPTED, STATUS_INVALID, STATUS_ACCEPTED]
+
+    @pytest.mark.integration
+    def test_persistent_shards_recover(self, tmp_path):
+        """Shards with a directory keep their balances across restarts"""
+        with ShardedLedger(shards=2, directory=str(tmp_path)) as ledger:
+            ledger.apply_batch([("CREDIT", "10.00", account_id) for account_id in range(20)])
+        with ShardedLedger(shards=2, directory=str(tmp_path)) as ledger:
+            assert [ledger.read_cents(account_id) for account_id in range(20)] == [101000] * 20
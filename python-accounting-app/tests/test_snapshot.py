@@ -0,0 +1,169 @@
+import pytest
+import threading
+from array import array
+from decimal import Decimal
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from account_store import AccountStore
+from snapshot import Checkpointer, open_data_program, read_snapshot, recover_store, write_snapshot
+from wal import HEADER_SIZE
+
+
+class TestSnapshot:
+    """Unit and integration tests for snapshots and log-tail replay"""
+
+    @pytest.fixture
+    def paths(self, tmp_path):
+        """Snapshot and log paths in a temporary directory"""
+        return str(tmp_path / 'balances.snap'), str(tmp_path / 'balances.wal')
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('mapped', [False, True])
+    def test_round_trip(self, paths, mapped):
+        """Snapshots read back the same arrays and log offset"""
+        snapshot_path, _ = paths
+        write_snapshot(snapshot_path, array('I', [1, 5, 9]), array('q', [100, -5, 99999999]), 1234)
+
+        ids, balances, wal_offset = read_snapshot(snapshot_path, mapped=mapped)
+
+        assert list(ids) == [1, 5, 9]
+        assert list(balances) == [100, -5, 99999999]
+        assert wal_offset == 1234
+        assert not os.path.exists(snapshot_path + '.tmp')
+
+    @pytest.mark.unit
+    def test_mapped_snapshot_is_copy_on_write(self, paths):
+        """Writes to a mapped snapshot never reach the file"""
+        snapshot_path, _ = paths
+        write_snapshot(snapshot_path, array('I', [1, 2]), array('q', [10, 20]))
+
+        store = AccountStore()
+        store.load(*read_snapshot(snapshot_path, mapped=True)[:2])
+        store.set_cents(2, 25)
+        store.set_cents(3, 30)
+
+        assert [store.get_cents(i) for i in (1, 2, 3)] == [10, 25, 30]
+        assert list(store.items()) == [(1, 10), (2, 25), (3, 30)]
+        assert list(read_snapshot(snapshot_path)[1]) == [10, 20]
+
+    @pytest.mark.unit
+    def test_invalid_snapshot(self, paths):
+        """Corrupt and truncated snapshots are refused"""
+        snapshot_path, _ = paths
+        write_snapshot(snapshot_path, array('I', [1, 2]), array('q', [10, 20]))
+        with open(snapshot_path, 'r+b') as f:
+            f.truncate(os.path.getsize(snapshot_path) - 4)
+        with pytest.raises(ValueError):
+            read_snapshot(snapshot_path)
+
+        with open(snapshot_path, 'wb') as f:
+            f.write(b'{"balance": "1000.00"}' + bytes(32))
+        with pytest.raises(ValueError):
+            read_snapshot(snapshot_path)
+
+    @pytest.mark.integration
+    def test_recover_from_snapshot_and_log_tail(self, paths):
+        """Startup loads the snapshot and replays only later log records"""
+        snapshot_path, wal_path = paths
+        data_program = open_data_program(snapshot_path, wal_path, sync_every=0)
+        data_program.write_cents(111, 1)
+        data_program.write_cents(222, 2)
+
+        checkpointer = Checkpointer(data_program, snapshot_path)
+        offset = checkpointer.checkpoint()
+        assert offset == HEADER_SIZE + 2 * 16
+
+        data_program.write_cents(333, 1)
+        data_program.execute_operation('write', Decimal('1234.56'))
+        data_program.close()
+
+        restored = open_data_program(snapshot_path, wal_path)
+        assert restored.read_cents(1) == 333
+        assert restored.read_cents(2) == 222
+        assert restored.storage_balance == Decimal('1234.56')
+        restored.close()
+
+    @pytest.mark.integration
+    def test_recover_without_snapshot(self, paths):
+        """A missing snapshot falls back to a full log replay"""
+        snapshot_path, wal_path = paths
+        assert len(recover_store(snapshot_path, wal_path)) == 0
+
+        data_program = open_data_program(snapshot_path, wal_path)
+        data_program.write_cents(5, 42)
+        data_program.close()
+
+        assert recover_store(snapshot_path, wal_path).get_cents(42) == 5
+
+    @pytest.mark.integration
+    def test_background_checkpoint_during_writes(self, paths):
+        """Checkpoints taken while writers run still recover the exact final state"""
+        snapshot_path, wal_path = paths
+        data_program = open_data_program(snapshot_path, wal_path, sync_every=0)
+        checkpointer = Checkpointer(data_program, snapshot_path, interval=0.001)
+        checkpointer.start()
+
+        def writer(base):
+            for i in range(3000):
+                data_program.write_cents(i, base + i % 50)
+
+        threads = [threading.Thread(target=writer, args=(n * 100,)) for n in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        checkpointer.stop(final_checkpoint=False)
+        data_program.close()
+
+        expected = dict(data_program.store.items())
+        assert checkpointer.checkpoint_count >= 1
+        assert dict(recover_store(snapshot_path, wal_path).items()) == expected
+
+    @pytest.mark.integration
+    def test_checkpoint_covers_only_synced_records(self, paths):
+        """A crash after a checkpoint loses no record the snapshot offset covers"""
+        snapshot_path, wal_path = paths
+        data_program = open_data_program(snapshot_path, wal_path, sync_every=100)
+        data_program.write_cents(111, 1)
+        data_program.write_cents(222, 2)
+        offset = Checkpointer(data_program, snapshot_path).checkpoint()
+        assert os.path.getsize(wal_path) >= offset
+
+        # Crash with an unsynced record: the log keeps only its synced part
+        data_program.write_cents(333, 1)
+        os.truncate(wal_path, offset)
+
+        restored = open_data_program(snapshot_path, wal_path, sync_every=100)
+        assert (restored.read_cents(1), restored.read_cents(2)) == (111, 222)
+        restored.write_cents(444, 2)
+        restored.close()
+
+        restored = open_data_program(snapshot_path, wal_path)
+        assert (restored.read_cents(1), restored.read_cents(2)) == (111, 444)
+        restored.close()
+
+    @pytest.mark.integration
+    def test_log_shorter_than_snapshot_offset(self, paths):
+        """A log ending before the snapshot offset is restarted, not skipped"""
+        snapshot_path, wal_path = paths
+        data_program = open_data_program(snapshot_path, wal_path, sync_every=100)
+        data_program.write_cents(111, 1)
+        data_program.wal.sync()
+        synced = os.path.getsize(wal_path)
+        data_program.write_cents(222, 2)
+        # A snapshot covering records that never reached the disk
+        ids, balances = data_program.store.copy_arrays()
+        write_snapshot(snapshot_path, ids, balances, data_program.wal.tell())
+        os.truncate(wal_path, synced)
+
+        restored = open_data_program(snapshot_path, wal_path)
+        assert (restored.read_cents(1), restored.read_cents(2)) == (111, 222)
+        restored.write_cents(333, 1)
+        restored.close()
+
+        for _ in range(2):
+            restored = open_data_program(snapshot_path, wal_path)
+            assert (restored.read_cents(1), restored.read_cents(2)) == (333, 222)
+            restored.close()
@@ -0,0 +1,117 @@
+import pytest
+import sqlite3
+from decimal import Decimal
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from sqlite_store import SqliteAccountStore
+
+
+def committed(path):
+    """Balances visible to another connection, i.e. committed"""
+    connection = sqlite3.connect(path)
+    try:
+        return dict(connection.execute("SELECT id, cents FROM accounts"))
+    finally:
+        connection.close()
+
+
+class TestSqliteAccountStore:
+    """Unit tests for the SQLite balance store"""
+
+    @pytest.fixture
+    def path(self, tmp_path):
+        """Path of a fresh database"""
+        return str(tmp_path / 'accounts.db')
+
+    @pytest.mark.unit
+    def test_new_database(self, path):
+        """A new database is empty, in WAL mode, and reads the initial balance"""
+        with SqliteAccountStore(path) as store:
+            assert len(store) == 0
+            assert store.get_cents(5) == 100000
+            assert 5 not in store
+            mode = store._connection.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == 'wal'
+
+    @pytest.mark.unit
+    def test_write_and_reopen(self, path):
+        """Balances are stored as integer cents and survive reopening"""
+        with SqliteAccountStore(path) as store:
+            store.set_cents(3, 125075)
+            store.set_cents(0, 0)
+            store.set_cents(3, 99)
+            store.set_cents(0xFFFFFFFF, -5)
+
+        with SqliteAccountStore(path) as store:
+            assert store.get_cents(3) == 99
+            assert store.get_cents(0) == 0
+            assert 3 in store and 4 not in store
+            assert list(store.items()) == [(0, 0), (3, 99), (0xFFFFFFFF, -5)]
+            assert store.copy_arrays()[1].tolist() == [0, 99, -5]
+
+    @pytest.mark.unit
+    def test_writes_commit_in_batches(self, path):
+        """Writes are collected and committed batch_size at a time"""
+        with SqliteAccountStore(path, batch_size=3) as store:
+            store.set_cents(1, 10)
+            store.set_cents(2, 20)
+            # Collected writes are read back before they are committed
+            assert store.get_cents(1) == 10
+            assert 2 in store
+            assert committed(path) == {}
+
+            store.set_cents(3, 30)
+            assert committed(path) == {1: 10, 2: 20, 3: 30}
+
+            store.set_cents(1, 11)
+            store.flush()
+            assert committed(path)[1] == 11
+
+    @pytest.mark.unit
+    def test_close_commits_pending_writes(self, path):
+        """Closing commits a partial batch"""
+        store = SqliteAccountStore(path, batch_size=100)
+        store.set_cents(7, 700)
+        store.close()
+        store.close()
+        assert committed(path) == {7: 700}
+
+    @pytest.mark.unit
+    def test_set_many(self, path):
+        """set_many writes every balance in one transaction"""
+        with SqliteAccountStore(path, batch_size=1000) as store:
+            store.set_many([5, 1, 9], [50, 10, 90])
+            assert committed(path) == {1: 10, 5: 50, 9: 90}
+
+    @pytest.mark.unit
+    def test_invalid_account_ids(self, path):
+        """Out-of-range ids are rejected like AccountStore does"""
+        with SqliteAccountStore(path) as store:
+            with pytest.raises(ValueError):
+                store.set_cents(-1, 0)
+            with pytest.raises(TypeError):
+                store.set_cents('1', 0)
+            assert len(store) == 0
+
+
+class TestSqliteDataProgram:
+    """DataProgram running on the SQLite store"""
+
+    @pytest.mark.integration
+    def test_write_operations_persist(self, tmp_path):
+        """execute_operation writes reach the database once committed"""
+        path = str(tmp_path / 'accounts.db')
+        data_program = DataProgram(SqliteAccountStore(path, batch_size=10))
+        for i in range(25):
+            data_program.execute_operation('WRITE', Decimal('1.25') * i, account_id=i)
+        assert data_program.execute_operation('READ', 0, account_id=24) == Decimal('30.00')
+        assert len(committed(path)) == 20
+        data_program.close()
+
+        data_program = DataProgram(SqliteAccountStore(path))
+        assert data_program.read_cents(24) == 3000
+        assert data_program.get_current_balance() == Decimal('0.00')
+        data_program.close()
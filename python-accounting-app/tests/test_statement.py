@@ -0,0 +1,204 @@
+import pytest
+import io
+import json
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ledger import FileLedger, HistoryFile, Ledger
+from main import main
+from statement import StatementCursor, decode_token, encode_token, parse_timestamp, write_statement
+
+# 2024-01-01T00:00:00Z in ns
+DAY = 1704067200 * 10 ** 9
+
+
+def build(ledger, entries):
+    """Record entries credits of 1.00 into account 3, one second apart"""
+    for number in range(entries):
+        ledger.record(3, 100, 100000 + 100 * (number + 1), timestamp=DAY + number * 10 ** 9)
+    return ledger
+
+
+class TestHistoryFile:
+    """Test cases for the on-disk account history"""
+
+    @pytest.mark.unit
+    def test_same_queries_as_memory(self, tmp_path):
+        """HistoryFile answers every query like AccountHistory"""
+        memory = build(Ledger(), 50).history(3)
+        with FileLedger(str(tmp_path)) as ledger:
+            build(ledger, 50)
+        disk = FileLedger(str(tmp_path)).history(3)
+
+        assert len(disk) == 50
+        assert disk.entries() == memory.entries()
+        assert disk.span(DAY + 10 ** 10, DAY + 2 * 10 ** 10) == memory.span(DAY + 10 ** 10, DAY + 2 * 10 ** 10) == (10, 20)
+        for timestamp in (0, DAY, DAY + 1, DAY + 49 * 10 ** 9, 2 * DAY):
+            assert disk.balance_as_of(timestamp) == memory.balance_as_of(timestamp)
+
+    @pytest.mark.unit
+    def test_torn_record_dropped(self, tmp_path):
+        """A partial last record is ignored and overwritten by the next append"""
+        path = str(tmp_path / "3.hist")
+        history = HistoryFile(path)
+        history.append(10, 100, 100100)
+        history.close()
+        with open(path, "ab") as f:
+            f.write(b"\x01\x02\x03")
+
+        history = HistoryFile(path)
+        assert len(history) == 1
+        assert history.append(5, 200, 100300) == 10
+        history.close()
+        assert HistoryFile(path).entries() == [(10, 100, 100100), (10, 200, 100300)]
+
+
+class TestStatementCursor:
+    """Test cases for paginated statements"""
+
+    @pytest.mark.unit
+    def test_pages_cover_history_once(self):
+        """Following tokens page through every entry exactly once"""
+        ledger = build(Ledger(), 25)
+        seen = []
+        token = None
+        while True:
+            cursor = StatementCursor(ledger.history(3), 3, token=token)
+            entries, token = cursor.page(10)
+            seen.extend(entries)
+            if token is None:
+                break
+        assert seen == ledger.entries(3)
+
+    @pytest.mark.unit
+    def test_token_stable_across_appends(self):
+        """New transactions after a page are returned by the next page"""
+        ledger = build(Ledger(), 5)
+        entries, token = StatementCursor(ledger.history(3), 3).page(5)
+        assert token is None
+        cursor = StatementCursor(ledger.history(3), 3)
+        entries, token = cursor.page(3)
+
+        ledger.record(3, -50, 100450, timestamp=DAY + 10 ** 12)
+        rest, token = StatementCursor(ledger.history(3), 3, token=token).page(10)
+        assert entries + rest == ledger.entries(3)
+        assert token is None
+
+    @pytest.mark.unit
+    def test_time_range_bound_into_token(self):
+        """The end bound carries over to the next page"""
+        ledger = build(Ledger(), 30)
+        cursor = StatementCursor(ledger.history(3), 3, start=DAY + 5 * 10 ** 9, end=DAY + 15 * 10 ** 9)
+        first, token = cursor.page(4)
+        rest = list(StatementCursor(ledger.history(3), 3, token=token))
+        assert first + rest == ledger.entries(3, DAY + 5 * 10 ** 9, DAY + 15 * 10 ** 9)
+
+    @pytest.mark.unit
+    def test_invalid_tokens(self):
+        """Tokens for another account, another history or garbage are refused"""
+        ledger = build(Ledger(), 10)
+        _, token = StatementCursor(ledger.history(3), 3).page(4)
+
+        with pytest.raises(ValueError):
+            StatementCursor(ledger.history(3), 4, token=token)
+        with pytest.raises(ValueError):
+            StatementCursor(build(Ledger(), 2).history(3), 3, token=token)
+        with pytest.raises(ValueError):
+            StatementCursor(ledger.history(3), 3, token="not-a-token")
+        assert decode_token(encode_token(3, 4, None, 7)) == (3, 4, None, 7)
+
+    @pytest.mark.unit
+    def test_crafted_bounds_refused(self):
+        """A negative index, or an end bound before the resume point, is refused"""
+        ledger = build(Ledger(), 10)
+        history = ledger.history(3)
+        check = history.entry(3)[0]
+        assert StatementCursor(history, 3, token=encode_token(3, 4, check + 1, check)).index == 4
+
+        with pytest.raises(ValueError):
+            decode_token(encode_token(3, -2, None, 0))
+        with pytest.raises(ValueError):
+            StatementCursor(history, 3, token=encode_token(3, -2, None, 0))
+        with pytest.raises(ValueError):
+            StatementCursor(history, 3, token=encode_token(3, 4, check, check))
+        with pytest.raises(ValueError):
+            StatementCursor(history, 3, token=encode_token(3, 4, -5, check))
+
+
+class TestWriteStatement:
+    """Test cases for CSV and JSONL output"""
+
+    @pytest.mark.unit
+    def test_csv(self):
+        """CSV rows carry signed amounts and the running balance"""
+        ledger = Ledger()
+        ledger.record(0, 10000, 110000, timestamp=DAY + 5)
+        ledger.record(0, -2550, 107450, timestamp=DAY + 10 ** 9)
+        stream = io.StringIO()
+
+        assert write_statement(StatementCursor(ledger.history(0), 0), stream) == 2
+        assert stream.getvalue() == (
+            "timestamp,amount,balance\n"
+            "2024-01-01T00:00:00.000000005Z,100.00,1100.00\n"
+            "2024-01-01T00:00:01.000000000Z,-25.50,1074.50\n"
+        )
+
+    @pytest.mark.unit
+    def test_jsonl_in_chunks(self):
+        """Long statements are written chunk by chunk"""
+        ledger = build(Ledger(), 10000)
+        stream = io.StringIO()
+        assert write_statement(StatementCursor(ledger.history(3), 3), stream, "jsonl") == 10000
+
+        lines = stream.getvalue().splitlines()
+        assert len(lines) == 10000
+        assert json.loads(lines[-1]) == {
+            "timestamp": "2024-01-01T02:46:39.000000000Z",
+            "timestamp_ns": DAY + 9999 * 10 ** 9,
+            "amount": "1.00",
+            "balance": "11000.00",
+        }
+
+    @pytest.mark.unit
+    def test_parse_timestamp(self):
+        """Bounds accept ISO dates, date-times with offsets and raw ns"""
+        assert parse_timestamp("2024-01-01") == DAY
+        assert parse_timestamp("2024-01-01T01:00:00+01:00") == DAY
+        assert parse_timestamp("2024-01-01T00:00:00.5Z") == DAY + 5 * 10 ** 8
+        assert parse_timestamp(str(DAY + 1)) == DAY + 1
+
+
+class TestStatementCommand:
+    """Test cases for main.py statement"""
+
+    @pytest.mark.integration
+    def test_one_shot_history_statement(self, tmp_path, capsys):
+        """One-shot credits and debits show up in the statement, page by page"""
+        data = str(tmp_path)
+        for argv in (["credit", "100.00"], ["debit", "25.50"], ["debit", "5000.00"], ["credit", "1.00", "--account", "9"]):
+            with pytest.raises(SystemExit):
+                main(argv + ["--data", data])
+        capsys.readouterr()
+
+        with pytest.raises(SystemExit) as exit_info:
+            main(["statement", "--data", data, "--limit", "1"])
+        captured = capsys.readouterr()
+        assert exit_info.value.code == 0
+        assert captured.out.splitlines()[0] == "timestamp,amount,balance"
+        assert captured.out.splitlines()[1].endswith(",100.00,1100.00")
+        token = captured.err.split("--cursor ")[1].strip()
+
+        with pytest.raises(SystemExit):
+            main(["statement", "--data", data, "--cursor", token, "--format", "jsonl"])
+        captured = capsys.readouterr()
+        assert [json.loads(line)["amount"] for line in captured.out.splitlines()] == ["-25.50"]
+        assert captured.err == ""
+
+    @pytest.mark.integration
+    def test_bad_cursor(self, tmp_path, capsys):
+        """An invalid cursor exits with status 2"""
+        with pytest.raises(SystemExit) as exit_info:
+            main(["statement", "--data", str(tmp_path), "--cursor", "xyz"])
+        assert exit_info.value.code == 2
+        assert "Invalid statement cursor" in capsys.readouterr().err
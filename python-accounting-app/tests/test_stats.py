@@ -0,0 +1,148 @@
+import pytest
+import random
+import time
+from unittest.mock import patch
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from main import MainProgram
+from operations import Operations, STATUS_ACCEPTED, STATUS_REJECTED, STATUS_INVALID
+from stats import LatencyHistogram, bucket_high, bucket_index
+
+
+class TestLatencyHistogram:
+    """Unit tests for the log-linear latency histogram"""
+
+    @pytest.mark.unit
+    def test_buckets_cover_values(self):
+        """Every value lands in a bucket whose bounds contain it, within ~3%"""
+        rng = random.Random(3)
+        for value in list(range(2000)) + [rng.randrange(1 << 40) for _ in range(2000)]:
+            index = bucket_index(value)
+            assert bucket_high(index) >= value
+            assert index == 0 or bucket_high(index - 1) < value
+            assert bucket_high(index) - value <= value / 32 + 1
+
+    @pytest.mark.unit
+    def test_percentiles(self):
+        """Percentiles are accurate to the bucket precision"""
+        histogram = LatencyHistogram()
+        for value in range(1, 10001):
+            histogram.record(value * 1000)
+
+        summary = histogram.snapshot()
+        assert summary["count"] == 10000
+        assert summary["min_ns"] == 1000
+        assert summary["max_ns"] == 10000000
+        assert summary["mean_ns"] == 5000500
+        assert 5000000 <= summary["p50_ns"] <= 5000000 * 1.04
+        assert 9900000 <= summary["p99_ns"] <= 9900000 * 1.04
+        assert summary["p99.9_ns"] <= 10000000
+
+    @pytest.mark.unit
+    def test_merge(self):
+        """Merging histograms gives the same summary as recording into one"""
+        combined, first, second = LatencyHistogram(), LatencyHistogram(), LatencyHistogram()
+        for value in range(1, 3001):
+            combined.record(value * 997)
+            (first if value % 3 else second).record(value * 997)
+        first.merge(second)
+        first.merge(LatencyHistogram())
+        assert first.snapshot() == combined.snapshot()
+
+    @pytest.mark.unit
+    def test_empty_histogram(self):
+        """An empty histogram reports zeros"""
+        assert LatencyHistogram().snapshot()["p99_ns"] == 0
+
+
+class TestOperationStats:
+    """Test cases for statistics collected by Operations"""
+
+    @pytest.fixture
+    def operations(self):
+        """Create operations timing every execution"""
+        operations = Operations(DataProgram())
+        operations.enable_stats(sample_every=1)
+        return operations
+
+    @pytest.mark.unit
+    def test_disabled_by_default(self):
+        """Without enable_stats nothing is shadowed or collected"""
+        operations = Operations(DataProgram())
+        assert operations.stats() is None
+        assert operations.stats_report() == []
+        assert "execute_operation" not in vars(operations)
+
+    @pytest.mark.unit
+    def test_counters_and_histograms(self, operations, capsys):
+        """Outcomes are counted and each operation type gets its own histogram"""
+        with patch('builtins.input', side_effect=['100.00', '5000.00', '50.00']):
+            assert operations.execute_operation("TOTAL ") == STATUS_ACCEPTED
+            assert operations.execute_operation("CREDIT") == STATUS_ACCEPTED
+            assert operations.execute_operation("DEBIT ") == STATUS_REJECTED
+            assert operations.execute_operation("DEBIT ") == STATUS_ACCEPTED
+            assert operations.execute_operation("TRANSFER") == STATUS_INVALID
+
+        stats = operations.stats()
+        assert (stats["accepted"], stats["rejected"], stats["invalid"]) == (3, 1, 1)
+        assert stats["operations"]["TOTAL"]["count"] == 1
+        assert stats["operations"]["CREDIT"]["count"] == 1
+        assert stats["operations"]["DEBIT"]["count"] == 2
+        # TOTAL reads once, CREDIT reads and writes, DEBIT reads (and writes once)
+        assert stats["data_calls"] == 6
+        assert 0 < stats["data_ns"]
+
+    @pytest.mark.unit
+    def test_sampling(self, capsys):
+        """Counters see every operation, histograms one in sample_every"""
+        operations = Operations(DataProgram())
+        operations.enable_stats(sample_every=4)
+        for _ in range(20):
+            operations.execute_operation("TOTAL ")
+
+        stats = operations.stats()
+        assert stats["accepted"] == 20
+        assert stats["operations"]["TOTAL"]["count"] == 5
+        assert stats["data_calls"] == 5
+
+    @pytest.mark.unit
+    def test_user_input_time_excluded(self, operations, capsys):
+        """Time spent waiting for the amount is not part of the latency"""
+
+        def slow_input(prompt):
+            time.sleep(0.05)
+            return '10.00'
+
+        with patch('builtins.input', side_effect=slow_input):
+            operations.execute_operation("CREDIT")
+
+        assert operations.stats()["operations"]["CREDIT"]["max_ns"] < 50000000
+
+    @pytest.mark.unit
+    def test_disable_stats(self, operations):
+        """disable_stats restores the uninstrumented method"""
+        operations.disable_stats()
+        assert "execute_operation" not in vars(operations)
+        assert operations.stats() is None
+
+    @pytest.mark.integration
+    def test_menu_option(self, capsys):
+        """Option 5 shows statistics only when they are collected"""
+        main_program = MainProgram(collect_stats=True)
+        with patch('builtins.input', side_effect=['1', '5', '4']):
+            main_program.run()
+
+        output = capsys.readouterr().out
+        assert "5. View Statistics" in output
+        assert "TOTAL" in output
+        assert "Accepted: 1  Rejected: 0  Invalid: 0" in output
+
+        main_program = MainProgram()
+        with patch('builtins.input', side_effect=['5', '4']):
+            main_program.run()
+        output = capsys.readouterr().out
+        assert "View Statistics" not in output
+        assert "Invalid choice, please select 1-4." in output
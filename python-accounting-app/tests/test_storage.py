@@ -0,0 +1,134 @@
+import pytest
+import json
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from account_store import AccountStore
+from json_store import JsonAccountStore
+from mmap_store import MappedAccountStore
+from sqlite_store import SqliteAccountStore
+from storage import STORE_ENVIRONMENT, open_data_program, open_store
+
+
+class TestJsonAccountStore:
+    """Unit tests for the account_data.json store"""
+
+    @pytest.mark.unit
+    def test_reads_original_format(self, tmp_path):
+        """An account_data.json written by the old _save_data loads unchanged"""
+        path = tmp_path / 'account_data.json'
+        path.write_text(json.dumps({'balance': '1250.75', 'last_updated': '2024-01-01 00:00:00'}))
+        store = JsonAccountStore(str(path))
+        assert store.get_cents(0) == 125075
+        assert store.get_cents(1) == 100000
+        assert len(store) == 1
+
+    @pytest.mark.unit
+    def test_saves_every_write(self, tmp_path):
+        """Each write rewrites the file; account 0 stays under 'balance'"""
+        path = str(tmp_path / 'account_data.json')
+        store = JsonAccountStore(path)
+        store.set_cents(0, 90000)
+        store.set_cents(12, 505)
+        with open(path) as f:
+            data = json.load(f)
+        assert data['balance'] == '900.00'
+        assert data['accounts'] == {'12': '5.05'}
+        assert 'last_updated' in data
+
+        with JsonAccountStore(path) as reopened:
+            assert list(reopened.items()) == [(0, 90000), (12, 505)]
+
+    @pytest.mark.unit
+    def test_save_every(self, tmp_path):
+        """save_every defers the rewrite; close saves the rest"""
+        path = str(tmp_path / 'account_data.json')
+        store = JsonAccountStore(path, save_every=3)
+        store.set_cents(1, 1)
+        store.set_cents(2, 2)
+        assert not os.path.exists(path)
+        store.set_cents(3, 3)
+        assert os.path.exists(path)
+        store.set_cents(4, 4)
+        store.close()
+        assert JsonAccountStore(path).get_cents(4) == 4
+
+    @pytest.mark.unit
+    def test_rejects_other_documents(self, tmp_path):
+        """A JSON file that is not an object is refused"""
+        path = tmp_path / 'account_data.json'
+        path.write_text('[1, 2]')
+        with pytest.raises(ValueError):
+            JsonAccountStore(str(path))
+
+
+class TestOpenStore:
+    """Unit tests for choosing the store by spec"""
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('kind, store_class', [
+        ('json', JsonAccountStore),
+        ('sqlite', SqliteAccountStore),
+        ('mmap', MappedAccountStore),
+    ])
+    def test_file_backends(self, tmp_path, kind, store_class):
+        """Each spec opens its backend on the given path"""
+        store = open_store(f'{kind}:{tmp_path / "accounts"}')
+        try:
+            assert isinstance(store, store_class)
+            store.set_cents(3, 300)
+            assert store.get_cents(3) == 300
+        finally:
+            store.close()
+
+    @pytest.mark.unit
+    def test_default_is_memory(self, monkeypatch):
+        """Without a spec or $ACCOUNT_STORE the in-memory store is used"""
+        monkeypatch.delenv(STORE_ENVIRONMENT, raising=False)
+        assert isinstance(open_store(), AccountStore)
+        assert isinstance(open_store('memory'), AccountStore)
+
+    @pytest.mark.unit
+    def test_environment(self, monkeypatch, tmp_path):
+        """$ACCOUNT_STORE selects the store when no spec is given"""
+        monkeypatch.setenv(STORE_ENVIRONMENT, f'sqlite:{tmp_path / "accounts.db"}')
+        data_program = open_data_program()
+        assert isinstance(data_program.store, SqliteAccountStore)
+        data_program.close()
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize('spec', ['sqlite', 'json:', 'redis:/tmp/x', 'memory:/tmp/x'])
+    def test_invalid_specs(self, spec):
+        """Unknown backends and missing paths are reported"""
+        with pytest.raises(ValueError):
+            open_store(spec)
+
+
+class TestStoreSelection:
+    """The menu keeps balances in the store chosen with --store"""
+
+    @pytest.mark.integration
+    def test_menu_with_sqlite_store(self, tmp_path, monkeypatch, capsys):
+        """A credit made in one session is seen by the next"""
+        from main import main
+
+        spec = f'sqlite:{tmp_path / "accounts.db"}'
+        inputs = iter(['2', '250.00', '4'])
+        monkeypatch.setattr('builtins.input', lambda prompt='': next(inputs))
+        main(['--no-quiet', '--store', spec])
+
+        inputs = iter(['1', '4'])
+        main(['--no-quiet', '--store', spec])
+        assert 'Current balance: 1250.00' in capsys.readouterr().out
+
+    @pytest.mark.integration
+    def test_json_store_keeps_balance_format(self, tmp_path, monkeypatch):
+        """The json backend writes the old account_data.json layout"""
+        from main import main
+
+        path = tmp_path / 'account_data.json'
+        inputs = iter(['3', '100.00', '4'])
+        monkeypatch.setattr('builtins.input', lambda prompt='': next(inputs))
+        main(['--no-quiet', '--store', f'json:{path}'])
+        assert json.loads(path.read_text())['balance'] == '900.00'
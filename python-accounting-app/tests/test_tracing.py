@@ -0,0 +1,110 @@
+import pytest
+import json
+from unittest.mock import patch
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from main import MainProgram
+from operations import Operations
+from tracing import Tracer
+
+
+def read_traces(path):
+    """Load every trace from a JSONL file"""
+    with open(path, encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+class TestTracing:
+    """Test cases for sampled call-path tracing"""
+
+    @pytest.fixture
+    def trace_path(self, tmp_path):
+        """Trace file in a temporary directory"""
+        return str(tmp_path / "traces.jsonl")
+
+    @pytest.mark.integration
+    def test_credit_call_path(self, trace_path, capsys):
+        """A traced credit records every layer with correct nesting"""
+        with Tracer(trace_path, sample_rate=1.0) as tracer:
+            main_program = MainProgram(tracer=tracer)
+            with patch('builtins.input', side_effect=['2', 'abc', '100.00', '4']):
+                main_program.run()
+
+        traces = read_traces(trace_path)
+        assert [trace["attributes"]["choice"] for trace in traces] == [2, 4]
+
+        spans = traces[0]["spans"]
+        assert [(span["name"], span["depth"]) for span in spans] == [
+            ("MainProgram.process_choice", 0),
+            ("Operations.execute_operation", 1),
+            ("Operations._handle_credit_operation", 2),
+            ("Operations._validate_amount", 3),
+            ("Operations._validate_amount", 3),
+            ("DataProgram.execute_operation", 3),
+            ("DataProgram.execute_operation", 3),
+        ]
+        assert [span.get("arg") for span in spans[3:]] == ["abc", "100.00", "read", "write"]
+        assert traces[0]["duration_ns"] == spans[0]["duration_ns"]
+        for span in spans[1:]:
+            assert 0 <= span["start_ns"] <= traces[0]["duration_ns"]
+            assert span["duration_ns"] <= traces[0]["duration_ns"]
+
+        assert "Amount credited. New balance: 1100.00" in capsys.readouterr().out
+
+    @pytest.mark.integration
+    def test_wrappers_removed_after_trace(self, trace_path, capsys):
+        """Between sampled requests the original methods are back in place"""
+        with Tracer(trace_path, sample_rate=1.0) as tracer:
+            main_program = MainProgram(tracer=tracer)
+            main_program.process_choice(1)
+
+            operations = main_program.operations
+            for name in ("execute_operation", "_handle_total_operation", "_validate_amount"):
+                assert name not in vars(operations)
+            assert "execute_operation" not in vars(operations.data_program)
+
+    @pytest.mark.integration
+    def test_stats_variant_restored(self, trace_path, capsys):
+        """Tracing puts back an execute_operation shadowed by statistics"""
+        with Tracer(trace_path, sample_rate=1.0) as tracer:
+            main_program = MainProgram(collect_stats=True, tracer=tracer)
+            main_program.process_choice(1)
+            main_program.process_choice(1)
+
+        assert main_program.operations.stats()["accepted"] == 2
+        assert len(read_traces(trace_path)) == 2
+
+    @pytest.mark.unit
+    def test_sampling_rate(self, trace_path, capsys):
+        """Only about sample_rate of the requests are traced"""
+        with Tracer(trace_path, sample_rate=0.25, seed=5) as tracer:
+            main_program = MainProgram(tracer=tracer)
+            for _ in range(400):
+                main_program.process_choice(1)
+
+        assert 60 < tracer.traces_written < 140
+        assert len(read_traces(trace_path)) == tracer.traces_written
+
+    @pytest.mark.unit
+    def test_no_tracer_no_shadowing(self):
+        """Without a tracer process_choice is the plain method"""
+        assert "process_choice" not in vars(MainProgram())
+
+    @pytest.mark.unit
+    def test_trace_written_when_request_fails(self, trace_path):
+        """A request that raises is still recorded and unwrapped"""
+        operations = Operations()
+        with Tracer(trace_path, sample_rate=1.0) as tracer:
+            with pytest.raises(EOFError):
+                with patch('builtins.input', side_effect=EOFError):
+                    tracer.trace(
+                        "Operations._get_amount_input",
+                        operations._get_amount_input,
+                        ("Amount: ",),
+                        [(operations, "_validate_amount", "Operations._validate_amount")],
+                    )
+
+        assert "_validate_amount" not in vars(operations)
+        assert read_traces(trace_path)[0]["spans"][0]["name"] == "Operations._get_amount_input"
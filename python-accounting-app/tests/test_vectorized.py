@@ -0,0 +1,124 @@
+import pytest
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+np = pytest.importorskip("numpy")
+
+import vectorized
+from ledger import Ledger
+from money import format_cents
+from operations import Operations
+from vectorized import INVALID, REJECTED, STATUSES, apply_arrays
+
+
+def scalar_results(account_ids, cents, opening=None):
+    """Apply the same transactions one by one through apply_transaction"""
+    operations = Operations()
+    for account_id, balance in (opening or {}).items():
+        operations.data_program.write_cents(balance, account_id)
+    statuses, balances = [], []
+    for account_id, amount in zip(account_ids.tolist(), cents.tolist()):
+        operation = "CREDIT" if amount >= 0 else "DEBIT"
+        _, _, status, balance = operations.apply_transaction(operation, format_cents(abs(amount)), account_id)
+        statuses.append(status)
+        balances.append(balance)
+    return statuses, balances, dict(operations.data_program.store.items())
+
+
+class TestApplyArrays:
+    """Differential tests of the NumPy engine against scalar Operations"""
+
+    def check(self, account_ids, cents, opening=None):
+        """Vectorized and scalar paths agree on every result and balance"""
+        operations = Operations()
+        for account_id, balance in (opening or {}).items():
+            operations.data_program.write_cents(balance, account_id)
+        result = operations.apply_arrays(account_ids, cents)
+
+        statuses, balances, stored = scalar_results(account_ids, cents, opening)
+        assert [STATUSES[code] for code in result["status"].tolist()] == statuses
+        assert result["balances"].tolist() == balances
+        for account_id, balance in stored.items():
+            assert operations.data_program.read_cents(account_id) == balance
+        return result
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("seed", range(12))
+    @pytest.mark.parametrize("lockstep_min_tails", [1, 4, 256])
+    def test_random_batches(self, seed, lockstep_min_tails, monkeypatch):
+        """Random batches with overdrafts and invalid amounts match exactly"""
+        monkeypatch.setattr(vectorized, "LOCKSTEP_MIN_TAILS", lockstep_min_tails)
+        rng = np.random.default_rng(seed)
+        rows = int(rng.integers(1, 2000))
+        account_ids = rng.integers(0, int(rng.integers(1, 30)), rows)
+        cents = rng.integers(-int(rng.integers(1, 300000)), 100000, rows)
+        cents[rng.random(rows) < 0.02] = 100000000
+        cents[rng.random(rows) < 0.02] = -100000000
+        self.check(account_ids, cents, opening={0: 0, 1: 5})
+
+    @pytest.mark.unit
+    @pytest.mark.parametrize("seed", range(12))
+    @pytest.mark.parametrize("lockstep_min_tails", [1, 4, 256])
+    def test_negative_opening_balances(self, seed, lockstep_min_tails, monkeypatch):
+        """Credits to overdrawn accounts are accepted, as on the scalar path"""
+        monkeypatch.setattr(vectorized, "LOCKSTEP_MIN_TAILS", lockstep_min_tails)
+        rng = np.random.default_rng(100 + seed)
+        rows = int(rng.integers(1, 2000))
+        accounts = int(rng.integers(1, 30))
+        account_ids = rng.integers(0, accounts, rows)
+        cents = rng.integers(-200000, 100000, rows)
+        opening = {account_id: int(rng.integers(-500000, 50000)) for account_id in range(accounts)}
+        self.check(account_ids, cents, opening)
+
+    @pytest.mark.unit
+    def test_credit_to_negative_balance(self):
+        """A credit that leaves the balance negative still raises it"""
+        result = self.check(np.array([4, 4, 4]), np.array([1707, -10, 5000]), opening={4: -3511})
+        assert result["balances"].tolist() == [-1804, -1804, 3196]
+        assert [STATUSES[code] for code in result["status"].tolist()] == ["ACCEPTED", "REJECTED", "ACCEPTED"]
+
+    @pytest.mark.unit
+    def test_hot_account(self):
+        """One long account with dense rejections is replayed exactly"""
+        rng = np.random.default_rng(3)
+        account_ids = np.where(rng.random(5000) < 0.9, 7, rng.integers(0, 1000, 5000))
+        cents = rng.integers(-150000, 100000, 5000)
+        result = self.check(account_ids, cents)
+        assert np.count_nonzero(result["status"] == REJECTED) > 100
+
+    @pytest.mark.unit
+    def test_limits(self):
+        """Amounts up to 999999.99 are valid, larger ones are invalid"""
+        cents = np.array([99999999, 100000000, -100000000, -99999999, -99999999, 0])
+        result = self.check(np.zeros(6, dtype=np.int64), cents)
+        assert result["status"].tolist() == [0, INVALID, INVALID, 0, REJECTED, 0]
+        assert result["closing"].tolist() == [100000]
+
+    @pytest.mark.unit
+    def test_empty_batch(self):
+        """An empty batch changes nothing"""
+        result = self.check(np.array([], dtype=np.int64), np.array([], dtype=np.int64))
+        assert len(result["accounts"]) == 0
+
+    @pytest.mark.unit
+    def test_write_false_and_bad_input(self):
+        """write=False leaves the data program alone; bad arrays are refused"""
+        operations = Operations()
+        result = apply_arrays(operations.data_program, [1, 1], [500, -100], write=False)
+        assert result["closing"].tolist() == [100400]
+        assert operations.data_program.read_cents(1) == 100000
+
+        with pytest.raises(ValueError):
+            apply_arrays(operations.data_program, [1], [1, 2])
+        with pytest.raises(ValueError):
+            apply_arrays(operations.data_program, [-1], [1])
+
+    @pytest.mark.integration
+    def test_ledger_records_accepted(self):
+        """Accepted transactions go to the ledger in order"""
+        operations = Operations()
+        operations.enable_ledger(Ledger(clock=lambda: 1))
+        operations.apply_arrays([4, 4, 4], [-100001, 2500, -2000])
+
+        assert operations.ledger.entries(4) == [(1, 2500, 102500), (1, -2000, 100500)]
@@ -0,0 +1,130 @@
+import pytest
+import threading
+from decimal import Decimal
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from account_store import AccountStore
+from data import DataProgram
+from wal import HEADER_SIZE, RECORD_SIZE, WriteAheadLog, read_log, replay
+
+
+class TestWriteAheadLog:
+    """Unit tests for the append-only write-ahead log"""
+
+    @pytest.fixture
+    def log_path(self, tmp_path):
+        """Path of a fresh log file"""
+        return str(tmp_path / 'balances.wal')
+
+    @pytest.mark.unit
+    def test_append_and_read_back(self, log_path):
+        """Records are read back in append order"""
+        with WriteAheadLog(log_path) as wal:
+            wal.append(0, 125050)
+            wal.append(7, 99)
+            assert wal.tell() == HEADER_SIZE + 2 * RECORD_SIZE
+
+        records = [(account_id, cents) for _, account_id, cents in read_log(log_path)]
+        assert records == [(0, 125050), (7, 99)]
+
+    @pytest.mark.unit
+    def test_group_commit_by_count(self, log_path):
+        """sync_every=N issues one fsync per N records"""
+        with WriteAheadLog(log_path, sync_every=10) as wal:
+            for i in range(25):
+                wal.append(i, i)
+            assert wal.sync_count == 2
+        assert wal.sync_count == 3  # close syncs the tail
+
+    @pytest.mark.unit
+    def test_group_commit_by_interval(self, log_path):
+        """The background flusher syncs records written without a count trigger"""
+        wal = WriteAheadLog(log_path, sync_every=0, sync_interval_ms=5)
+        try:
+            wal.append(1, 1)
+            for _ in range(200):
+                if wal.sync_count:
+                    break
+                threading.Event().wait(0.005)
+            assert wal.sync_count >= 1
+        finally:
+            wal.close()
+
+    @pytest.mark.unit
+    def test_concurrent_writers_share_fsyncs(self, log_path):
+        """Concurrent writers never lose a record and share fsyncs"""
+        wal = WriteAheadLog(log_path, sync_every=1)
+
+        def writer(account_id):
+            for i in range(200):
+                wal.append(account_id, i)
+
+        threads = [threading.Thread(target=writer, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        wal.close()
+
+        records = list(read_log(log_path))
+        assert len(records) == 1600
+        assert wal.sync_count <= 1600
+        for account_id in range(8):
+            assert [c for _, a, c in records if a == account_id] == list(range(200))
+
+    @pytest.mark.unit
+    def test_torn_tail_is_ignored_and_truncated(self, log_path):
+        """A partial last record is dropped on read and cut off on reopen"""
+        with WriteAheadLog(log_path) as wal:
+            wal.append(1, 100)
+            wal.append(2, 200)
+        with open(log_path, 'ab') as f:
+            f.write(b'\x01\x02\x03')
+
+        assert [a for _, a, _ in read_log(log_path)] == [1, 2]
+
+        with WriteAheadLog(log_path) as wal:
+            wal.append(3, 300)
+        assert [a for _, a, _ in read_log(log_path)] == [1, 2, 3]
+
+    @pytest.mark.unit
+    def test_corrupt_last_record_is_dropped(self, log_path):
+        """A last record with a bad checksum is treated as torn"""
+        with WriteAheadLog(log_path) as wal:
+            wal.append(1, 100)
+            wal.append(2, 200)
+        with open(log_path, 'r+b') as f:
+            f.seek(-1, os.SEEK_END)
+            f.write(b'\xff')
+
+        assert [a for _, a, _ in read_log(log_path)] == [1]
+        with WriteAheadLog(log_path):
+            pass
+        assert os.path.getsize(log_path) == HEADER_SIZE + RECORD_SIZE
+
+    @pytest.mark.unit
+    def test_rejects_foreign_file(self, tmp_path):
+        """Files without the log header are refused"""
+        path = tmp_path / 'account_data.json'
+        path.write_text('{"balance": "1000.00"}')
+        with pytest.raises(ValueError):
+            WriteAheadLog(str(path))
+
+    @pytest.mark.integration
+    def test_data_program_writes_are_replayed(self, log_path):
+        """DataProgram writes go through the log and can be replayed after a restart"""
+        data_program = DataProgram(wal=WriteAheadLog(log_path, sync_every=0))
+        data_program.execute_operation('write', Decimal('1250.75'))
+        data_program.execute_operation('write', Decimal('42.00'), 9)
+        data_program.write_cents(500, 9)
+        data_program.close()
+
+        store = AccountStore()
+        end = replay(log_path, store)
+
+        assert end == HEADER_SIZE + 3 * RECORD_SIZE
+        restored = DataProgram(store=store)
+        assert restored.storage_balance == Decimal('1250.75')
+        assert restored.read_cents(9) == 500
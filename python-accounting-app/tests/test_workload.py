@@ -0,0 +1,112 @@
+import pytest
+import random
+from collections import Counter
+import sys
+import os
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from data import DataProgram
+from money import MAX_AMOUNT_CENTS, parse_amount
+from operations import Operations
+from workload import NEAR_LIMIT_SPREAD, ZipfAccounts, drive, generate, report
+
+
+class TestGenerate:
+    """Unit tests for the synthetic transaction stream"""
+
+    @pytest.mark.unit
+    def test_reproducible(self):
+        """The same seed gives the same stream; another seed does not"""
+        first = list(generate(2000, seed=7, accounts=500))
+        assert first == list(generate(2000, seed=7, accounts=500))
+        assert first != list(generate(2000, seed=8, accounts=500))
+
+    @pytest.mark.unit
+    def test_operation_mix(self):
+        """Operations follow the configured mix"""
+        counts = Counter(operation for operation, _, _ in generate(20000, accounts=100, mix={'CREDIT': 3, 'TOTAL': 1}))
+        assert set(counts) == {'CREDIT', 'TOTAL'}
+        assert counts['CREDIT'] / 20000 == pytest.approx(0.75, abs=0.02)
+        with pytest.raises(ValueError):
+            list(generate(1, mix={'TRANSFER': 1}))
+
+    @pytest.mark.unit
+    def test_amounts(self):
+        """Amounts are client strings; near-limit ones straddle 999999.99"""
+        near = over = 0
+        for operation, amount, account_id in generate(20000, accounts=100, near_limit=0.1):
+            assert 0 <= account_id < 100
+            if operation == 'TOTAL':
+                assert amount is None
+                continue
+            cents = int(amount.replace('.', ''))
+            assert cents >= 1
+            if cents >= MAX_AMOUNT_CENTS - NEAR_LIMIT_SPREAD:
+                near += 1
+                over += cents > MAX_AMOUNT_CENTS
+            else:
+                parse_amount(amount)
+        assert near / 18000 == pytest.approx(0.1, abs=0.02)
+        assert over / near == pytest.approx(0.5, abs=0.1)
+
+    @pytest.mark.unit
+    def test_zipf_skew(self):
+        """Popular accounts get the Zipf share of the traffic"""
+        accounts = ZipfAccounts(1000, exponent=1.0, rng=random.Random(1))
+        counts = Counter(accounts() for _ in range(50000))
+        harmonic = sum(1 / rank for rank in range(1, 1001))
+        top = accounts.ranked(1)[0]
+        assert counts[top] / 50000 == pytest.approx(1 / harmonic, rel=0.1)
+        assert counts.most_common(1)[0][0] == top
+
+        uniform = ZipfAccounts(10, exponent=0.0, rng=random.Random(1))
+        assert min(Counter(uniform() for _ in range(10000)).values()) > 800
+
+
+class TestDrive:
+    """Unit tests for the load driver"""
+
+    @staticmethod
+    def expected(transactions):
+        """Outcome counts of applying the stream directly"""
+        operations = Operations(DataProgram())
+        return Counter(operations.apply_transaction(*transaction)[2] for transaction in transactions)
+
+    @pytest.mark.unit
+    def test_closed_loop(self):
+        """Every transaction is applied once and counted by outcome"""
+        transactions = list(generate(3000, seed=2, accounts=50, near_limit=0.05))
+        result = drive(Operations(DataProgram()), transactions)
+        expected = self.expected(transactions)
+        assert result['operations'] == 3000
+        assert (result['accepted'], result['rejected'], result['invalid']) == (
+            expected['ACCEPTED'], expected['REJECTED'], expected['INVALID'])
+        assert result['latency']['count'] == 3000
+        assert result['latency']['p50_ns'] <= result['latency']['p99_ns'] <= result['latency']['p99.9_ns']
+        assert sum(result['by_operation'].values()) == 3000
+        assert 0 < result['rejection_rate'] < 1
+        assert result['invalid_rate'] == result['invalid'] / 3000
+        assert len(report(result)) == 4
+
+    @pytest.mark.unit
+    def test_open_loop_paces_arrivals(self):
+        """Open loop does not run ahead of the arrival rate"""
+        result = drive(Operations(DataProgram()), generate(None, accounts=10), mode='open', rate=2000, limit=200)
+        assert result['operations'] == 200
+        assert result['elapsed_s'] >= 199 / 2000
+        assert result['offered_rate'] == 2000
+        with pytest.raises(ValueError):
+            drive(Operations(DataProgram()), [], mode='open')
+        with pytest.raises(ValueError):
+            drive(Operations(DataProgram()), [], mode='burst')
+
+    @pytest.mark.integration
+    def test_workers_keep_balances_exact(self):
+        """Concurrent workers on a thread-safe Operations lose no update"""
+        transactions = list(generate(4000, seed=4, accounts=20, mix={'CREDIT': 1}, near_limit=0))
+        operations = Operations(DataProgram(), lock_stripes=8)
+        result = drive(operations, transactions, workers=4)
+        assert result['accepted'] == 4000
+        total = sum(operations.data_program.read_cents(account_id) for account_id in range(20))
+        credited = sum(parse_amount(amount) for _, amount, _ in transactions)
+        assert total == 20 * 100000 + credited
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Tracing Module - Sampled call-path traces written as JSON lines
+One trace per sampled menu choice, with a span for every instrumented call
+"""
+
+import json
+import random
+import time
+from time import perf_counter_ns
+
+
+class Tracer:
+    """
+    Samples requests and records their call path
+
+    A sampled request runs with span wrappers installed as instance
+    attributes on the objects being traced; they are removed again when
+    the request ends, so unsampled requests run the original methods and
+    pay only for the sampling decision.
+    """
+
+    def __init__(self, path, sample_rate=0.01, seed=None):
+        """
+        Open the trace file
+
+        Args:
+            path (str): JSONL file the traces are appended to
+            sample_rate (float): Fraction of requests traced, 0.0-1.0
+            seed (int): Seed for the sampling decisions (None = random)
+        """
+        self.path = path
+        self.sample_rate = sample_rate
+        self.traces_written = 0
+        self._random = random.Random(seed).random
+        self._file = open(path, "a", encoding="utf-8")
+        self._spans = None
+        self._depth = 0
+
+    def should_sample(self):
+        """Decide whether the next request is traced"""
+        return self.sample_rate >= 1.0 or self._random() < self.sample_rate
+
+    def _wrap(self, name, function):
+        """Build a span-recording wrapper around a callable"""
+        spans = self._spans
+
+        def traced(*args, **kwargs):
+            # [name, start, end, depth, first argument if it is a string]
+            span = [name, perf_counter_ns(), 0, self._depth, args[0] if args and isinstance(args[0], str) else None]
+            spans.append(span)
+            self._depth += 1
+            try:
+                return function(*args, **kwargs)
+            finally:
+                self._depth -= 1
+                span[2] = perf_counter_ns()
+
+        return traced
+
+    def trace(self, name, function, args=(), targets=(), attributes=None):
+        """
+        Run one request as a trace
+
+        Args:
+            name (str): Root span name
+            function (callable): Request to run, called with *args
+            args (tuple): Arguments for function
+            targets (iterable): (object, attribute, span name) triples to
+                record as child spans while the request runs
+            attributes (dict): Extra fields stored with the trace
+
+        Returns:
+            The request's return value
+        """
+        self._spans = []
+        self._depth = 0
+        installed = []
+        for target, attribute, span_name in targets:
+            previous = vars(target).get(attribute)
+            setattr(target, attribute, self._wrap(span_name, getattr(target, attribute)))
+            installed.append((target, attribute, previous))
+
+        timestamp = time.time()
+        try:
+            return self._wrap(name, function)(*args)
+        finally:
+            # Restore in reverse, so a target wrapped twice ends up unwrapped
+            for target, attribute, previous in reversed(installed):
+                if previous is None:
+                    target.__dict__.pop(attribute, None)
+                else:
+                    setattr(target, attribute, previous)
+            self._write(timestamp, attributes)
+            self._spans = None
+
+    def _write(self, timestamp, attributes):
+        """Append the finished trace to the file"""
+        spans = self._spans
+        origin = spans[0][1]
+        record = {
+            "timestamp": timestamp,
+            "duration_ns": spans[0][2] - origin,
+            "attributes": attributes or {},
+            "spans": [
+                {
+                    "name": name,
+                    "start_ns": start - origin,
+                    "duration_ns": end - start,
+                    "depth": depth,
+                    **({"arg": arg} if arg is not None else {}),
+                }
+                for name, start, end, depth, arg in spans
+            ],
+        }
+        self._file.write(json.dumps(record) + "\n")
+        self.traces_written += 1
+
+    def flush(self):
+        """Push buffered traces to the file"""
+        self._file.flush()
+
+    def close(self):
+        """Flush and close the trace file"""
+        if not self._file.closed:
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
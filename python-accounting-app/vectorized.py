@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Vectorized Module - NumPy batch engine for end-of-day runs
+Applies arrays of (account id, signed cents) transactions with the same
+results as applying them one by one through Operations; needs NumPy
+"""
+
+import numpy as np
+
+from account_store import MAX_ACCOUNT_ID
+from money import MAX_AMOUNT_CENTS
+from operations import STATUS_ACCEPTED, STATUS_INVALID, STATUS_REJECTED
+
+# Status codes in the result arrays - STATUSES[code] is the batch API status
+ACCEPTED = 0
+REJECTED = 1
+INVALID = 2
+STATUSES = (STATUS_ACCEPTED, STATUS_REJECTED, STATUS_INVALID)
+
+# Below this many accounts with rejections left, a vectorized step costs
+# more than replaying their transactions in Python
+LOCKSTEP_MIN_TAILS = 256
+
+
+def _replay_tail(amounts, balance):
+    """
+    Apply one account's transactions sequentially, in plain ints
+
+    Args:
+        amounts (list): Signed cents, in order
+        balance (int): Balance before the first one
+
+    Returns:
+        tuple: (balance after each transaction, indexes of rejected debits)
+    """
+    after = []
+    rejected = []
+    for index, amount in enumerate(amounts):
+        if amount < 0 and balance < -amount:
+            # Insufficient funds for this debit - balance unchanged
+            rejected.append(index)
+        else:
+            balance += amount
+        after.append(balance)
+    return after, rejected
+
+
+def _segments(groups):
+    """Start index and length of each run of equal values in a sorted array"""
+    count = len(groups)
+    boundaries = np.empty(count, dtype=bool)
+    boundaries[:1] = True
+    np.not_equal(groups[1:], groups[:-1], out=boundaries[1:])
+    starts = np.flatnonzero(boundaries)
+    return starts, np.diff(np.append(starts, count))
+
+
+def _resolve_rejections(amounts, running, stops, first_overdrawn):
+    """
+    Correct the running balances of accounts with rejected debits
+
+    Each affected account is redone from its first overdrawing debit to
+    the end of its transactions (its tail). The tails advance in lockstep,
+    one transaction of every tail per vectorized step, so the step count
+    is the length of the longest tail rather than the number of rejections.
+    Once fewer than LOCKSTEP_MIN_TAILS tails are left, the rest of each is
+    replayed sequentially.
+
+    Args:
+        amounts (ndarray): Signed cents, grouped by account
+        running (ndarray): Running balances without rejections, corrected in place
+        stops (ndarray): End index of each affected account's transactions
+        first_overdrawn (ndarray): Index of each affected account's first
+            debit that leaves its running balance negative
+
+    Returns:
+        ndarray: Indexes (into the grouped arrays) of the rejected debits
+    """
+    # Longest tails first, so the tails still going at any step are a prefix
+    tail_lengths = stops - first_overdrawn
+    by_length = np.argsort(-tail_lengths, kind="stable")
+    heads = first_overdrawn[by_length]
+    tail_lengths = tail_lengths[by_length]
+    negated_lengths = -tail_lengths
+    balances = running[heads] - amounts[heads]
+    rejected = []
+
+    step = 0
+    active = len(heads)
+    while active >= LOCKSTEP_MIN_TAILS:
+        index = heads[:active] + step
+        current = balances[:active]
+        step_amounts = amounts[index]
+        after = current + step_amounts
+        # Only a debit can be refused - a credit to a negative balance is applied
+        overdrawn = (step_amounts < 0) & (after < 0)
+        # Insufficient funds for this debit - balance unchanged
+        after[overdrawn] = current[overdrawn]
+        balances[:active] = after
+        running[index] = after
+        if overdrawn.any():
+            rejected.append(index[overdrawn])
+        step += 1
+        active = int(np.searchsorted(negated_lengths, -step))
+
+    for head, length, balance in zip(heads[:active].tolist(), tail_lengths[:active].tolist(), balances[:active].tolist()):
+        after, tail_rejected = _replay_tail(amounts[head + step:head + length].tolist(), balance)
+        running[head + step:head + length] = after
+        rejected.append(np.array(tail_rejected, dtype=np.int64) + (head + step))
+
+    return np.concatenate(rejected) if rejected else np.empty(0, dtype=np.int64)
+
+
+def apply_arrays(data_program, account_ids, cents, write=True):
+    """
+    Apply a batch of transactions given as arrays
+
+    Transaction i adds cents[i] to account account_ids[i] (debits are
+    negative). Results are exactly those of applying the transactions in
+    array order: a debit larger than the balance at that point is
+    rejected and leaves it unchanged, and an amount over 999999.99 is
+    invalid.
+
+    Transactions are grouped by account, each account keeping its order,
+    and every account's balances come from one cumulative sum. Only an account with a debit that
+    would leave its running balance negative - the first debit rejected -
+    is replayed sequentially, from that debit on.
+
+    Args:
+        data_program (DataProgram): Source of opening balances
+        account_ids (array-like): Account id per transaction
+        cents (array-like): Signed amount in cents per transaction
+        write (bool): Store the closing balances in data_program
+
+    Returns:
+        dict: 'status' - int8 code per transaction (STATUSES[code]),
+              'balances' - int64 balance after each transaction,
+              'accounts' - the distinct account ids, ascending,
+              'opening' / 'closing' - their balances before and after
+    """
+    account_ids = np.asarray(account_ids)
+    cents = np.asarray(cents, dtype=np.int64)
+    if account_ids.shape != cents.shape or cents.ndim != 1:
+        raise ValueError("account_ids and cents must be 1-d arrays of the same length")
+    count = len(cents)
+    if count and (account_ids.min() < 0 or account_ids.max() > MAX_ACCOUNT_ID):
+        raise ValueError(f"Account id out of range (0-{MAX_ACCOUNT_ID})")
+    account_ids = account_ids.astype(np.int64, copy=False)
+
+    # Amounts over the PIC 9(6)V99 limit are invalid and change nothing
+    status = np.zeros(count, dtype=np.int8)
+    invalid = np.abs(cents) > MAX_AMOUNT_CENTS
+    status[invalid] = INVALID
+    amounts = np.where(invalid, 0, cents)
+
+    # Group by account, keeping each account's transactions in order: the
+    # sort key is the account id with the position in its low bits, so keys
+    # are unique and a plain (much faster than stable) sort gives the order
+    position_bits = max(count - 1, 1).bit_length()
+    if position_bits > 63 - MAX_ACCOUNT_ID.bit_length():
+        raise ValueError("Batch too large for one call")
+    keys = (account_ids << position_bits) | np.arange(count, dtype=np.int64)
+    keys.sort()
+    order = keys & ((1 << position_bits) - 1)
+    sorted_ids = keys >> position_bits
+    del keys
+    amounts = amounts[order]
+    starts, lengths = _segments(sorted_ids)
+    accounts = sorted_ids[starts]
+    opening = np.fromiter(
+        (data_program.read_cents(account_id) for account_id in accounts.tolist()),
+        dtype=np.int64,
+        count=len(accounts),
+    )
+
+    # Balance after each transaction if no debit were rejected
+    running = np.cumsum(amounts)
+    group_offsets = opening - (running[starts] - amounts[starts])
+    running += np.repeat(group_offsets, lengths)
+
+    # Until an account's first debit that leaves the running balance
+    # negative it is exact (a credit to an already negative balance is
+    # accepted); from that debit on, the account's transactions are
+    # resolved again
+    overdrawn = np.flatnonzero((running < 0) & (amounts < 0))
+    rejected = None
+    if overdrawn.size:
+        group_of = np.repeat(np.arange(len(starts)), lengths)
+        # overdrawn is ascending, so each account's first one starts a new group value
+        groups = group_of[overdrawn]
+        first = np.flatnonzero(np.append(True, groups[1:] != groups[:-1]))
+        affected = groups[first]
+        del group_of
+        rejected = _resolve_rejections(amounts, running, starts[affected] + lengths[affected], overdrawn[first])
+
+    balances = np.empty(count, dtype=np.int64)
+    balances[order] = running
+    if rejected is not None:
+        status[order[rejected]] = REJECTED
+    closing = running[starts + lengths - 1] if count else opening
+
+    if write:
+        changed = np.flatnonzero(closing != opening)
+        data_program.write_many_cents(accounts[changed].tolist(), closing[changed].tolist())
+
+    return {
+        "status": status,
+        "balances": balances,
+        "accounts": accounts,
+        "opening": opening,
+        "closing": closing,
+    }
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Workload Module - Seeded synthetic transaction streams and a load driver
+Capacity-planning baseline: realistic traffic pushed through Operations in
+closed-loop or open-loop mode, with throughput, latency percentiles and
+outcome rates
+"""
+
+import itertools
+import math
+import random
+import threading
+import time
+from array import array
+from bisect import bisect_left
+
+from money import MAX_AMOUNT_CENTS, format_cents
+from operations import STATUS_ACCEPTED, STATUS_INVALID, STATUS_REJECTED
+from stats import LatencyHistogram
+
+# Operation mix of the default stream, as fractions of all transactions
+DEFAULT_MIX = {"CREDIT": 0.45, "DEBIT": 0.45, "TOTAL": 0.10}
+
+# Typical amounts are log-normal around this median, in cents (50.00)
+MEDIAN_AMOUNT_CENTS = 5000
+AMOUNT_SIGMA = 1.5
+
+# Near-limit amounts fall within this many cents either side of 999999.99,
+# so about half of them are over the limit and INVALID
+NEAR_LIMIT_SPREAD = 10000
+
+
+class ZipfAccounts:
+    """
+    Account ids with Zipf-distributed popularity
+
+    The k-th most used account is drawn with probability proportional to
+    1 / k**exponent. Popularity ranks are mapped to ids by a seeded
+    shuffle, so the hot accounts are spread over the id range.
+    """
+
+    def __init__(self, accounts, exponent=1.0, rng=None):
+        """
+        Build the sampler
+
+        Args:
+            accounts (int): Number of accounts (ids 0 to accounts - 1)
+            exponent (float): Zipf exponent (0 = uniform)
+            rng (random.Random): Source of randomness (default: seed 0)
+        """
+        if accounts < 1:
+            raise ValueError("Need at least one account")
+        self.rng = rng if rng is not None else random.Random(0)
+        self.cumulative = list(itertools.accumulate(rank ** -exponent for rank in range(1, accounts + 1)))
+        self.ids = array("I", range(accounts))
+        self.rng.shuffle(self.ids)
+
+    def __call__(self):
+        """Draw one account id"""
+        rank = bisect_left(self.cumulative, self.rng.random() * self.cumulative[-1])
+        return self.ids[min(rank, len(self.ids) - 1)]
+
+    def ranked(self, count):
+        """Ids of the count most popular accounts, most popular first"""
+        return self.ids[:count].tolist()
+
+
+def generate(count, seed=0, accounts=1_000_000, zipf=1.0, mix=None, near_limit=0.01):
+    """
+    Generate a reproducible transaction stream
+
+    The same arguments always give the same stream.
+
+    Args:
+        count (int): Number of transactions (None = endless)
+        seed (int): Random seed
+        accounts (int): Account ids are drawn from 0 to accounts - 1
+        zipf (float): Zipf exponent of account popularity (0 = uniform)
+        mix (dict): Operation -> fraction of transactions, for 'CREDIT',
+            'DEBIT' and 'TOTAL' (default: DEFAULT_MIX)
+        near_limit (float): Fraction of credits and debits whose amount is
+            within NEAR_LIMIT_SPREAD cents of the 999999.99 limit
+
+    Yields:
+        tuple: (operation, amount, account_id) - the apply_transaction
+            arguments, with the amount as the string a client would send
+            (None for TOTAL)
+    """
+    mix = DEFAULT_MIX if mix is None else mix
+    unknown = set(mix) - set(DEFAULT_MIX)
+    if unknown or not any(mix.values()):
+        raise ValueError(f"Operation mix must weight CREDIT, DEBIT and TOTAL, got {mix}")
+    operations = list(mix)
+    cumulative = list(itertools.accumulate(mix[operation] for operation in operations))
+
+    rng = random.Random(seed)
+    draw_account = ZipfAccounts(accounts, zipf, random.Random(rng.getrandbits(64)))
+    lognormvariate, random_fraction, randint = rng.lognormvariate, rng.random, rng.randint
+    mu = math.log(MEDIAN_AMOUNT_CENTS)
+    low, high = MAX_AMOUNT_CENTS - NEAR_LIMIT_SPREAD, MAX_AMOUNT_CENTS + NEAR_LIMIT_SPREAD
+
+    for _ in itertools.repeat(None) if count is None else range(count):
+        operation = operations[bisect_left(cumulative, random_fraction() * cumulative[-1])]
+        account_id = draw_account()
+        if operation == "TOTAL":
+            yield operation, None, account_id
+            continue
+        if random_fraction() < near_limit:
+            cents = randint(low, high)
+        else:
+            cents = min(max(1, int(lognormvariate(mu, AMOUNT_SIGMA))), MAX_AMOUNT_CENTS)
+        yield operation, format_cents(cents), account_id
+
+
+class _Source:
+    """Thread-safe (index, transaction) supply shared by the driver workers"""
+
+    def __init__(self, transactions, limit):
+        self._items = enumerate(transactions if limit is None else itertools.islice(transactions, limit))
+        self._lock = threading.Lock()
+
+    def __call__(self):
+        with self._lock:
+            return next(self._items, None)
+
+
+def drive(operations, transactions, mode="closed", rate=None, workers=1, limit=None):
+    """
+    Push a transaction stream through Operations.apply_transaction
+
+    Closed loop: each worker applies its next transaction as soon as the
+    previous one returns; latency is the time of the call. Open loop:
+    transaction i is due at start + i / rate whether or not earlier ones
+    are done. A transaction picked up late has its latency measured from
+    the due time, so time spent waiting for a free worker counts - an
+    overloaded system shows it in the tail instead of quietly lowering the
+    offered rate.
+
+    Args:
+        operations (Operations): Business logic under load (thread-safe,
+            i.e. created with lock_stripes, when workers > 1)
+        transactions (iterable): (operation, amount, account_id) tuples
+        mode (str): 'closed' or 'open'
+        rate (float): Open loop arrival rate, transactions per second
+        workers (int): Concurrent callers (threads)
+        limit (int): Stop after this many transactions (None = all)
+
+    Returns:
+        dict: mode, workers, operations, elapsed_s, throughput (per second),
+            offered_rate, latency (LatencyHistogram.snapshot of ns), counts
+            per status and per operation, rejection_rate (rejected debits
+            over debits with a valid amount) and invalid_rate
+    """
+    if mode not in ("closed", "open"):
+        raise ValueError(f"Unknown load mode '{mode}' (expected closed or open)")
+    if mode == "open" and not (rate and rate > 0):
+        raise ValueError("Open loop needs a positive rate")
+
+    source = _Source(transactions, limit)
+    histograms = [LatencyHistogram() for _ in range(workers)]
+    counters = [{} for _ in range(workers)]
+    apply_transaction = operations.apply_transaction
+    clock, sleep = time.perf_counter_ns, time.sleep
+    interval_ns = 1e9 / rate if mode == "open" else 0
+    start = clock()
+
+    def worker(histogram, counts):
+        record = histogram.record
+        while True:
+            item = source()
+            if item is None:
+                return
+            index, (operation, amount, account_id) = item
+            if interval_ns:
+                due = start + int(index * interval_ns)
+                now = clock()
+                if now < due:
+                    # Early - wait for the arrival; timer oversleep is the
+                    # driver's, not the system's, so the clock starts on waking
+                    sleep((due - now) / 1e9)
+                    began = clock()
+                else:
+                    # Behind schedule - the wait for a free worker counts
+                    began = due
+            else:
+                began = clock()
+            result = apply_transaction(operation, amount, account_id)
+            record(clock() - began)
+            key = (result[0], result[2])
+            counts[key] = counts.get(key, 0) + 1
+
+    if workers == 1:
+        worker(histograms[0], counters[0])
+    else:
+        threads = [
+            threading.Thread(target=worker, args=(histogram, counts))
+            for histogram, counts in zip(histograms, counters)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+    elapsed = (clock() - start) / 1e9
+
+    latency = histograms[0]
+    for histogram in histograms[1:]:
+        latency.merge(histogram)
+    outcomes = {}
+    for counts in counters:
+        for key, number in counts.items():
+            outcomes[key] = outcomes.get(key, 0) + number
+    return summarize(outcomes, latency, elapsed, mode, workers, rate)
+
+
+def summarize(outcomes, latency, elapsed, mode, workers, rate):
+    """Build the drive() report from (operation, status) counts and a histogram"""
+    total = sum(outcomes.values())
+    by_status = {STATUS_ACCEPTED: 0, STATUS_REJECTED: 0, STATUS_INVALID: 0}
+    by_operation = {}
+    for (operation, status), number in outcomes.items():
+        by_status[status] += number
+        by_operation[operation] = by_operation.get(operation, 0) + number
+    valid_debits = outcomes.get(("DEBIT", STATUS_ACCEPTED), 0) + outcomes.get(("DEBIT", STATUS_REJECTED), 0)
+    return {
+        "mode": mode,
+        "workers": workers,
+        "operations": total,
+        "elapsed_s": elapsed,
+        "throughput": total / elapsed if elapsed else 0.0,
+        "offered_rate": rate if mode == "open" else None,
+        "latency": latency.snapshot(),
+        "accepted": by_status[STATUS_ACCEPTED],
+        "rejected": by_status[STATUS_REJECTED],
+        "invalid": by_status[STATUS_INVALID],
+        "by_operation": by_operation,
+        "rejection_rate": by_status[STATUS_REJECTED] / valid_debits if valid_debits else 0.0,
+        "invalid_rate": by_status[STATUS_INVALID] / total if total else 0.0,
+    }
+
+
+def report(result):
+    """Lines describing a drive() result, for printing"""
+    latency = result["latency"]
+    offered = f", offered {result['offered_rate']:,.0f}/s" if result["offered_rate"] else ""
+    lines = [
+        f"{result['mode']} loop, {result['workers']} worker(s){offered}",
+        f"Operations: {result['operations']} in {result['elapsed_s']:.2f} s "
+        f"({result['throughput']:,.0f}/s)",
+        "Latency: " + ", ".join(
+            f"{name} {latency[key] / 1000:,.1f} us"
+            for name, key in (("p50", "p50_ns"), ("p99", "p99_ns"), ("p999", "p99.9_ns"), ("max", "max_ns"))
+        ),
+        f"Accepted: {result['accepted']}, rejected: {result['rejected']} "
+        f"({result['rejection_rate']:.2%} of debits), invalid: {result['invalid']} "
+        f"({result['invalid_rate']:.2%})",
+    ]
+    return lines